@@ -1,8 +1,11 @@
 # ai_providers/claude_summarizer.py
 from typing import Optional
-from anthropic import Anthropic
 from ai_providers.base import BaseSummarizer
+from ai_providers.client_pool import get_client_pool
+from ai_providers.governor import get_governor
+from ai_providers.mapreduce import count_tokens
 from prompt import DEFAULT_PROMPT
+from utils.metrics import record_llm_usage
 DEFAULT_MODEL = "claude-3-haiku-20240307"
 
 
@@ -10,31 +13,35 @@ class ClaudeSummarizer(BaseSummarizer):
     def __init__(self, api_key: str, model: str = DEFAULT_MODEL, **kwargs):
         super().__init__(api_key, **kwargs)
         self.model = model
-        self.client = Anthropic(api_key=api_key)
+        self.client = get_client_pool().get("anthropic", api_key, kwargs.get("base_url"))
         self.prompt = kwargs.get("prompt", DEFAULT_PROMPT)
 
+    async def _complete(self, text: str, max_tokens: int):
+        async def request():
+            async with self.client.slot() as client:
+                return await client.messages.create(
+                    model=self.model,
+                    max_tokens=max_tokens,
+                    messages=[{
+                        "role": "user",
+                        "content": text
+                    }]
+                )
+
+        tokens = count_tokens(text) + max_tokens
+        return await get_governor().run("anthropic", self.model, tokens, request)
+
     async def summarize(self, text: str, max_length: Optional[int] = 1000) -> str:
         max_length = max_length or 1000
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=max_length,
-            messages=[{
-                "role": "user",
-                "content": text
-            }]
-        )
+        response = await self._complete(text, max_length)
+        if response.usage is not None:
+            record_llm_usage(
+                "anthropic", self.model, response.usage.input_tokens, response.usage.output_tokens)
         return response.content[0].text
 
     async def is_available(self) -> bool:
         try:
-            self.client.messages.create(
-                model=self.model,
-                max_tokens=5,
-                messages=[{
-                    "role": "user",
-                    "content": "test"
-                }]
-            )
+            await self._complete("test", 5)
             return True
         except:
             return False
@@ -0,0 +1,123 @@
+# ai_providers/client_pool.py
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from config import (
+    LLM_TIMEOUT, LLM_CONNECT_TIMEOUT, LLM_MAX_CONNECTIONS, LLM_KEEPALIVE_SECONDS,
+    LLM_MAX_CONCURRENCY
+)
+
+ClientKey = Tuple[str, str, Optional[str]]
+# Retries are the governor's job, so the SDKs' own are turned off
+SDK_MAX_RETRIES = 0
+
+
+def _http_client(sdk: Any) -> Any:
+    """Keep-alive HTTP client built with the SDK's own httpx flavour"""
+    limits = type(sdk.DEFAULT_CONNECTION_LIMITS)(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_CONNECTIONS,
+        keepalive_expiry=LLM_KEEPALIVE_SECONDS,
+    )
+    return sdk.DefaultAsyncHttpxClient(
+        limits=limits,
+        timeout=sdk.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+    )
+
+
+# The SDKs take seconds to import, so each is loaded with its first client
+def _build_openai(api_key: str, base_url: Optional[str]) -> Any:
+    import openai
+    return openai.AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        max_retries=SDK_MAX_RETRIES,
+        http_client=_http_client(openai),
+    )
+
+
+def _build_anthropic(api_key: str, base_url: Optional[str]) -> Any:
+    import anthropic
+    return anthropic.AsyncAnthropic(
+        api_key=api_key,
+        base_url=base_url,
+        max_retries=SDK_MAX_RETRIES,
+        http_client=_http_client(anthropic),
+    )
+
+
+_BUILDERS = {
+    "openai": _build_openai,
+    "anthropic": _build_anthropic,
+}
+
+
+class PooledClient:
+    """An SDK client plus the cap on requests it may have in flight"""
+
+    def __init__(self, client: Any, max_concurrency: int):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.requests = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._semaphore:
+            self.in_flight += 1
+            self.requests += 1
+            try:
+                yield self.client
+            finally:
+                self.in_flight -= 1
+
+
+class ClientPool:
+    """Long-lived async LLM clients shared per (provider, api key, base url).
+
+    Reusing one client keeps its HTTP connections alive between summaries
+    instead of paying a new TLS handshake for every request.
+    """
+
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._clients: Dict[ClientKey, PooledClient] = {}
+
+    def get(self, provider: str, api_key: str, base_url: Optional[str] = None) -> PooledClient:
+        key = (provider, api_key, base_url)
+        pooled = self._clients.get(key)
+        if pooled is None:
+            if provider not in _BUILDERS:
+                raise ValueError(f"Unsupported AI provider: {provider}")
+            pooled = PooledClient(_BUILDERS[provider](api_key, base_url), self.max_concurrency)
+            self._clients[key] = pooled
+        return pooled
+
+    async def aclose(self):
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for pooled in clients:
+            await pooled.client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "clients": [
+                {
+                    "provider": provider,
+                    "base_url": base_url,
+                    "in_flight": pooled.in_flight,
+                    "requests": pooled.requests,
+                    "max_concurrency": pooled.max_concurrency,
+                }
+                for (provider, _, base_url), pooled in self._clients.items()
+            ]
+        }
+
+
+_pool = ClientPool()
+
+
+def get_client_pool() -> ClientPool:
+    return _pool
@@ -12,6 +12,7 @@ class SummarizerFactory:
         providers = {
             "openai": OpenAISummarizer,
             "claude": ClaudeSummarizer,
+            "anthropic": ClaudeSummarizer,
             # Add more providers here
         }
         
@@ -0,0 +1,155 @@
+# ai_providers/fake_llm_server.py
+"""A local stand-in for the OpenAI and Anthropic HTTP APIs, for tests and benchmarks"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Sequence
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+    server: "FakeLLMServer"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        error = self.server.record(self.client_address, body)
+        try:
+            time.sleep(self.server.latency)
+            if error is not None:
+                self._send_error(error)
+                return
+            prompt = body["messages"][-1]["content"]
+            reply = self.server.reply_for(prompt)
+            if self.path.endswith("/chat/completions"):
+                self._send(200, _openai_response(body, reply))
+            elif self.path.endswith("/messages"):
+                self._send(200, _anthropic_response(body, reply))
+            else:
+                self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+        finally:
+            self.server.release()
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: int):
+        headers = {}
+        if status == 429 and self.server.retry_after is not None:
+            headers["Retry-After"] = str(self.server.retry_after)
+        # Both SDKs read the message from the same nested shape
+        self._send(status, {
+            "type": "error",
+            "error": {"type": "rate_limit_error" if status == 429 else "api_error", "message": f"fake {status}"},
+        }, headers)
+
+
+def _openai_response(body: Dict[str, Any], reply: str) -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": reply},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+
+
+def _anthropic_response(body: Dict[str, Any], reply: str) -> Dict[str, Any]:
+    return {
+        "id": "msg_fake",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model", "fake"),
+        "content": [{"type": "text", "text": reply}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 1, "output_tokens": 1},
+    }
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    """Answers chat requests with a canned reply after ``latency`` seconds.
+
+    Records how many requests arrived, over how many distinct connections,
+    and the peak number handled at once.
+
+    To exercise throttling, the first requests can be answered with the
+    status codes in ``errors``, and any request beyond ``max_in_flight``
+    concurrent ones gets a 429. 429s carry ``Retry-After: retry_after``
+    when it is set.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        reply: str = "fake summary",
+        errors: Sequence[int] = (),
+        max_in_flight: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency = latency
+        self.reply = reply
+        self.errors = list(errors)
+        self.max_in_flight = max_in_flight
+        self.retry_after = retry_after
+        self.throttled = 0
+        self.requests = []
+        self.connections = set()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def reply_for(self, prompt: str) -> str:  # pylint: disable=unused-argument
+        return self.reply
+
+    def record(self, client_address, body: Dict[str, Any]) -> Optional[int]:
+        """Count a request; returns the error status to answer it with, if any"""
+        with self._lock:
+            self.requests.append(body)
+            self.connections.add(client_address)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            if self.errors:
+                error = self.errors.pop(0)
+            elif self.max_in_flight is not None and self.in_flight > self.max_in_flight:
+                error = 429
+            else:
+                return None
+            if error == 429:
+                self.throttled += 1
+            return error
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,326 @@
+# ai_providers/governor.py
+import asyncio
+import random
+import sys
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from config import (
+    LLM_RATE_LIMITS, LLM_RATE_BURST_SECONDS, LLM_MAX_CONCURRENCY, LLM_MIN_CONCURRENCY,
+    LLM_MAX_RETRIES, LLM_BACKOFF_BASE, LLM_BACKOFF_MAX
+)
+from utils.logger import logger
+from utils.metrics import LLM_RETRIES, LLM_THROTTLED
+
+T = TypeVar("T")
+LaneKey = Tuple[str, str]
+
+# 529 is Anthropic's "overloaded"; both SDKs retry the same set on their own
+THROTTLE_STATUSES = {429, 529}
+RETRY_STATUSES = {408, 409, 429}
+_SDKS = ("openai", "anthropic")
+
+
+class TokenBucket:
+    """Refills at ``per_minute / 60`` per second and holds ``burst_seconds`` of that.
+
+    A take larger than the capacity waits for a full bucket and then leaves
+    it in debt, so oversized requests are delayed rather than refused.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = LLM_RATE_BURST_SECONDS):
+        self.per_minute = per_minute
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` (capped at the capacity) can be taken"""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, amount: float):
+        self.level -= amount
+
+    def available(self) -> float:
+        self._refill(time.monotonic())
+        return self.level
+
+
+def _status(error: Exception) -> Optional[int]:
+    return getattr(error, "status_code", None)
+
+
+def is_throttle(error: Exception) -> bool:
+    return _status(error) in THROTTLE_STATUSES
+
+
+def _is_connection_error(error: Exception) -> bool:
+    # An SDK that raised is already imported; the others need not be loaded for the check
+    for name in _SDKS:
+        sdk = sys.modules.get(name)
+        if sdk is not None and isinstance(error, sdk.APIConnectionError):
+            return True
+    return False
+
+
+def is_retryable(error: Exception) -> bool:
+    if _is_connection_error(error):
+        return True
+    status = _status(error)
+    return status is not None and (status in RETRY_STATUSES or status >= 500)
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """The wait the provider asked for, from ``retry-after-ms`` or ``retry-after``"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class ModelLane:
+    """Admission control for one (provider, model): rate buckets plus an AIMD concurrency limit.
+
+    The limit grows by ``1 / limit`` per successful call (about one per
+    window of ``limit`` calls) and halves on a throttle, at most once per
+    window: throttles of calls that started before the last decrease are
+    the same overload and are not counted again.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        model: str,
+        buckets: Dict[str, List[TokenBucket]],
+        min_concurrency: int,
+        max_concurrency: int,
+    ):
+        self.provider = provider
+        self.model = model
+        self.request_buckets = buckets["rpm"]
+        self.token_buckets = buckets["tpm"]
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.paused_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.failures = 0
+        self._decreased_at = 0.0
+        self._slot_free = asyncio.Condition()
+        self._admission = asyncio.Lock()
+
+    @asynccontextmanager
+    async def slot(self):
+        self.waiting += 1
+        try:
+            async with self._slot_free:
+                await self._slot_free.wait_for(lambda: self.in_flight < int(self.limit))
+                self.in_flight += 1
+        finally:
+            self.waiting -= 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            async with self._slot_free:
+                self._slot_free.notify_all()
+
+    async def admit(self, tokens: int):
+        """Wait for the request and token budgets and for any Retry-After pause, then spend them"""
+        self.waiting += 1
+        try:
+            # One admission at a time keeps waiting calls in arrival order
+            async with self._admission:
+                while True:
+                    now = time.monotonic()
+                    delay = max(
+                        [self.paused_until - now]
+                        + [bucket.delay(1, now) for bucket in self.request_buckets]
+                        + [bucket.delay(tokens, now) for bucket in self.token_buckets]
+                    )
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+                for bucket in self.request_buckets:
+                    bucket.take(1)
+                for bucket in self.token_buckets:
+                    bucket.take(tokens)
+                self.requests += 1
+        finally:
+            self.waiting -= 1
+
+    async def _set_limit(self, limit: float):
+        grew = int(limit) > int(self.limit)
+        self.limit = limit
+        if grew:
+            async with self._slot_free:
+                self._slot_free.notify_all()
+
+    async def succeeded(self):
+        if self.limit < self.max_concurrency:
+            await self._set_limit(min(self.max_concurrency, self.limit + 1 / self.limit))
+
+    async def throttle(self, started: float, wait: Optional[float]):
+        self.throttled += 1
+        LLM_THROTTLED.inc(provider=self.provider, model=self.model)
+        if wait:
+            self.paused_until = max(self.paused_until, time.monotonic() + wait)
+        if started >= self._decreased_at:
+            self._decreased_at = time.monotonic()
+            await self._set_limit(max(self.min_concurrency, self.limit / 2))
+            logger.warning(
+                f"{self.provider}/{self.model} throttled; concurrency limit now {int(self.limit)}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "model": self.model,
+            "concurrency_limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "paused_for": max(0.0, round(self.paused_until - time.monotonic(), 3)),
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+class LLMGovernor:
+    """Rate limits, retries and adaptive concurrency for every LLM call.
+
+    ``limits`` maps ``"provider"`` or ``"provider/model"`` to ``rpm`` and
+    ``tpm``; a call spends from every bucket that applies to it, so a
+    provider-wide budget is shared by its models. A call's tokens are its
+    prompt plus ``max_tokens``, which is also how providers count them
+    against the limit before the reply is known.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Dict[str, float]]] = None,
+        burst_seconds: float = LLM_RATE_BURST_SECONDS,
+        min_concurrency: int = LLM_MIN_CONCURRENCY,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE,
+        backoff_max: float = LLM_BACKOFF_MAX,
+    ):
+        self.limits = LLM_RATE_LIMITS if limits is None else limits
+        self.burst_seconds = burst_seconds
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lanes: Dict[LaneKey, ModelLane] = {}
+
+    def _bucket(self, scope: str, kind: str) -> Optional[TokenBucket]:
+        per_minute = self.limits.get(scope, {}).get(kind)
+        if not per_minute:
+            return None
+        key = (scope, kind)
+        if key not in self._buckets:
+            self._buckets[key] = TokenBucket(per_minute, self.burst_seconds)
+        return self._buckets[key]
+
+    def lane(self, provider: str, model: str) -> ModelLane:
+        key = (provider, model)
+        lane = self._lanes.get(key)
+        if lane is None:
+            scopes = (provider, f"{provider}/{model}")
+            buckets = {
+                kind: [bucket for bucket in (self._bucket(scope, kind) for scope in scopes) if bucket]
+                for kind in ("rpm", "tpm")
+            }
+            lane = ModelLane(provider, model, buckets, self.min_concurrency, self.max_concurrency)
+            self._lanes[key] = lane
+        return lane
+
+    def backoff(self, attempt: int, wait: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than the provider's Retry-After"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if wait is not None:
+            delay = max(delay, wait + random.uniform(0, self.backoff_base))
+        return delay
+
+    async def run(
+        self,
+        provider: str,
+        model: str,
+        tokens: int,
+        request: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Await ``request()`` once admitted, retrying throttled and transient failures"""
+        lane = self.lane(provider, model)
+        attempt = 0
+        while True:
+            async with lane.slot():
+                await lane.admit(tokens)
+                started = time.monotonic()
+                try:
+                    result = await request()
+                except Exception as e:
+                    error, wait = e, retry_after(e)
+                    if is_throttle(e):
+                        await lane.throttle(started, wait)
+                    if not is_retryable(e) or attempt >= self.max_retries:
+                        lane.failures += 1
+                        raise
+                else:
+                    await lane.succeeded()
+                    return result
+            delay = self.backoff(attempt, wait)
+            attempt += 1
+            lane.retries += 1
+            LLM_RETRIES.inc(provider=provider, model=model)
+            logger.info(
+                f"Retrying {provider}/{model} call in {delay:.1f}s (attempt {attempt}/{self.max_retries}): {error}")
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "models": [lane.stats() for lane in self._lanes.values()],
+            "limits": [
+                {
+                    "scope": scope,
+                    "kind": kind,
+                    "per_minute": bucket.per_minute,
+                    "available": round(max(0.0, bucket.available()), 1),
+                }
+                for (scope, kind), bucket in self._buckets.items()
+            ],
+        }
+
+
+_governor = LLMGovernor()
+
+
+def get_governor() -> LLMGovernor:
+    return _governor
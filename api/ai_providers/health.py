@@ -0,0 +1,202 @@
+# ai_providers/health.py
+import os
+import time
+import asyncio
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import (
+    AVAILABLE_PROVIDERS, MODEL_MAP, HEALTH_PROBE_INTERVAL, HEALTH_TTL,
+    HEALTH_FAILURE_THRESHOLD, HEALTH_OPEN_SECONDS, HEALTH_PROBE_TIMEOUT
+)
+from ai_providers.factory import SummarizerFactory
+from utils.logger import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class ModelHealth:
+    provider: str
+    model: str
+    available: Optional[bool] = None  # None until the first probe
+    breaker: str = CLOSED
+    consecutive_failures: int = 0
+    checked_at: Optional[float] = None
+    latency_ms: Optional[float] = None
+    last_error: Optional[str] = None
+    open_until: float = 0.0
+    trial_until: float = 0.0
+
+
+class HealthRegistry:
+    """Cached availability of each (provider, model) pair.
+
+    A background loop probes every configured pair on an interval, and real
+    summary calls report their outcome too. After ``failure_threshold``
+    consecutive failures the pair's breaker opens and requests are refused
+    without touching the provider. Once ``open_seconds`` have passed it goes
+    half-open and admits a single trial, a request or a probe, whose outcome
+    closes or reopens it.
+    """
+
+    def __init__(
+        self,
+        interval: float = HEALTH_PROBE_INTERVAL,
+        ttl: float = HEALTH_TTL,
+        failure_threshold: int = HEALTH_FAILURE_THRESHOLD,
+        open_seconds: float = HEALTH_OPEN_SECONDS,
+        probe_timeout: float = HEALTH_PROBE_TIMEOUT,
+    ):
+        self.interval = interval
+        self.ttl = ttl
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.probe_timeout = probe_timeout
+        self._entries: Dict[Tuple[str, str], ModelHealth] = {}
+        self._probing: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def configured_pairs(self) -> List[Tuple[str, str]]:
+        return [
+            (provider, model)
+            for provider in AVAILABLE_PROVIDERS
+            for model in MODEL_MAP.get(provider, [])
+        ]
+
+    def _entry(self, provider: str, model: str) -> ModelHealth:
+        key = (provider, model)
+        if key not in self._entries:
+            self._entries[key] = ModelHealth(provider=provider, model=model)
+        return self._entries[key]
+
+    def _admit_trial(self, entry: ModelHealth, now: float) -> bool:
+        """Whether a call may test a tripped breaker; one at a time until it closes or reopens"""
+        if entry.breaker == OPEN:
+            if now < entry.open_until:
+                return False
+            entry.breaker = HALF_OPEN
+            entry.trial_until = 0.0
+        if now < entry.trial_until:
+            return False
+        # A trial that never reports back (cancelled, say) must not keep the pair shut for good
+        entry.trial_until = now + self.open_seconds
+        return True
+
+    def is_available(self, provider: str, model: str) -> bool:
+        """Answer from cached state; stale or unknown pairs are refreshed in the background"""
+        if not os.getenv(f"{provider.upper()}_API_KEY"):
+            return False
+        entry = self._entry(provider, model)
+        now = time.monotonic()
+        if entry.breaker != CLOSED:
+            return self._admit_trial(entry, now)
+        if entry.checked_at is None or now - entry.checked_at > self.ttl:
+            self._probe_soon(provider, model)
+        # Unknown pairs are given the benefit of the doubt rather than blocking the request
+        return entry.available is not False
+
+    def record_success(self, provider: str, model: str, latency_ms: Optional[float] = None):
+        entry = self._entry(provider, model)
+        if entry.breaker != CLOSED:
+            logger.info(f"Provider {provider}/{model} recovered")
+        entry.available = True
+        entry.breaker = CLOSED
+        entry.consecutive_failures = 0
+        entry.checked_at = time.monotonic()
+        entry.latency_ms = latency_ms
+        entry.last_error = None
+
+    def record_failure(self, provider: str, model: str, error: str):
+        entry = self._entry(provider, model)
+        entry.consecutive_failures += 1
+        entry.checked_at = time.monotonic()
+        entry.last_error = error
+        if entry.breaker == HALF_OPEN or entry.consecutive_failures >= self.failure_threshold:
+            entry.available = False
+            entry.breaker = OPEN
+            entry.open_until = time.monotonic() + self.open_seconds
+            logger.warning(f"Circuit opened for {provider}/{model}: {error}")
+
+    async def probe(self, provider: str, model: str) -> bool:
+        api_key = os.getenv(f"{provider.upper()}_API_KEY")
+        if not api_key:
+            self.record_failure(provider, model, "API key not configured")
+            return False
+        started = time.perf_counter()
+        try:
+            summarizer = SummarizerFactory.create_summarizer(
+                provider=provider, api_key=api_key, model=model)
+            ok = await asyncio.wait_for(summarizer.is_available(), self.probe_timeout)
+        except Exception as e:
+            ok = False
+            error = str(e) or type(e).__name__
+        else:
+            error = "probe request failed"
+        if ok:
+            self.record_success(provider, model, (time.perf_counter() - started) * 1000)
+        else:
+            self.record_failure(provider, model, error)
+        return ok
+
+    def _probe_soon(self, provider: str, model: str):
+        key = (provider, model)
+        if key in self._probing:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self.probe(provider, model))
+        except RuntimeError:
+            return
+        self._probing[key] = task
+        task.add_done_callback(lambda _: self._probing.pop(key, None))
+
+    async def probe_all(self):
+        now = time.monotonic()
+        pairs = [
+            (provider, model) for provider, model in self.configured_pairs()
+            if os.getenv(f"{provider.upper()}_API_KEY")
+            and (self._entry(provider, model).breaker == CLOSED
+                 or self._admit_trial(self._entry(provider, model), now))
+        ]
+        await asyncio.gather(*(self.probe(*pair) for pair in pairs))
+
+    async def _run(self):
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error(f"Provider health check failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._loop_task is None and self.interval > 0:
+            self._loop_task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        tasks = [task for task in [self._loop_task, *self._probing.values()] if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        for pair in self.configured_pairs():
+            self._entry(*pair)
+        result = []
+        for entry in self._entries.values():
+            data = asdict(entry)
+            data["age_seconds"] = round(now - entry.checked_at, 1) if entry.checked_at else None
+            data["open_for_seconds"] = round(max(0.0, entry.open_until - now), 1)
+            del data["checked_at"], data["open_until"], data["trial_until"]
+            result.append(data)
+        return result
+
+
+_registry = HealthRegistry()
+
+
+def get_health_registry() -> HealthRegistry:
+    return _registry
@@ -0,0 +1,168 @@
+# ai_providers/mapreduce.py
+import re
+import json
+import asyncio
+import hashlib
+from typing import Dict, List, Optional, Protocol
+
+from config import SUMMARY_CHUNK_TOKENS, SUMMARY_PARTIAL_TOKENS, SUMMARY_MAP_CONCURRENCY
+from prompt import MAP_PROMPT, REDUCE_PROMPT, PROMPT_VERSION
+from ai_providers.base import BaseSummarizer
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional; fall back to a character estimate
+    _ENCODING = None
+
+# Split preference: paragraphs, lines, then sentences (Latin and CJK punctuation)
+_BOUNDARIES = [r"\n\s*\n", r"\n", r"(?<=[.!?。！？])\s*"]
+
+
+def count_tokens(text: str) -> int:
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    # Roughly four characters per token for English, about one per CJK character
+    cjk = len(re.findall(r"[\u3000-\u9fff\uac00-\ud7af]", text))
+    return cjk + (len(text) - cjk) // 4 + 1
+
+
+def _hard_split(text: str, max_tokens: int) -> List[str]:
+    words = text.split(" ")
+    if len(words) == 1:
+        # No spaces to split on (e.g. CJK): cut by characters
+        size = max(1, len(text) * max_tokens // max(1, count_tokens(text)))
+        return [text[i:i + size] for i in range(0, len(text), size)]
+    pieces, current = [], []
+    for word in words:
+        if current and count_tokens(" ".join(current + [word])) > max_tokens:
+            pieces.append(" ".join(current))
+            current = []
+        current.append(word)
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def _pieces(text: str, max_tokens: int, level: int = 0) -> List[str]:
+    if count_tokens(text) <= max_tokens:
+        return [text]
+    if level >= len(_BOUNDARIES):
+        return _hard_split(text, max_tokens)
+    parts = [part for part in re.split(_BOUNDARIES[level], text) if part.strip()]
+    if len(parts) == 1:
+        return _pieces(text, max_tokens, level + 1)
+    return [piece for part in parts for piece in _pieces(part, max_tokens, level + 1)]
+
+
+def split_text(text: str, max_tokens: int) -> List[str]:
+    """Pack text into chunks of at most ``max_tokens``, cutting at the coarsest boundary that fits"""
+    chunks, current, current_tokens = [], [], 0
+    for piece in _pieces(text, max_tokens):
+        tokens = count_tokens(piece)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+class SummaryStore(Protocol):
+    async def get(self, key: str) -> Optional[str]: ...
+
+    async def put(self, key: str, summary: str): ...
+
+
+class MemoryStore:
+    def __init__(self):
+        self._items: Dict[str, str] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._items.get(key)
+
+    async def put(self, key: str, summary: str):
+        self._items[key] = summary
+
+
+class HierarchicalSummarizer(BaseSummarizer):
+    """Map-reduce summarization on top of any other summarizer.
+
+    Text that fits in ``chunk_tokens`` goes straight to the wrapped
+    summarizer. Longer text is split on paragraph/sentence boundaries, the
+    chunks are summarized concurrently (at most ``max_concurrency`` at once),
+    and the partial summaries are merged in as many reduce passes as needed.
+    Every intermediate summary is kept in ``store`` under a hash of its
+    input, so re-running after an edit only redoes the chunks that changed.
+    """
+
+    def __init__(
+        self,
+        summarizer: BaseSummarizer,
+        store: Optional[SummaryStore] = None,
+        chunk_tokens: int = SUMMARY_CHUNK_TOKENS,
+        partial_tokens: int = SUMMARY_PARTIAL_TOKENS,
+        max_concurrency: int = SUMMARY_MAP_CONCURRENCY,
+    ):
+        super().__init__(summarizer.api_key, **summarizer.config)
+        self.summarizer = summarizer
+        self.store = store or MemoryStore()
+        self.chunk_tokens = chunk_tokens
+        self.partial_tokens = partial_tokens
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _key(self, stage: str, text: str, max_length: Optional[int]) -> str:
+        identity = json.dumps([
+            stage,
+            type(self.summarizer).__name__,
+            getattr(self.summarizer, "model", None),
+            PROMPT_VERSION,
+            max_length,
+            hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        ])
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    async def _summarize_part(self, stage: str, text: str, max_length: Optional[int]) -> str:
+        key = self._key(stage, text, max_length)
+        cached = await self.store.get(key)
+        if cached is not None:
+            return cached
+        async with self._semaphore:
+            summary = await self.summarizer.summarize(text, max_length=max_length)
+        await self.store.put(key, summary)
+        return summary
+
+    async def summarize(self, text: str, max_length: Optional[int] = None) -> str:
+        text = self.preprocess_text(text)
+        if count_tokens(text) <= self.chunk_tokens:
+            return await self.summarizer.summarize(text, max_length=max_length)
+
+        chunks = split_text(text, self.chunk_tokens)
+        partials = await asyncio.gather(*(
+            self._summarize_part("map", MAP_PROMPT.format(text=chunk), self.partial_tokens)
+            for chunk in chunks
+        ))
+        return await self._reduce(list(partials), max_length)
+
+    async def _reduce(self, partials: List[str], max_length: Optional[int]) -> str:
+        while True:
+            combined = "\n\n".join(partials)
+            fits = count_tokens(REDUCE_PROMPT.format(text=combined)) <= self.chunk_tokens
+            if fits or len(partials) == 1:
+                return await self._summarize_part(
+                    "reduce", REDUCE_PROMPT.format(text=combined), max_length)
+            # Too many partials for one request: merge them in groups first
+            groups = split_text(combined, self.chunk_tokens - count_tokens(REDUCE_PROMPT))
+            if len(groups) >= len(partials):
+                # The partials themselves are too long to group; merge pairwise
+                groups = ["\n\n".join(partials[i:i + 2]) for i in range(0, len(partials), 2)]
+            partials = list(await asyncio.gather(*(
+                self._summarize_part(
+                    "reduce", REDUCE_PROMPT.format(text=group), self.partial_tokens)
+                for group in groups
+            )))
+
+    async def is_available(self) -> bool:
+        return await self.summarizer.is_available()
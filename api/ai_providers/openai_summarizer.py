@@ -1,8 +1,11 @@
 # ai_providers/openai_summarizer.py
 from typing import Optional
-from openai import OpenAI
 from prompt import DEFAULT_PROMPT
 from ai_providers.base import BaseSummarizer
+from ai_providers.client_pool import get_client_pool
+from ai_providers.governor import get_governor
+from ai_providers.mapreduce import count_tokens
+from utils.metrics import record_llm_usage
 
 DEFAULT_MODEL = "gpt-3.5-turbo"
 
@@ -11,28 +14,35 @@ class OpenAISummarizer(BaseSummarizer):
     def __init__(self, api_key: str, model: str = DEFAULT_MODEL, **kwargs):
         super().__init__(api_key, **kwargs)
         self.model = model
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_client_pool().get("openai", api_key, kwargs.get("base_url"))
         self.prompt = kwargs.get("prompt", DEFAULT_PROMPT)
 
+    async def _complete(self, text: str, max_tokens: Optional[int]):
+        async def request():
+            async with self.client.slot() as client:
+                return await client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "user", "content": text}
+                    ],
+                    max_tokens=max_tokens
+                )
+
+        tokens = count_tokens(text) + (max_tokens or 0)
+        return await get_governor().run("openai", self.model, tokens, request)
+
     async def summarize(self, text: str, max_length: Optional[int] = 1000) -> str:
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "user", "content": text}
-            ],
-            max_tokens=max_length
-        )
+        response = await self._complete(text, max_length)
+        if response.usage is not None:
+            record_llm_usage(
+                "openai", self.model, response.usage.prompt_tokens, response.usage.completion_tokens)
         if response.choices[0].message.content is not None:
             return response.choices[0].message.content
         raise Exception("Failed to summarize the text")
 
     async def is_available(self) -> bool:
         try:
-            await self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": "test"}],
-                max_tokens=5
-            )
+            await self._complete("test", 5)
             return True
         except:
             return False
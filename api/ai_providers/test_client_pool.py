@@ -0,0 +1,72 @@
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+from ai_providers.client_pool import ClientPool
+from ai_providers.fake_llm_server import FakeLLMServer
+from ai_providers.governor import LLMGovernor
+from ai_providers.openai_summarizer import OpenAISummarizer
+from ai_providers.claude_summarizer import ClaudeSummarizer
+import ai_providers.openai_summarizer as openai_module
+import ai_providers.claude_summarizer as claude_module
+
+
+@pytest_asyncio.fixture
+async def pool(monkeypatch):
+    pool = ClientPool(max_concurrency=3)
+    governor = LLMGovernor(limits={})
+    monkeypatch.setattr(openai_module, "get_client_pool", lambda: pool)
+    monkeypatch.setattr(claude_module, "get_client_pool", lambda: pool)
+    monkeypatch.setattr(openai_module, "get_governor", lambda: governor)
+    monkeypatch.setattr(claude_module, "get_governor", lambda: governor)
+    yield pool
+    await pool.aclose()
+
+
+class TestClientPool:
+    @pytest.mark.asyncio
+    async def test_openai_summarizer_reuses_client_and_connections(self, pool):
+        with FakeLLMServer(reply="short summary") as server:
+            base_url = f"{server.url}/v1"
+            summarizers = [OpenAISummarizer("key", base_url=base_url) for _ in range(5)]
+            assert len({id(s.client) for s in summarizers}) == 1
+
+            for summarizer in summarizers:
+                assert await summarizer.summarize("text", max_length=10) == "short summary"
+
+            assert len(server.requests) == 5
+            assert len(server.connections) == 1
+
+    @pytest.mark.asyncio
+    async def test_claude_summarizer(self, pool):
+        with FakeLLMServer(reply="claude summary") as server:
+            summarizer = ClaudeSummarizer("key", base_url=server.url)
+            assert await summarizer.summarize("text") == "claude summary"
+            assert await summarizer.is_available()
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self, pool):
+        with FakeLLMServer(latency=0.1) as server:
+            summarizer = OpenAISummarizer("key", base_url=f"{server.url}/v1")
+            await asyncio.gather(*(summarizer.summarize("text") for _ in range(10)))
+            assert server.peak_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_event_loop_is_not_blocked(self, pool):
+        with FakeLLMServer(latency=0.5) as server:
+            summarizer = OpenAISummarizer("key", base_url=f"{server.url}/v1")
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.05)
+                    ticks += 1
+
+            tick_task = asyncio.create_task(ticker())
+            started = time.perf_counter()
+            await summarizer.summarize("text")
+            tick_task.cancel()
+
+            assert time.perf_counter() - started >= 0.5
+            assert ticks >= 5
@@ -0,0 +1,117 @@
+import asyncio
+import time
+import openai
+import pytest
+import pytest_asyncio
+from ai_providers.client_pool import ClientPool
+from ai_providers.fake_llm_server import FakeLLMServer
+from ai_providers.governor import LLMGovernor, TokenBucket
+from ai_providers.openai_summarizer import OpenAISummarizer
+from ai_providers.claude_summarizer import ClaudeSummarizer
+import ai_providers.openai_summarizer as openai_module
+import ai_providers.claude_summarizer as claude_module
+
+
+@pytest_asyncio.fixture
+async def pool(monkeypatch):
+    pool = ClientPool(max_concurrency=8)
+    monkeypatch.setattr(openai_module, "get_client_pool", lambda: pool)
+    monkeypatch.setattr(claude_module, "get_client_pool", lambda: pool)
+    yield pool
+    await pool.aclose()
+
+
+@pytest.fixture
+def use_governor(monkeypatch):
+    def install(**options):
+        options.setdefault("backoff_base", 0.01)
+        governor = LLMGovernor(**options)
+        monkeypatch.setattr(openai_module, "get_governor", lambda: governor)
+        monkeypatch.setattr(claude_module, "get_governor", lambda: governor)
+        return governor
+    return install
+
+
+class TestGovernor:
+    @pytest.mark.asyncio
+    async def test_retries_throttled_calls_after_retry_after(self, pool, use_governor):
+        governor = use_governor(limits={})
+        with FakeLLMServer(errors=[429, 429], retry_after=0.2) as server:
+            summarizer = OpenAISummarizer("key", base_url=f"{server.url}/v1")
+            started = time.perf_counter()
+            assert await summarizer.summarize("text") == "fake summary"
+
+            assert time.perf_counter() - started >= 0.4
+            assert len(server.requests) == 3
+            lane = governor.stats()["models"][0]
+            assert (lane["throttled"], lane["retries"], lane["failures"]) == (2, 2, 0)
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self, pool, use_governor):
+        governor = use_governor(limits={})
+        with FakeLLMServer(errors=[503, 529], reply="claude summary") as server:
+            summarizer = ClaudeSummarizer("key", base_url=server.url)
+            assert await summarizer.summarize("text") == "claude summary"
+            assert len(server.requests) == 3
+            assert governor.stats()["models"][0]["throttled"] == 1  # 529 is overload, 503 is not
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, pool, use_governor):
+        governor = use_governor(limits={}, max_retries=2)
+        with FakeLLMServer(errors=[429] * 5) as server:
+            summarizer = OpenAISummarizer("key", base_url=f"{server.url}/v1")
+            with pytest.raises(openai.RateLimitError):
+                await summarizer.summarize("text")
+            assert len(server.requests) == 3
+            assert governor.stats()["models"][0]["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, pool, use_governor):
+        use_governor(limits={})
+        with FakeLLMServer(errors=[400]) as server:
+            summarizer = OpenAISummarizer("key", base_url=f"{server.url}/v1")
+            with pytest.raises(openai.BadRequestError):
+                await summarizer.summarize("text")
+            assert len(server.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_requests_per_minute_bucket(self, pool, use_governor):
+        # 600 rpm with a tenth of a second of burst: one call at once, then one per 0.1 s
+        use_governor(limits={"openai/gpt-3.5-turbo": {"rpm": 600}}, burst_seconds=0.1)
+        with FakeLLMServer() as server:
+            summarizer = OpenAISummarizer("key", base_url=f"{server.url}/v1")
+            started = time.perf_counter()
+            await asyncio.gather(*(summarizer.summarize("text") for _ in range(6)))
+            assert time.perf_counter() - started >= 0.45
+
+    @pytest.mark.asyncio
+    async def test_provider_budget_is_shared_by_models(self, pool, use_governor):
+        governor = use_governor(limits={"openai": {"rpm": 600}}, burst_seconds=0.1)
+        with FakeLLMServer() as server:
+            first = OpenAISummarizer("key", model="a", base_url=f"{server.url}/v1")
+            second = OpenAISummarizer("key", model="b", base_url=f"{server.url}/v1")
+            started = time.perf_counter()
+            await asyncio.gather(*(s.summarize("text") for s in (first, second) * 3))
+            assert time.perf_counter() - started >= 0.45
+            assert [limit["scope"] for limit in governor.stats()["limits"]] == ["openai"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_backs_off_on_throttling(self, pool, use_governor):
+        governor = use_governor(limits={}, max_concurrency=8, max_retries=10)
+        with FakeLLMServer(latency=0.05, max_in_flight=2) as server:
+            summarizer = OpenAISummarizer("key", base_url=f"{server.url}/v1")
+            results = await asyncio.gather(*(summarizer.summarize("text") for _ in range(24)))
+
+            assert results == ["fake summary"] * 24
+            assert server.throttled > 0
+            lane = governor.stats()["models"][0]
+            assert lane["concurrency_limit"] < 8
+            assert lane["in_flight"] == 0 and lane["waiting"] == 0
+
+    def test_token_bucket_lets_oversized_requests_through_when_full(self):
+        bucket = TokenBucket(per_minute=60, burst_seconds=2)
+        now = time.monotonic()
+        assert bucket.capacity == 2
+        assert bucket.delay(5, now) == 0
+        bucket.take(5)
+        assert bucket.delay(1, now) == pytest.approx(4, abs=0.05)
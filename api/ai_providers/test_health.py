@@ -0,0 +1,55 @@
+import time
+import pytest
+from ai_providers.health import CLOSED, HALF_OPEN, OPEN, HealthRegistry
+
+PAIR = ("openai", "gpt-4o-mini")
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    registry = HealthRegistry(interval=0, failure_threshold=2, open_seconds=0.05)
+    registry.record_success(*PAIR)
+    return registry
+
+
+def trip(registry):
+    for _ in range(registry.failure_threshold):
+        registry.record_failure(*PAIR, "boom")
+    assert registry._entry(*PAIR).breaker == OPEN
+
+
+class TestCircuitBreaker:
+    def test_open_breaker_refuses_calls(self, registry):
+        trip(registry)
+        assert not registry.is_available(*PAIR)
+
+    def test_half_open_admits_a_single_trial(self, registry):
+        trip(registry)
+        time.sleep(0.06)
+        assert [registry.is_available(*PAIR) for _ in range(3)] == [True, False, False]
+        assert registry._entry(*PAIR).breaker == HALF_OPEN
+
+    def test_successful_trial_closes_the_breaker(self, registry):
+        trip(registry)
+        time.sleep(0.06)
+        assert registry.is_available(*PAIR)
+        registry.record_success(*PAIR)
+        assert registry._entry(*PAIR).breaker == CLOSED
+        assert registry.is_available(*PAIR) and registry.is_available(*PAIR)
+
+    def test_failed_trial_reopens_the_breaker(self, registry):
+        trip(registry)
+        time.sleep(0.06)
+        assert registry.is_available(*PAIR)
+        registry.record_failure(*PAIR, "still down")
+        assert registry._entry(*PAIR).breaker == OPEN
+        assert not registry.is_available(*PAIR)
+
+    def test_trial_that_never_reports_is_replaced(self, registry):
+        trip(registry)
+        time.sleep(0.06)
+        assert registry.is_available(*PAIR)
+        assert not registry.is_available(*PAIR)
+        time.sleep(0.06)
+        assert registry.is_available(*PAIR)
@@ -0,0 +1,17 @@
+# api/caching.py
+import json
+import hashlib
+from typing import Any
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+def etag_response(request: Request, payload: Any) -> Response:
+    """JSON response with a content ETag; answers 304 when the client already has it"""
+    body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode("utf-8")
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,29 @@
+# api/routes/batches.py
+from fastapi import APIRouter, HTTPException
+from api.schemas import BatchRequest, BatchResponse, BatchSubmission
+from services.batch import get_batch, submit_batch
+
+router = APIRouter(
+    prefix="/batches",
+    tags=["batches"]
+)
+
+
+@router.post("/", response_model=BatchSubmission)
+async def create_batch(request: BatchRequest):
+    """Queue a list of videos and/or every video of a playlist or channel"""
+    if not request.urls and not request.playlist_url:
+        raise HTTPException(status_code=400, detail="Provide urls or a playlist_url")
+    try:
+        return await submit_batch(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.get("/{batch_id}", response_model=BatchResponse)
+async def get_batch_progress(batch_id: int):
+    """Aggregate progress; list the tasks with GET /transcriptions/?batch_id="""
+    batch = await get_batch(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
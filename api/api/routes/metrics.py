@@ -0,0 +1,36 @@
+# api/routes/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ai_providers.governor import get_governor
+from services.scheduler import get_scheduler
+from utils.metrics import (
+    CONTENT_TYPE, JOBS, LLM_CONCURRENCY_LIMIT, LLM_WAITING, REGISTRY, STAGE_ACTIVE, STAGE_LIMIT,
+    STAGE_WAITING
+)
+
+
+router = APIRouter(tags=["metrics"])
+
+
+def _collect_scheduler():
+    stats = get_scheduler().stats()
+    JOBS.set(stats["jobs"])
+    for stage, limiter in stats["stages"].items():
+        STAGE_ACTIVE.set(limiter["active"], stage=stage)
+        STAGE_WAITING.set(limiter["waiting"], stage=stage)
+        STAGE_LIMIT.set(limiter["limit"], stage=stage)
+
+
+def _collect_governor():
+    for lane in get_governor().stats()["models"]:
+        LLM_WAITING.set(lane["waiting"], provider=lane["provider"], model=lane["model"])
+        LLM_CONCURRENCY_LIMIT.set(lane["concurrency_limit"], provider=lane["provider"], model=lane["model"])
+
+
+REGISTRY.add_collector(_collect_scheduler)
+REGISTRY.add_collector(_collect_governor)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
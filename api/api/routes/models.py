@@ -1,7 +1,13 @@
 # api/routes/models.py
+from dataclasses import asdict
 from fastapi import APIRouter, HTTPException
 from config import WHISPER_MODEL, AVAILABLE_PROVIDERS, MODEL_MAP
 from api.schemas import ModelRequest, ModelResponse
+from services.model_pool import get_model_pool, resolve_device
+from transcribers.factory import TranscriberFactory
+from ai_providers.client_pool import get_client_pool
+from ai_providers.governor import get_governor
+from ai_providers.health import get_health_registry
 
 
 router = APIRouter(
@@ -12,7 +18,34 @@ router = APIRouter(
 
 @router.get("/transcribe")
 async def get_models():
-    return {"model": WHISPER_MODEL}
+    engine = TranscriberFactory.get_engine()
+    return {
+        "engine": engine.name,
+        "model": WHISPER_MODEL,
+        "device": resolve_device(),
+        "capabilities": asdict(engine.capabilities),
+    }
+
+
+@router.get("/pool")
+async def get_pool_stats():
+    return get_model_pool().stats()
+
+
+@router.get("/clients")
+async def get_client_stats():
+    return get_client_pool().stats()
+
+
+@router.get("/governor")
+async def get_governor_stats():
+    """Per-model concurrency limits, queued calls and throttling, plus rate budgets left"""
+    return get_governor().stats()
+
+
+@router.get("/health")
+async def get_provider_health():
+    return {"models": get_health_registry().snapshot()}
 
 
 @router.get("/available_providers")
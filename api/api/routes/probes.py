@@ -0,0 +1,20 @@
+# api/routes/probes.py
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from services.warmup import get_warmup
+
+
+router = APIRouter(tags=["probes"])
+
+
+@router.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving requests"""
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz():
+    """Readiness: 503 until the warm-up has loaded the model, so traffic only reaches warm instances"""
+    warmup = get_warmup()
+    return JSONResponse(warmup.snapshot(), status_code=200 if warmup.ready else 503)
@@ -1,8 +1,11 @@
 # api/routes/summary.py
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
+from fastapi import APIRouter, HTTPException, Depends
 from database.dependencies import get_db
 from api.schemas import SummaryRequest, TaskStatus
-from services.transcription import generate_summary, check_model_availability
+from services.transcription import enqueue_summary, check_model_availability
+from services.summary_cache import (
+    get_partial_summary_cache, get_summary_cache, summary_cache_key
+)
 
 
 router = APIRouter(
@@ -15,7 +18,6 @@ router = APIRouter(
 async def create_summary(
         task_id: int,
         summary_request: SummaryRequest,
-        background_tasks: BackgroundTasks,
         db=Depends(get_db)):
     task = await db.get_task(task_id)
     if not task:
@@ -32,6 +34,26 @@ async def create_summary(
             status_code=400,
             detail="Cannot summarize: transcription not completed"
         )
+
+    content = await db.get_body(task_id, "content")
+    # Identical requests are answered from the cache without queueing
+    cached = await get_summary_cache().get(summary_cache_key(
+        content,
+        summary_request.provider,
+        summary_request.model,
+        summary_request.max_length
+    ))
+    if cached is not None:
+        await db.update_task_status(
+            task_id,
+            TaskStatus.COMPLETED,
+            summary=cached,
+            summary_provider=summary_request.provider,
+            summary_model=summary_request.model,
+            summary_max_length=summary_request.max_length
+        )
+        return await db.get_task(task_id, with_body=True)
+
     if not check_model_availability(summary_request.provider, summary_request.model):
         raise HTTPException(
             status_code=400,
@@ -39,19 +61,27 @@ async def create_summary(
         )
 
 
-    background_tasks.add_task(
-        generate_summary,
+    # Record the request first so a restart can pick the summary up again
+    await db.update_task_status(
         task_id,
-        task.content,
-        summary_request
+        TaskStatus.SUMMARIZING,
+        summary_provider=summary_request.provider,
+        summary_model=summary_request.model,
+        summary_max_length=summary_request.max_length
     )
+    enqueue_summary(task_id, content, summary_request)
+
+    return await db.get_task(task_id, with_body=True)
 
-    return task
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    return {**get_summary_cache().stats(), "partials": get_partial_summary_cache().stats()}
 
 
 @router.get("/{task_id}")
 async def get_summary(task_id: int, db=Depends(get_db)):
-    task = await db.get_task(task_id)
+    task = await db.get_task(task_id, with_body=True)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     if task.status != TaskStatus.COMPLETED:
@@ -1,38 +1,282 @@
 # api/routes/transcription.py
-from typing import List
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
-from api.schemas import TranscriptionRequest, TranscriptionResponse
-from services.transcription import process_video
+import json
+import time
+import base64
+import asyncio
+from datetime import datetime
+from typing import List, Optional
+from urllib.parse import quote
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from api.caching import etag_response
+from api.schemas import (
+    LIST_FIELDS, ChangePage, ExportFormat, TaskPage, TaskStatus, TranscriptionRequest, TranscriptionResponse,
+    TranscriptSegment
+)
+from services.events import get_event_bus
+from services.exports import MEDIA_TYPES, export_transcript
+from services.audio_cache import get_audio_cache
+from services.scheduler import get_scheduler
+from services.transcription import cancel_task, enqueue_transcription
 from database.dependencies import get_db
 
 router = APIRouter(
     prefix="/transcriptions",
     tags=["transcriptions"]
 )
-db = get_db()
+
+# Statuses during which new segments may still arrive
+STREAMING_STATUSES = {TaskStatus.PENDING, TaskStatus.DOWNLOADING, TaskStatus.TRANSCRIBING}
+CANCELLABLE_STATUSES = STREAMING_STATUSES | {TaskStatus.SUMMARIZING}
+KEEPALIVE_SECONDS = 15
+# Long polls re-read the database at least this often, for changes made by other processes
+CHANGES_POLL_SECONDS = 2
+
+
+def _sse(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _stream_task(task_id: int, offset: int, request: Request, db):
+    """Replay stored segments from ``offset``, then follow the task live.
+
+    Bus events only wake the stream up; segments and status are always read
+    back from the database so the stream stays ordered, and a quiet period
+    falls back to polling in case the job runs in another process.
+    """
+    queue = get_event_bus().subscribe(task_id)
+    status = None
+    try:
+        while not await request.is_disconnected():
+            for segment in await db.get_segments(task_id, offset):
+                yield _sse("segment", segment.model_dump(), segment.offset)
+                offset = segment.offset + 1
+
+            task = await db.get_task(task_id)
+            if task is None:
+                yield _sse("status", {"status": "deleted"})
+                return
+            if task.status != status:
+                status = task.status
+                yield _sse("status", {"status": status.value})
+            if status not in STREAMING_STATUSES:
+                return
+
+            try:
+                await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+            while not queue.empty():
+                queue.get_nowait()
+    finally:
+        get_event_bus().unsubscribe(task_id, queue)
 
 
 @router.post("/", response_model=TranscriptionResponse)
-async def create_transcription(request: TranscriptionRequest, background_tasks: BackgroundTasks, db=Depends(get_db)):
-    task_id = await db.create_task(request.url)
-    background_tasks.add_task(process_video, task_id, str(request.url))
+async def create_transcription(request: TranscriptionRequest, db=Depends(get_db)):
+    task_id = await db.create_task(request.url, request.priority)
+    enqueue_transcription(task_id, str(request.url), request.priority)
     return await db.get_task(task_id)
 
 
+@router.get("/queue")
+async def get_queue():
+    return get_scheduler().stats()
+
+
+@router.get("/audio-cache/stats")
+async def get_audio_cache_stats():
+    return await get_audio_cache().stats()
+
+
+@router.get("/changes", response_model=ChangePage)
+async def get_changes(
+        since: Optional[str] = Query(
+            None,
+            description="Cursor from the previous response; omit for a full sync, "
+                        "or \"latest\" to start from now and get only later changes"),
+        limit: int = Query(200, ge=1, le=500),
+        wait: float = Query(0, ge=0, le=60, description="Seconds to hold the request open until something changes"),
+        fields: Optional[str] = Query(
+            None, description="Comma-separated columns; content and summary are omitted by default"),
+        db=Depends(get_db)):
+    """Tasks created, modified or deleted after ``since``, in the order they changed"""
+    selected = _select_fields(fields)
+    if since == "latest":
+        after = await db.latest_change()
+    else:
+        after = _decode_cursor(since) if since else 0
+    bus = get_event_bus()
+    deadline = time.monotonic() + wait
+    while True:
+        waiter = bus.watch_changes()
+        try:
+            items, deleted, cursor, has_more = await db.get_changes(after, selected, limit)
+            remaining = deadline - time.monotonic()
+            if items or deleted or remaining <= 0:
+                return ChangePage(
+                    items=items, deleted=deleted, cursor=_encode_cursor(cursor), has_more=has_more)
+            try:
+                await asyncio.wait_for(waiter, min(remaining, CHANGES_POLL_SECONDS))
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            bus.unwatch_changes(waiter)
+
+
+@router.get("/search", response_model=TaskPage)
+async def search_transcriptions(
+        q: str = Query(..., min_length=1, description="Words to find; \"quoted phrases\" and prefix* are supported"),
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = None,
+        db=Depends(get_db)):
+    """Tasks whose title, transcript or summary match ``q``, most relevant first"""
+    offset = _decode_cursor(cursor) if cursor else 0
+    items, has_more = await db.search_tasks(q, limit, offset)
+    return TaskPage(
+        items=items,
+        next_cursor=_encode_cursor(offset + limit) if has_more else None
+    )
+
+
+@router.get("/{task_id}/stream")
+async def stream_transcription(
+        task_id: int,
+        request: Request,
+        offset: int = 0,
+        last_event_id: Optional[str] = Header(None),
+        db=Depends(get_db)):
+    """Server-sent events with decoded segments and status changes"""
+    if not await db.get_task(task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+    # EventSource reconnects send the id of the last segment they received
+    if last_event_id and last_event_id.isdigit():
+        offset = max(offset, int(last_event_id) + 1)
+    return StreamingResponse(
+        _stream_task(task_id, offset, request, db),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/{task_id}/segments", response_model=List[TranscriptSegment])
+async def get_segments(
+        task_id: int,
+        offset: int = 0,
+        limit: Optional[int] = Query(None, ge=1),
+        start: Optional[float] = Query(None, ge=0, description="Seconds; with end, selects a time range"),
+        end: Optional[float] = Query(None, ge=0),
+        db=Depends(get_db)):
+    """Segments from ``offset``, or those overlapping the ``start``-``end`` window"""
+    if not await db.get_task(task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+    if start is not None or end is not None:
+        if start is not None and end is not None and end <= start:
+            raise HTTPException(status_code=400, detail="end must be after start")
+        return await db.get_segments_between(task_id, start or 0.0, end)
+    return await db.get_segments(task_id, offset, limit)
+
+
+@router.get("/{task_id}/export")
+async def export_transcription(
+        task_id: int,
+        format: ExportFormat = ExportFormat.SRT,  # pylint: disable=redefined-builtin
+        db=Depends(get_db)):
+    """Timestamped transcript as SRT, WebVTT or JSON, streamed as it is read"""
+    task = await db.get_task(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if not await db.get_segments(task_id, limit=1):
+        raise HTTPException(status_code=404, detail="No timestamped segments for this task")
+    filename = quote(f"{task.title or f'transcript-{task_id}'}.{format.value}", safe="")
+    return StreamingResponse(
+        export_transcript(db, task, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename*=UTF-8''{filename}"}
+    )
+
+
 @router.get("/{task_id}", response_model=TranscriptionResponse)
-async def get_transcription(task_id: int, db=Depends(get_db)):
+async def get_transcription(
+        task_id: int,
+        request: Request,
+        with_body: bool = Query(True, description="Include content and summary; pollers only need the status"),
+        db=Depends(get_db)):
+    task = await db.get_task(task_id, with_body=with_body)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return etag_response(request, task)
+
+
+@router.post("/{task_id}/cancel", response_model=TranscriptionResponse)
+async def cancel_transcription(task_id: int, db=Depends(get_db)):
+    """Stop the task's download, transcription or summary and free its worker slot"""
     task = await db.get_task(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    if task.status not in CANCELLABLE_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Task is already {task.status.value}")
+    await cancel_task(task)
+    return await db.get_task(task_id)
+
+
+def _encode_cursor(task_id: int) -> str:
+    return base64.urlsafe_b64encode(str(task_id).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def _select_fields(fields: Optional[str]) -> List[str]:
+    if not fields:
+        return LIST_FIELDS
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = set(selected) - set(TranscriptionResponse.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return selected
 
 
-@router.get("/", response_model=List[TranscriptionResponse])
-async def get_transcriptions(db=Depends(get_db)):
-    return await db.get_all_tasks()
+@router.get("/", response_model=TaskPage)
+async def get_transcriptions(
+        request: Request,
+        limit: int = Query(50, ge=1, le=500),
+        cursor: Optional[str] = None,
+        status: Optional[List[TaskStatus]] = Query(None),
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        batch_id: Optional[int] = None,
+        fields: Optional[str] = Query(
+            None, description="Comma-separated columns; content and summary are omitted by default"),
+        db=Depends(get_db)):
+    items, next_id = await db.list_tasks(
+        _select_fields(fields),
+        limit,
+        before_id=_decode_cursor(cursor) if cursor else None,
+        statuses=status,
+        created_after=created_after,
+        created_before=created_before,
+        batch_id=batch_id
+    )
+    page = TaskPage(
+        items=items,
+        next_cursor=_encode_cursor(next_id) if next_id is not None else None
+    )
+    return etag_response(request, page)
 
 
 @router.delete("/{task_id}")
 async def delete_transcription(task_id: int, db=Depends(get_db)):
+    # Stop work still running for the task before its rows go
+    get_scheduler().cancel(task_id)
     await db.delete_task(task_id)
     return {"message": "Task deleted"}
@@ -1,7 +1,7 @@
 from enum import Enum
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, HttpUrl
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, HttpUrl
 
 
 class TaskStatus(str, Enum):
@@ -12,16 +12,49 @@ class TaskStatus(str, Enum):
     COMPLETED = "completed"
     SUMMARY_FAILED = "summary_failed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class Priority(str, Enum):
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
+
+    @property
+    def rank(self) -> int:
+        """Lower ranks are scheduled first"""
+        return list(Priority).index(self)
+
+    @classmethod
+    def from_rank(cls, rank: int) -> "Priority":
+        members = list(cls)
+        return members[min(max(rank, 0), len(members) - 1)]
+
+
+class ExportFormat(str, Enum):
+    SRT = "srt"
+    VTT = "vtt"
+    JSON = "json"
 
 
 class TranscriptionRequest(BaseModel):
     url: HttpUrl
+    priority: Priority = Priority.NORMAL
+
+
+class BatchRequest(BaseModel):
+    urls: List[HttpUrl] = []
+    playlist_url: Optional[HttpUrl] = None  # a playlist or channel, expanded without downloading
+    # Bulk work queues behind individually submitted videos by default
+    priority: Priority = Priority.LOW
+    max_items: Optional[int] = Field(None, ge=1)
 
 
 class SummaryRequest(BaseModel):
     provider: str = "openai"
     model: Optional[str] = None
     max_length: Optional[int] = None
+    priority: Priority = Priority.NORMAL
 
 
 class TranscriptionResponse(BaseModel):
@@ -31,12 +64,70 @@ class TranscriptionResponse(BaseModel):
     content: Optional[str] = None
     summary: Optional[str] = None
     status: TaskStatus
+    priority: Priority = Priority.NORMAL
     error_message: Optional[str] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
+    summary_provider: Optional[str] = None
+    summary_model: Optional[str] = None
+    summary_max_length: Optional[int] = None
+    batch_id: Optional[int] = None
+    updated_at: Optional[datetime] = None
+
+# Columns returned by the task listing unless ``fields`` asks for others
+LIST_FIELDS = [
+    "id", "youtube_url", "title", "status", "priority", "error_message",
+    "created_at", "completed_at", "summary_provider", "summary_model", "updated_at",
+]
+
+
+class TaskPage(BaseModel):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
+class ChangePage(BaseModel):
+    items: List[Dict[str, Any]]  # tasks created or modified after the cursor, oldest change first
+    deleted: List[int]
+    cursor: str  # pass as ``since`` to get the changes after this page
+    has_more: bool
+
+
+class TranscriptSegment(BaseModel):
+    offset: int
+    start: float
+    end: float
+    text: str
+
 
 class ModelRequest(BaseModel):
     provider: str
 
 class ModelResponse(BaseModel):
     available_models: list[str]
+
+
+class BatchProgress(BaseModel):
+    total: int
+    counts: Dict[str, int]
+    finished: int
+    failed: int
+    done: bool
+
+
+class BatchResponse(BaseModel):
+    id: int
+    source: Optional[str] = None
+    created_at: datetime
+    progress: BatchProgress
+
+
+class SkippedVideo(BaseModel):
+    url: str
+    video_key: str
+    task_id: Optional[int] = None  # the existing task; None for a repeat within the batch
+
+
+class BatchSubmission(BatchResponse):
+    task_ids: List[int]
+    skipped: List[SkippedVideo]
@@ -0,0 +1,80 @@
+# benchmarks/bench_chunked.py
+"""Compare single-pass and chunked parallel transcription wall-clock time.
+
+Run from the ``api`` directory:
+
+    python -m benchmarks.bench_chunked lecture.mp3 --chunk-seconds 300 --workers 4
+"""
+import argparse
+import json
+import time
+
+import whisper
+from config import (
+    WHISPER_MODEL, TRANSCRIBE_CHUNK_SECONDS, TRANSCRIBE_CHUNK_OVERLAP, TRANSCRIBE_WORKERS
+)
+from services.chunking import SAMPLE_RATE, get_executor, transcribe_chunked
+from services.model_pool import get_model_pool
+
+
+def _single_pass(audio, model_name):
+    with get_model_pool().acquire(model_name) as model:
+        return model.transcribe(audio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("audio", help="audio or video file to transcribe")
+    parser.add_argument("--model", default=WHISPER_MODEL)
+    parser.add_argument("--chunk-seconds", type=float, default=TRANSCRIBE_CHUNK_SECONDS)
+    parser.add_argument("--overlap", type=float, default=TRANSCRIBE_CHUNK_OVERLAP)
+    parser.add_argument("--workers", type=int, default=TRANSCRIBE_WORKERS)
+    args = parser.parse_args()
+
+    audio = whisper.load_audio(args.audio)
+    duration = len(audio) / SAMPLE_RATE
+
+    # Load models up front so neither path is charged for weight loading
+    _single_pass(audio[:SAMPLE_RATE], args.model)
+    executor = get_executor(args.workers)
+    # One short chunk per worker so every pool process has loaded its model
+    transcribe_chunked(
+        audio[:args.workers * SAMPLE_RATE], args.model,
+        chunk_seconds=1, overlap_seconds=0, executor=executor,
+    )
+
+    started = time.perf_counter()
+    single = _single_pass(audio, args.model)
+    single_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    chunked = transcribe_chunked(
+        audio, args.model,
+        chunk_seconds=args.chunk_seconds,
+        overlap_seconds=args.overlap,
+        executor=executor,
+    )
+    chunked_seconds = time.perf_counter() - started
+
+    print(json.dumps({
+        "audio_seconds": round(duration, 1),
+        "model": args.model,
+        "workers": args.workers,
+        "chunk_seconds": args.chunk_seconds,
+        "single_pass": {
+            "wall_seconds": round(single_seconds, 2),
+            "real_time_factor": round(single_seconds / duration, 4),
+            "segments": len(single["segments"]),
+        },
+        "chunked": {
+            "wall_seconds": round(chunked_seconds, 2),
+            "real_time_factor": round(chunked_seconds / duration, 4),
+            "segments": len(chunked["segments"]),
+        },
+        "speedup": round(single_seconds / chunked_seconds, 2),
+    }, indent=2))
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# benchmarks/bench_db.py
+"""Measure task status updates per second with many concurrent workers.
+
+Each worker owns a few tasks and cycles them through the pipeline statuses,
+while reader tasks page through the task list the way the history view does.
+``--legacy`` runs the same load against one shared connection in rollback
+journal mode that commits after every update, for comparison. Run from the
+``api`` directory:
+
+    python -m benchmarks.bench_db --workers 32 --updates 200
+"""
+import argparse
+import asyncio
+import json
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from api.schemas import TaskStatus
+
+STATUSES = [TaskStatus.DOWNLOADING, TaskStatus.TRANSCRIBING, TaskStatus.SUMMARIZING, TaskStatus.COMPLETED]
+
+
+class LegacyStore:
+    """One connection shared across threads, a commit per statement"""
+
+    def __init__(self, path: Path):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE transcriptions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, youtube_url TEXT NOT NULL,
+                status TEXT NOT NULL, created_at TIMESTAMP NOT NULL, completed_at TIMESTAMP
+            )
+        """)
+
+    async def create_task(self, url: str) -> int:
+        def _create():
+            cursor = self.conn.execute(
+                "INSERT INTO transcriptions (youtube_url, status, created_at) VALUES (?, ?, ?)",
+                (url, TaskStatus.PENDING, datetime.now()))
+            self.conn.commit()
+            return cursor.lastrowid
+        return await asyncio.to_thread(_create)
+
+    async def update_task_status(self, task_id: int, status: TaskStatus):
+        def _update():
+            self.conn.execute(
+                "UPDATE transcriptions SET status = ? WHERE id = ?", (status, task_id))
+            self.conn.commit()
+        await asyncio.to_thread(_update)
+
+    async def list_page(self):
+        def _list():
+            return self.conn.execute(
+                "SELECT id, status FROM transcriptions WHERE status = ? ORDER BY id DESC LIMIT 20",
+                (TaskStatus.COMPLETED,)).fetchall()
+        return await asyncio.to_thread(_list)
+
+    def close(self):
+        self.conn.close()
+
+
+class CurrentStore:
+    def __init__(self, path: Path):
+        from database.manager import DBManager
+        self.db = DBManager(path)
+
+    async def create_task(self, url: str) -> int:
+        return await self.db.create_task(url)
+
+    async def update_task_status(self, task_id: int, status: TaskStatus):
+        await self.db.update_task_status(task_id, status)
+
+    async def list_page(self):
+        return await self.db.list_tasks(["status"], 20, statuses=[TaskStatus.COMPLETED])
+
+    def close(self):
+        self.db.close()
+
+
+async def run(store, workers: int, updates: int, tasks_per_worker: int, readers: int):
+    task_ids = []
+    for w in range(workers):
+        task_ids.append([await store.create_task(f"https://example.com/{w}/{t}") for t in range(tasks_per_worker)])
+    done = asyncio.Event()
+    reads = 0
+
+    async def writer(ids):
+        for i in range(updates):
+            await store.update_task_status(ids[i % len(ids)], STATUSES[i % len(STATUSES)])
+
+    async def reader():
+        nonlocal reads
+        while not done.is_set():
+            await store.list_page()
+            reads += 1
+
+    reader_tasks = [asyncio.create_task(reader()) for _ in range(readers)]
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(ids) for ids in task_ids))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await asyncio.gather(*reader_tasks)
+    return {
+        "updates": workers * updates,
+        "seconds": round(elapsed, 3),
+        "updates_per_second": round(workers * updates / elapsed, 1),
+        "reads_per_second": round(reads / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--updates", type=int, default=200, help="updates per worker")
+    parser.add_argument("--tasks-per-worker", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--legacy", action="store_true", help="also run the single-connection baseline")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = [("current", CurrentStore)]
+        if args.legacy:
+            stores.insert(0, ("legacy", LegacyStore))
+        for name, store_class in stores:
+            store = store_class(Path(tmp) / f"{name}.db")
+            try:
+                results[name] = asyncio.run(run(
+                    store, args.workers, args.updates, args.tasks_per_worker, args.readers))
+            finally:
+                store.close()
+        if args.legacy:
+            results["speedup"] = round(
+                results["current"]["updates_per_second"] / results["legacy"]["updates_per_second"], 2)
+    print(json.dumps({"workers": args.workers, "readers": args.readers, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# benchmarks/bench_ingest.py
+"""Compare the old MP3 ingestion path with direct-to-PCM decoding.
+
+old:    yt-dlp download + FFmpegExtractAudio to MP3, then Whisper's ffmpeg
+        decode of that MP3 into a float array
+direct: one ffmpeg decode of the source stream to raw PCM, memory-mapped
+
+Each path runs in its own process so peak RSS is measured separately, for
+the Python process and for its ffmpeg/yt-dlp children. Run from the ``api``
+directory with a URL, or a local media file to leave the network out:
+
+    python -m benchmarks.bench_ingest https://www.youtube.com/watch?v=...
+    python -m benchmarks.bench_ingest --file lecture.webm
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+LEGACY_YTDL_OPTIONS = {
+    'format': 'bestaudio/best',
+    'postprocessors': [{'key': 'FFmpegExtractAudio', 'preferredcodec': 'mp3'}],
+    'quiet': True,
+    'no_warnings': True,
+}
+
+
+def _whisper_load_audio(path: str) -> np.ndarray:
+    # Same command and conversion as whisper.load_audio, without importing torch
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0", "-i", path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", "16000", "-",
+    ]
+    out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    return np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
+
+
+def _old_path(source: str, is_file: bool, workdir: str):
+    stages = {}
+    started = time.perf_counter()
+    if is_file:
+        mp3 = str(Path(workdir) / "audio.mp3")
+        subprocess.run(
+            ["ffmpeg", "-nostdin", "-loglevel", "error", "-y", "-i", source, "-vn", mp3], check=True)
+    else:
+        import yt_dlp
+        options = {**LEGACY_YTDL_OPTIONS, 'outtmpl': str(Path(workdir) / 'audio.%(ext)s')}
+        with yt_dlp.YoutubeDL(options) as ydl:
+            ydl.extract_info(source, download=True)
+        mp3 = str(Path(workdir) / "audio.mp3")
+    stages["download_and_encode"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    audio = _whisper_load_audio(mp3)
+    stages["decode"] = time.perf_counter() - started
+    return audio, stages, os.path.getsize(mp3)
+
+
+def _direct_path(source: str, is_file: bool, pcm_format: str):
+    from services.audio import decode_file, fetch_audio, load_pcm
+    stages = {}
+    started = time.perf_counter()
+    if is_file:
+        path = decode_file(source, pcm_format)
+    else:
+        _, path = fetch_audio(source, pcm_format)
+    stages["download_and_decode"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    audio = load_pcm(path)
+    stages["load"] = time.perf_counter() - started
+    size = os.path.getsize(path)
+    return audio, stages, size, path
+
+
+def _run(name: str, source: str, is_file: bool, pcm_format: str, workdir: str, results):
+    cleanup = None
+    if name == "old":
+        audio, stages, file_bytes = _old_path(source, is_file, workdir)
+    else:
+        audio, stages, file_bytes, cleanup = _direct_path(source, is_file, pcm_format)
+    # Read every sample once, as the mel spectrogram will
+    started = time.perf_counter()
+    peak = float(np.abs(audio).max()) if len(audio) else 0.0
+    stages["first_pass"] = time.perf_counter() - started
+    if cleanup:
+        os.remove(cleanup)
+    results[name] = {
+        "stages_seconds": {stage: round(seconds, 3) for stage, seconds in stages.items()},
+        "total_seconds": round(sum(stages.values()), 3),
+        "audio_seconds": round(len(audio) / 16000, 1),
+        "file_bytes": file_bytes,
+        "peak": round(peak, 4),
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "children_peak_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="video URL, or a local file with --file")
+    parser.add_argument("--file", action="store_true", help="source is a local media file")
+    parser.add_argument("--pcm-format", choices=["f32le", "s16le"], default="f32le")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager:
+        results = manager.dict()
+        with tempfile.TemporaryDirectory() as workdir:
+            for name in ("old", "direct"):
+                process = context.Process(
+                    target=_run,
+                    args=(name, args.source, args.file, args.pcm_format, workdir, results))
+                process.start()
+                process.join()
+                if process.exitcode != 0:
+                    raise SystemExit(f"{name} path failed")
+        results = dict(results)
+
+    results["speedup"] = round(results["old"]["total_seconds"] / results["direct"]["total_seconds"], 2)
+    print(json.dumps({"source": args.source, "pcm_format": args.pcm_format, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
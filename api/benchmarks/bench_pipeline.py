@@ -0,0 +1,345 @@
+# benchmarks/bench_pipeline.py
+"""Measure the whole transcription and summary pipeline without network access.
+
+Every task goes through the real API, scheduler, database and ffmpeg decode.
+Only the outside world is replaced:
+
+- audio: synthetic speech-like WAV fixtures, distinct per task so the
+  transcription cache never short-circuits a run
+- downloads: an offline source that decodes the fixture instead of asking
+  yt-dlp for the stream (URLs are YouTube-shaped, so resolving the video key
+  needs no network either)
+- LLM: the local FakeLLMServer, through the OpenAI-compatible API
+- Whisper: the configured model by default (it has to be in the local model
+  cache), or ``--engine synthetic``, which answers at a fixed real-time
+  factor to isolate the pipeline's own overhead
+
+Each concurrency level runs in a fresh process against a fresh database, so
+peak memory is per level. Results are JSON; ``--output`` also writes them
+to a file for comparing runs over time. Run from the ``api`` directory:
+
+    python -m benchmarks.bench_pipeline --concurrency 1,4,16 --output bench.json
+    python -m benchmarks.bench_pipeline --engine synthetic --audio-seconds 120
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import tempfile
+import time
+import wave
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+SUMMARY_MODEL = "gpt-3.5-turbo"
+
+
+def synthesize_speech(path: Path, seconds: float, seed: int):
+    """Voiced bursts at syllable rate with pauses, so silence detection and chunking behave"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 110 + 60 * rng.random() + 20 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = np.clip(np.sin(2 * np.pi * (3 + rng.random() * 2) * t), 0, None)
+    # A pause of 0.3-0.8 s every few seconds
+    cursor = 0.0
+    while cursor < seconds:
+        cursor += rng.uniform(2, 5)
+        pause = rng.uniform(0.3, 0.8)
+        envelope[int(cursor * SAMPLE_RATE):int((cursor + pause) * SAMPLE_RATE)] = 0
+        cursor += pause
+    signal = 0.3 * voice * envelope + 0.003 * rng.standard_normal(len(t))
+    samples = (np.clip(signal, -1, 1) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(samples.tobytes())
+
+
+def video_url(index: int) -> str:
+    return f"https://www.youtube.com/watch?v=bench{index:06d}"
+
+
+class OfflineSource:
+    """Stands in for ``services.audio.fetch_audio``: decodes a local fixture per video id"""
+
+    def __init__(self, fixtures: Dict[str, Path]):
+        self.fixtures = fixtures
+
+    def fetch_audio(self, url: str, pcm_format: Optional[str] = None, cancel=None, output=None):
+        from config import AUDIO_PCM_FORMAT
+        from services.audio import decode_file
+        from utils.metrics import STAGE_SECONDS
+        video_id = parse_qs(urlsplit(url).query)["v"][0]
+        with STAGE_SECONDS.time(stage="download"):
+            path = decode_file(str(self.fixtures[video_id]), pcm_format or AUDIO_PCM_FORMAT, output)
+        return video_id, path
+
+
+class SyntheticWhisper:
+    """Answers like ``whisper`` would, taking ``rtf`` seconds per second of audio"""
+
+    def __init__(self, rtf: float, segment_seconds: float = 5.0):
+        self.rtf = rtf
+        self.segment_seconds = segment_seconds
+
+    def transcribe(self, audio, **_):
+        duration = len(audio) / SAMPLE_RATE
+        time.sleep(duration * self.rtf)
+        segments = []
+        for start in np.arange(0, duration, self.segment_seconds):
+            end = min(duration, start + self.segment_seconds)
+            window = audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)]
+            # Text depends on the samples, so distinct audio gives distinct transcripts
+            energy = float(np.abs(window).mean()) if len(window) else 0.0
+            segments.append({"start": float(start), "end": float(end), "text": f" words {energy:.6f}"})
+        return {"text": "".join(s["text"] for s in segments), "segments": segments, "language": "en"}
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {
+        "p50": round(statistics.median(ordered), 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 3),
+        "max": round(ordered[-1], 3),
+        "mean": round(statistics.fmean(ordered), 3),
+    }
+
+
+async def _wait_for(db, bus, task_id: int, done) -> Any:
+    """Wait on the task's status events, re-reading the row so no transition is missed"""
+    queue = bus.subscribe(task_id)
+    try:
+        while True:
+            task = await db.get_task(task_id)
+            if done(task):
+                return task
+            try:
+                await asyncio.wait_for(queue.get(), timeout=0.5)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        bus.unsubscribe(task_id, queue)
+
+
+async def _run_tasks(client, db, urls: List[str], summarize: bool) -> Dict[str, Any]:
+    from api.schemas import TaskStatus
+    from services.events import get_event_bus
+    bus = get_event_bus()
+    finished = {TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.SUMMARY_FAILED}
+    transcribed, summarized, failures = [], [], []
+
+    async def one(url: str):
+        started = time.perf_counter()
+        response = await client.post("/transcriptions/", json={"url": url})
+        response.raise_for_status()
+        task_id = response.json()["id"]
+        task = await _wait_for(db, bus, task_id, lambda t: t.status in finished)
+        if task.status != TaskStatus.COMPLETED:
+            failures.append(task.error_message)
+            return
+        transcribed.append(time.perf_counter() - started)
+        if not summarize:
+            return
+        response = await client.post(
+            f"/summaries/{task_id}", json={"provider": "openai", "model": SUMMARY_MODEL})
+        response.raise_for_status()
+        task = await _wait_for(db, bus, task_id, lambda t: t.status in finished and (
+            t.status != TaskStatus.COMPLETED or t.summary_model is not None))
+        if task.status != TaskStatus.COMPLETED:
+            failures.append(task.error_message)
+            return
+        summarized.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(url) for url in urls))
+    return {
+        "wall_seconds": time.perf_counter() - started,
+        "transcribed": transcribed,
+        "summarized": summarized,
+        "failures": failures,
+    }
+
+
+async def _level(args, concurrency: int, fixtures: Dict[str, Path], workdir: Path) -> Dict[str, Any]:
+    import httpx
+    from database.manager import DBManager
+    # Must come first: the singleton then lives in the scratch database
+    db = DBManager(workdir / "bench.db")
+
+    import main
+    import services.audio_cache
+    import services.model_pool
+    import services.video
+    from ai_providers.client_pool import get_client_pool
+    from config import TRANSCRIBE_MODE, WHISPER_MODEL
+    from services.scheduler import get_scheduler
+    from utils.metrics import DB_SECONDS, STAGE_SECONDS, TRANSCRIBE_RTF
+
+    audio_dir = workdir / "audio"
+    audio_dir.mkdir(exist_ok=True)
+    services.audio_cache._cache = services.audio_cache.AudioCache(directory=audio_dir)  # pylint: disable=protected-access
+    services.video.fetch_audio = OfflineSource(fixtures).fetch_audio
+    if args.engine == "synthetic":
+        services.model_pool._pool = services.model_pool.ModelPool(  # pylint: disable=protected-access
+            loader=lambda name, device: SyntheticWhisper(args.synthetic_rtf), size_of=lambda _: 0)
+
+    # Load the model outside the measured window
+    started = time.perf_counter()
+    with services.model_pool.get_model_pool().acquire(WHISPER_MODEL) as model:
+        model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))
+    model_load_seconds = time.perf_counter() - started
+
+    stages_before = STAGE_SECONDS.totals()
+    db_before = DB_SECONDS.totals()
+    urls = [video_url(i) for i in range(concurrency)]
+    transport = httpx.ASGITransport(app=main.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            run = await _run_tasks(client, db, urls, args.summarize)
+    finally:
+        await get_scheduler().shutdown()
+        await get_client_pool().aclose()
+        db.close()
+
+    wall = run["wall_seconds"]
+    stages = {}
+    for (stage,), (count, total) in sorted(STAGE_SECONDS.totals().items()):
+        count -= stages_before.get((stage,), (0, 0.0))[0]
+        total -= stages_before.get((stage,), (0, 0.0))[1]
+        if count:
+            stages[stage] = {"count": count, "mean_seconds": round(total / count, 4), "total_seconds": round(total, 3)}
+    db_ops = {"read": 0, "write": 0}
+    for (kind, _), (count, _) in DB_SECONDS.totals().items():
+        db_ops[kind] += count
+    for (kind, _), (count, _) in db_before.items():
+        db_ops[kind] -= count
+    rtf = [total / count for (name,), (count, total) in TRANSCRIBE_RTF.totals().items() if name == WHISPER_MODEL]
+
+    return {
+        "concurrency": concurrency,
+        "model": WHISPER_MODEL,
+        "transcribe_mode": TRANSCRIBE_MODE,
+        "model_load_seconds": round(model_load_seconds, 3),
+        "wall_seconds": round(wall, 3),
+        "completed": len(run["transcribed"]),
+        "failed": len(run["failures"]),
+        "errors": sorted(set(filter(None, run["failures"])))[:5],
+        "throughput": {
+            "tasks_per_minute": round(len(run["transcribed"]) * 60 / wall, 2),
+            "audio_seconds_per_second": round(len(run["transcribed"]) * args.audio_seconds / wall, 2),
+        },
+        "latency_seconds": {
+            "transcribed": _percentiles(run["transcribed"]),
+            "summarized": _percentiles(run["summarized"]),
+        },
+        "stages": stages,
+        "mean_transcribe_rtf": round(rtf[0], 4) if rtf else None,
+        "db": {
+            "reads_per_second": round(db_ops["read"] / wall, 1),
+            "writes_per_second": round(db_ops["write"] / wall, 1),
+            **db.stats(),
+        },
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "children_peak_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    }
+
+
+def _run_level(args, concurrency: int, fixtures: Dict[str, Path], llm_url: str, results):
+    # Set before the application modules read their configuration
+    os.environ["OPENAI_API_KEY"] = "bench"
+    os.environ["OPENAI_BASE_URL"] = f"{llm_url}/v1"
+    if args.transcribe_mode:
+        os.environ["TRANSCRIBE_MODE"] = args.transcribe_mode
+    with tempfile.TemporaryDirectory() as workdir:
+        results[concurrency] = asyncio.run(_level(args, concurrency, fixtures, Path(workdir)))
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    from ai_providers.fake_llm_server import FakeLLMServer
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="1,4,16",
+                        help="comma-separated numbers of tasks submitted at once, one run each")
+    parser.add_argument("--audio-seconds", type=float, default=30)
+    parser.add_argument("--engine", choices=["whisper", "synthetic"], default="whisper")
+    parser.add_argument("--synthetic-rtf", type=float, default=0.05,
+                        help="seconds of synthetic transcription per audio second")
+    parser.add_argument("--transcribe-mode", choices=["single", "chunked"], default=None,
+                        help="override TRANSCRIBE_MODE")
+    parser.add_argument("--no-summarize", dest="summarize", action="store_false")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="fake LLM response time in seconds")
+    parser.add_argument("--output", type=Path, help="also write the JSON results here")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.concurrency.split(",")]
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as fixture_dir, \
+            FakeLLMServer(latency=args.llm_latency) as llm, \
+            context.Manager() as manager:
+        fixtures = {}
+        for i in range(max(levels)):
+            video_id = urlsplit(video_url(i)).query.split("=", 1)[1]
+            fixtures[video_id] = Path(fixture_dir) / f"{video_id}.wav"
+            synthesize_speech(fixtures[video_id], args.audio_seconds, seed=i)
+
+        results = manager.dict()
+        for level in levels:
+            process = context.Process(target=_run_level, args=(args, level, fixtures, llm.url, results))
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                raise SystemExit(f"run with concurrency {level} failed")
+        runs = [results[level] for level in levels]
+        llm_requests = len(llm.requests)
+
+    report = {
+        "benchmark": "pipeline",
+        "started_at": started_at,
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {
+            "engine": args.engine,
+            "synthetic_rtf": args.synthetic_rtf if args.engine == "synthetic" else None,
+            "audio_seconds": args.audio_seconds,
+            "summarize": args.summarize,
+            "llm_latency": args.llm_latency,
+        },
+        "llm_requests": llm_requests,
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# benchmarks/bench_startup.py
+"""Measure cold start: time to listen, to ready, and to the first transcription.
+
+Each run starts a fresh API server (uvicorn, scratch database and audio
+cache) and watches it from outside, timing from the moment the process is
+spawned, so interpreter start-up and imports are included:
+
+- listen: ``/healthz`` first answers
+- ready: ``/readyz`` first answers 200, i.e. the warm-up has loaded the model
+- first_transcription: a task submitted once the server is ready completes
+
+The server's own view (``milestones`` from ``/readyz``) is reported too.
+Audio comes from the same offline fixtures as ``bench_pipeline``, so no
+network is needed; ``--engine synthetic`` replaces Whisper to time the
+start-up path alone. Compare ``--no-warmup`` to see what the first task pays
+without the warm-up. Run from the ``api`` directory:
+
+    python -m benchmarks.bench_startup --runs 5 --output startup.json
+    python -m benchmarks.bench_startup --engine synthetic --no-warmup
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+from benchmarks.bench_pipeline import _git_revision, synthesize_speech, video_url
+
+POLL_SECONDS = 0.01
+FINISHED = ("completed", "failed", "summary_failed", "cancelled")
+
+
+def _serve(port: int, workdir: Path, fixture: Path, engine: str, synthetic_rtf: float):
+    """Server side of a run; executed in the spawned process"""
+    from database.manager import DBManager
+    DBManager(workdir / "bench.db")
+
+    import uvicorn
+    import main
+    import services.audio_cache
+    import services.model_pool
+    import services.video
+    from benchmarks.bench_pipeline import OfflineSource, SyntheticWhisper
+
+    audio_dir = workdir / "audio"
+    audio_dir.mkdir(exist_ok=True)
+    services.audio_cache._cache = services.audio_cache.AudioCache(directory=audio_dir)  # pylint: disable=protected-access
+    video_id = parse_qs(urlsplit(video_url(0)).query)["v"][0]
+    services.video.fetch_audio = OfflineSource({video_id: fixture}).fetch_audio
+    if engine == "synthetic":
+        services.model_pool._pool = services.model_pool.ModelPool(  # pylint: disable=protected-access
+            loader=lambda name, device: SyntheticWhisper(synthetic_rtf), size_of=lambda _: 0)
+    uvicorn.run(main.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until(client: httpx.Client, path: str, timeout: float, ok=lambda r: r.status_code == 200) -> httpx.Response:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            response = client.get(path)
+            if ok(response):
+                return response
+        except httpx.TransportError:
+            pass
+        time.sleep(POLL_SECONDS)
+    raise TimeoutError(f"{path} not ready after {timeout}s")
+
+
+def _run(args, fixture: Path) -> Dict[str, Any]:
+    port = _free_port()
+    env = {**os.environ, "WARMUP_MODEL": "true" if args.warmup else "false", "TASK_EXECUTION": "inline"}
+    with tempfile.TemporaryDirectory() as workdir:
+        code = (
+            "from benchmarks.bench_startup import _serve; "
+            f"_serve({port}, __import__('pathlib').Path({workdir!r}), __import__('pathlib').Path({str(fixture)!r}), "
+            f"{args.engine!r}, {args.synthetic_rtf!r})"
+        )
+        started = time.perf_counter()
+        server = subprocess.Popen([sys.executable, "-c", code], env=env)
+        try:
+            with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=args.timeout) as client:
+                _wait_until(client, "/healthz", args.timeout)
+                listen = time.perf_counter() - started
+                ready_response = _wait_until(
+                    client, "/readyz", args.timeout,
+                    ok=lambda r: r.status_code == 200 or r.json()["state"] == "failed")
+                if ready_response.status_code != 200:
+                    raise RuntimeError(f"warm-up failed: {ready_response.json()['error']}")
+                ready = time.perf_counter() - started
+
+                submitted = time.perf_counter()
+                task_id = client.post("/transcriptions/", json={"url": video_url(0)}).json()["id"]
+                task = _wait_until(
+                    client, f"/transcriptions/{task_id}?with_body=false", args.timeout,
+                    ok=lambda r: r.json()["status"] in FINISHED).json()
+                finished = time.perf_counter()
+                milestones = client.get("/readyz").json()["milestones"]
+        finally:
+            server.terminate()
+            server.wait()
+    return {
+        "listen_seconds": round(listen, 3),
+        "ready_seconds": round(ready, 3),
+        "first_transcription_seconds": round(finished - started, 3),
+        "first_task_latency_seconds": round(finished - submitted, 3),
+        "first_task_status": task["status"],
+        "server_milestones": milestones,
+        "warmup_state": ready_response.json()["state"],
+    }
+
+
+def _summary(runs: List[Dict[str, Any]], key: str) -> Optional[Dict[str, float]]:
+    values = [run[key] for run in runs]
+    if not values:
+        return None
+    return {"median": round(statistics.median(values), 3), "min": min(values), "max": max(values)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="cold starts to measure")
+    parser.add_argument("--audio-seconds", type=float, default=30)
+    parser.add_argument("--engine", choices=["whisper", "synthetic"], default="whisper")
+    parser.add_argument("--synthetic-rtf", type=float, default=0.05,
+                        help="seconds of synthetic transcription per audio second")
+    parser.add_argument("--no-warmup", dest="warmup", action="store_false",
+                        help="start with WARMUP_MODEL=false, so the first task loads the model")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds to wait for each step")
+    parser.add_argument("--output", type=Path, help="also write the JSON results here")
+    args = parser.parse_args()
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        fixture = Path(fixture_dir) / "startup.wav"
+        synthesize_speech(fixture, args.audio_seconds, seed=0)
+        runs = [_run(args, fixture) for _ in range(args.runs)]
+
+    report = {
+        "benchmark": "startup",
+        "started_at": started_at,
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {
+            "engine": args.engine,
+            "synthetic_rtf": args.synthetic_rtf if args.engine == "synthetic" else None,
+            "audio_seconds": args.audio_seconds,
+            "warmup": args.warmup,
+        },
+        "summary": {
+            key: _summary(runs, key)
+            for key in ("listen_seconds", "ready_seconds", "first_transcription_seconds",
+                        "first_task_latency_seconds")
+        },
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
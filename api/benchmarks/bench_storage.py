@@ -0,0 +1,153 @@
+# benchmarks/bench_storage.py
+"""Database size and status-poll latency with inline vs. compressed transcripts.
+
+Builds a database at the schema version that kept transcripts inline, fills
+it with synthetic completed tasks and their transcription and summary cache
+entries, measures it, then applies the remaining migrations (which move the
+bodies into compressed ``task_bodies`` rows and compress the caches) and
+measures again. Run from the ``api`` directory:
+
+    python -m benchmarks.bench_storage --tasks 2000 --transcript-kb 60
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from api.schemas import TaskStatus
+from database.compression import decompress_text
+from database.connection import connect
+from database.migrations import migrate
+
+INLINE_SCHEMA_VERSION = 4
+WORDS = (
+    "the a to and of we that is in it you this for so on with be are what but "
+    "model audio video time data can just like about going really know think "
+    "right okay people thing actually different first because would which"
+).split()
+
+
+def _text(rng: random.Random, size: int) -> str:
+    words, length = [], 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def _fill(conn, tasks: int, transcript_kb: int):
+    rng = random.Random(0)
+    conn.execute("BEGIN")
+    for i in range(tasks):
+        content = _text(rng, transcript_kb * 1024)
+        conn.execute(
+            """
+            INSERT INTO transcriptions
+            (youtube_url, title, content, summary, status, created_at, completed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                f"https://www.youtube.com/watch?v={i:011d}", f"Video {i}",
+                content, _text(rng, 1024),
+                TaskStatus.COMPLETED, datetime.now(), datetime.now(),
+            )
+        )
+        words = content.split()
+        segments = [
+            {"start": n * 0.3, "end": (n + 12) * 0.3, "text": " ".join(words[n:n + 12])}
+            for n in range(0, len(words), 12)
+        ]
+        conn.execute(
+            """
+            INSERT INTO transcription_cache
+            (audio_hash, model, options, title, content, segments, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (f"{i:064x}", "base", "{}", f"Video {i}", content, json.dumps(segments), datetime.now())
+        )
+        conn.execute(
+            """
+            INSERT INTO summary_cache (cache_key, summary, created_at, last_used_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            (f"{i:064x}", _text(rng, 1024), datetime.now(), datetime.now())
+        )
+    conn.execute("COMMIT")
+
+
+def _size(conn, path: Path) -> int:
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.execute("VACUUM")
+    return os.path.getsize(path)
+
+
+def _latency(conn, query: str, ids, convert=None):
+    samples = []
+    for task_id in ids:
+        started = time.perf_counter()
+        rows = conn.execute(query, (task_id,)).fetchall()
+        if convert:
+            for row in rows:
+                convert(row)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return {
+        "p50_us": round(statistics.median(samples), 1),
+        "p95_us": round(samples[int(len(samples) * 0.95) - 1], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--transcript-kb", type=int, default=60)
+    parser.add_argument("--polls", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    ids = [rng.randint(1, args.tasks) for _ in range(args.polls)]
+    poll = "SELECT * FROM transcriptions WHERE id = ?"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        conn = connect(path, busy_timeout=5)
+        migrate(conn, target=INLINE_SCHEMA_VERSION)
+        _fill(conn, args.tasks, args.transcript_kb)
+        before = {"db_bytes": _size(conn, path), "status_poll": _latency(conn, poll, ids)}
+
+        started = time.perf_counter()
+        migrate(conn)
+        migration_seconds = time.perf_counter() - started
+
+        after = {
+            "db_bytes": _size(conn, path),
+            "status_poll": _latency(conn, poll, ids),
+            "body_load": _latency(
+                conn,
+                "SELECT codec, data FROM task_bodies WHERE task_id = ? AND field = 'content'",
+                ids,
+                lambda row: decompress_text(row["codec"], row["data"]),
+            ),
+        }
+        codec = conn.execute("SELECT codec FROM task_bodies LIMIT 1").fetchone()["codec"]
+        conn.close()
+
+    print(json.dumps({
+        "tasks": args.tasks,
+        "transcript_kb": args.transcript_kb,
+        "codec": codec,
+        "migration_seconds": round(migration_seconds, 2),
+        "before": before,
+        "after": after,
+        "size_ratio": round(after["db_bytes"] / before["db_bytes"], 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
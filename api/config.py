@@ -5,17 +5,131 @@ import os
 BASE_DIR = Path(__file__).parent
 DOWNLOAD_DIR = BASE_DIR / "downloads"
 DATABASE_PATH = BASE_DIR / "transcriptions.db"
-WHISPER_MODEL = "base"
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE")  # None picks cuda when available
+
+# "whisper" runs openai-whisper on PyTorch; "faster-whisper" runs the same
+# checkpoints on CTranslate2 with int8 weights, much faster on CPU-only nodes
+# (needs the faster-whisper package)
+TRANSCRIBE_ENGINE = os.getenv("TRANSCRIBE_ENGINE", "whisper")
+# faster-whisper only; empty picks int8 on CPU and int8_float16 on CUDA
+TRANSCRIBE_COMPUTE_TYPE = os.getenv("TRANSCRIBE_COMPUTE_TYPE", "")
+TRANSCRIBE_BEAM_SIZE = int(os.getenv("TRANSCRIBE_BEAM_SIZE", "5"))
+
+# After start-up, load the Whisper model and run a short silent decode in the
+# background so the first task does not pay for it; /readyz answers 200 once
+# that is done (immediately when disabled, or when separate workers transcribe)
+WARMUP_MODEL = os.getenv("WARMUP_MODEL", "true").lower() in ("1", "true", "yes")
+
+# Loaded models are shared process-wide; idle ones are evicted past these limits.
+# A copy serves one transcription at a time, so TRANSCRIBE_CONCURRENCY jobs on
+# the same model load that many copies, as far as MODEL_POOL_MAX_BYTES allows
+MODEL_POOL_MAX_BYTES = int(os.getenv("MODEL_POOL_MAX_BYTES", str(4 * 1024 ** 3)))
+MODEL_POOL_IDLE_TIMEOUT = float(os.getenv("MODEL_POOL_IDLE_TIMEOUT", "1800"))
+
+# "chunked" splits long audio at silences and transcribes the pieces in parallel
+TRANSCRIBE_MODE = os.getenv("TRANSCRIBE_MODE", "single")
+TRANSCRIBE_CHUNK_SECONDS = float(os.getenv("TRANSCRIBE_CHUNK_SECONDS", "300"))
+TRANSCRIBE_CHUNK_OVERLAP = float(os.getenv("TRANSCRIBE_CHUNK_OVERLAP", "2"))
+# 0 (the default) transcribes in a single pass and only yields segments at the
+# end. A window size such as 120 decodes window by window, publishing segments
+# while a task runs; each window is prompted with the tail of the transcript so
+# far, so the text can differ slightly from a single pass
+TRANSCRIBE_STREAM_SECONDS = float(os.getenv("TRANSCRIBE_STREAM_SECONDS", "0"))
+TRANSCRIBE_WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+# "inline" runs pipeline jobs inside the API process; "workers" leaves them to
+# separate ``python worker.py`` processes, which claim tasks from the shared
+# database under a lease that they renew while working. A worker that stops
+# renewing (it crashed) loses the lease, and another worker resumes the task
+TASK_EXECUTION = os.getenv("TASK_EXECUTION", "inline")
+WORKER_MAX_JOBS = int(os.getenv("WORKER_MAX_JOBS", "2"))
+WORKER_LEASE_SECONDS = float(os.getenv("WORKER_LEASE_SECONDS", "60"))
+WORKER_POLL_SECONDS = float(os.getenv("WORKER_POLL_SECONDS", "1"))
+# Claims without a clean finish before a task is given up as failed
+WORKER_MAX_ATTEMPTS = int(os.getenv("WORKER_MAX_ATTEMPTS", "3"))
+
+# Worker slots per pipeline stage
+DOWNLOAD_CONCURRENCY = int(os.getenv("DOWNLOAD_CONCURRENCY", "2"))
+TRANSCRIBE_CONCURRENCY = int(os.getenv("TRANSCRIBE_CONCURRENCY", "1"))
+SUMMARIZE_CONCURRENCY = int(os.getenv("SUMMARIZE_CONCURRENCY", "4"))
+
+# Summaries are reused for identical transcript + provider + model + length
+SUMMARY_CACHE_TTL = float(os.getenv("SUMMARY_CACHE_TTL", str(30 * 24 * 3600)))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "10000"))
+
+# Transcripts longer than SUMMARY_CHUNK_TOKENS are summarized part by part, then merged
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "3000"))
+SUMMARY_PARTIAL_TOKENS = int(os.getenv("SUMMARY_PARTIAL_TOKENS", "400"))
+SUMMARY_MAP_CONCURRENCY = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "4"))
+
+# LLM clients are long-lived and shared per provider and API key
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_KEEPALIVE_SECONDS = float(os.getenv("LLM_KEEPALIVE_SECONDS", "60"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# Every LLM call goes through a governor. Token buckets cap requests and
+# tokens per minute for a provider and for a "provider/model", e.g.
+# {"openai": {"rpm": 500, "tpm": 200000}, "openai/gpt-4o": {"tpm": 30000}};
+# unlisted keys are unlimited. A bucket holds LLM_RATE_BURST_SECONDS worth of
+# its limit. Throttled (429) and transient errors are retried with jittered
+# exponential backoff, never sooner than the provider's Retry-After, and the
+# model's concurrency (at most LLM_MAX_CONCURRENCY) halves on throttling and
+# grows back by one per window of successful calls
+LLM_RATE_BURST_SECONDS = float(os.getenv("LLM_RATE_BURST_SECONDS", "10"))
+LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "1"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "60"))
+
+# Provider/model availability is probed in the background and cached
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "300"))
+HEALTH_TTL = float(os.getenv("HEALTH_TTL", "600"))
+HEALTH_FAILURE_THRESHOLD = int(os.getenv("HEALTH_FAILURE_THRESHOLD", "3"))
+HEALTH_OPEN_SECONDS = float(os.getenv("HEALTH_OPEN_SECONDS", "120"))
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "20"))
+
+# SQLite runs in WAL mode: reads use a small connection pool, writes are
+# serialized through one connection and committed in batches
+DB_READERS = int(os.getenv("DB_READERS", "4"))
+DB_WRITE_BATCH = int(os.getenv("DB_WRITE_BATCH", "64"))
+DB_BUSY_TIMEOUT = float(os.getenv("DB_BUSY_TIMEOUT", "5"))
+
+# Transcript and summary bodies are stored compressed, outside the task row;
+# "zstd" needs the zstandard package and falls back to zlib without it
+BODY_COMPRESSION = os.getenv("BODY_COMPRESSION", "zstd")
+BODY_COMPRESSION_LEVEL = int(os.getenv("BODY_COMPRESSION_LEVEL", "6"))
+
+# FTS5 tokenizer for transcript search; "trigram" also matches text written
+# without spaces (e.g. Chinese) at the cost of a larger index. Read when the
+# index is first created
+SEARCH_TOKENIZER = os.getenv("SEARCH_TOKENIZER", "unicode61 remove_diacritics 2")
+
+# Segments read per query while streaming SRT/VTT/JSON exports
+EXPORT_BATCH_SEGMENTS = int(os.getenv("EXPORT_BATCH_SEGMENTS", "500"))
+
+# Audio is piped from the source stream through a single ffmpeg decode to raw
+# 16 kHz mono PCM: "f32le" is memory-mapped as is, "s16le" halves the disk use
+# but is converted to float in memory when loaded
+AUDIO_PCM_FORMAT = os.getenv("AUDIO_PCM_FORMAT", "f32le")
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+
+# Decoded audio stays in DOWNLOAD_DIR, one file per video, so re-transcribing
+# (another model, a resumed task) skips the download. Least recently used files
+# not in use by a task are evicted past this many bytes; 0 keeps audio only
+# while a task is using it
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(10 * 1024 ** 3)))
+
+# Most tasks one batch submission may create, after playlist expansion
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
 
 DOWNLOAD_DIR.mkdir(exist_ok=True)
 
+# yt-dlp only extracts metadata in-process; the stream itself is piped to ffmpeg
 YTDL_OPTIONS = {
     'format': 'bestaudio/best',
-    'postprocessors': [{
-        'key': 'FFmpegExtractAudio',
-        'preferredcodec': 'mp3',
-    }],
-    'outtmpl': str(DOWNLOAD_DIR / '%(title)s.%(ext)s'),
     'quiet': True,
     'no_warnings': True,
 }
@@ -47,3 +161,10 @@ try:
 except json.JSONDecodeError:
     MODEL_MAP = DEFAULT_MODEL_MAP
 
+env_rate_limits = os.getenv("LLM_RATE_LIMITS", "")
+try:
+    rate_limits = json.loads(env_rate_limits)
+    LLM_RATE_LIMITS = rate_limits if isinstance(rate_limits, dict) else {}
+except json.JSONDecodeError:
+    LLM_RATE_LIMITS = {}
+
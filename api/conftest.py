@@ -0,0 +1,11 @@
+import pytest
+from database.manager import DBManager
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A DBManager on a fresh database file, in place of the process-wide one"""
+    monkeypatch.setattr(DBManager, "_instance", None)
+    manager = DBManager(tmp_path / "test.db")
+    yield manager
+    manager.close()
@@ -0,0 +1,35 @@
+# database/compression.py
+import zlib
+from typing import Tuple
+
+from config import BODY_COMPRESSION, BODY_COMPRESSION_LEVEL
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; zlib is always available
+    zstandard = None
+
+
+def _codec() -> str:
+    if BODY_COMPRESSION == "zstd" and zstandard is not None:
+        return "zstd"
+    return "zlib"
+
+
+def compress_text(text: str) -> Tuple[str, bytes]:
+    """Compress a transcript or summary; returns the codec name and the data"""
+    data = text.encode("utf-8")
+    codec = _codec()
+    if codec == "zstd":
+        return codec, zstandard.ZstdCompressor(level=BODY_COMPRESSION_LEVEL).compress(data)
+    return codec, zlib.compress(data, min(BODY_COMPRESSION_LEVEL, 9))
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed transcripts")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    raise ValueError(f"Unknown compression codec: {codec}")
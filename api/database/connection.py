@@ -0,0 +1,139 @@
+# database/connection.py
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, List, Optional, Tuple
+
+from database.compression import decompress_text
+from utils.logger import logger
+
+Job = Callable[[sqlite3.Connection], Any]
+
+
+def _decompress_body(codec: Optional[str], data: Optional[bytes]) -> Optional[str]:
+    return None if data is None else decompress_text(codec, data)
+
+
+def connect(path, busy_timeout: float, read_only: bool = False) -> sqlite3.Connection:
+    """Open a connection in WAL mode, so readers never wait on the writer"""
+    conn = sqlite3.connect(
+        path, timeout=busy_timeout, check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    # Lets SQL (the search index in particular) read compressed task bodies
+    conn.create_function("decompress_body", 2, _decompress_body, deterministic=True)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # Durable across application crashes; only an OS crash can lose the last commits
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if read_only:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
+class ReaderPool:
+    """A fixed set of read-only connections handed out one per thread at a time"""
+
+    def __init__(self, path, size: int, busy_timeout: float):
+        self._connections: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._all = [connect(path, busy_timeout, read_only=True) for _ in range(size)]
+        for conn in self._all:
+            self._connections.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self._connections.get()
+        try:
+            yield conn
+        finally:
+            self._connections.put(conn)
+
+    def run(self, job: Job) -> Any:
+        with self.connection() as conn:
+            return job(conn)
+
+    def close(self):
+        for conn in self._all:
+            conn.close()
+        self._all = []
+
+
+class WriteQueue:
+    """Every write goes through one connection owned by one thread.
+
+    Jobs that arrive while a transaction is being committed are picked up
+    together, up to ``batch_size``, and committed as a single transaction.
+    Each job runs inside its own savepoint, so one failing job is rolled back
+    and reported without affecting the others in the batch.
+    """
+
+    def __init__(self, path, batch_size: int, busy_timeout: float):
+        self.batch_size = batch_size
+        self.commits = 0
+        self.jobs = 0
+        self._conn = connect(path, busy_timeout)
+        self._queue: "queue.Queue[Optional[Tuple[Job, Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, job: Job) -> Future:
+        future: Future = Future()
+        self._queue.put((job, future))
+        return future
+
+    def _next_batch(self) -> Tuple[List[Tuple[Job, Future]], bool]:
+        batch, stop = [], False
+        item = self._queue.get()
+        while True:
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                break
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+        return batch, stop
+
+    def _run_batch(self, batch: List[Tuple[Job, Future]]):
+        results = []
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            for job, _ in batch:
+                self._conn.execute("SAVEPOINT job")
+                try:
+                    results.append((job(self._conn), None))
+                except Exception as e:  # reported to the caller of this job only
+                    self._conn.execute("ROLLBACK TO job")
+                    results.append((None, e))
+                self._conn.execute("RELEASE job")
+            self._conn.execute("COMMIT")
+        except Exception as e:
+            logger.error(f"Database write batch failed: {e}")
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            results = [(None, e)] * len(batch)
+        self.commits += 1
+        self.jobs += len(batch)
+        # Callers only hear back once their write is durable
+        for (_, future), (result, error) in zip(batch, results):
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def _run(self):
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._run_batch(batch)
+            if stop:
+                break
+        self._conn.close()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
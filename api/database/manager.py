@@ -1,82 +1,333 @@
-import sqlite3
+import re
+import json
+import time
 import asyncio
-from datetime import datetime
-from typing import Optional, Dict, Any
-from config import DATABASE_PATH
-from api.schemas import TaskStatus, TranscriptionResponse
-from utils.logger import logger # TODO: use logger
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Tuple
+from config import DATABASE_PATH, DB_READERS, DB_WRITE_BATCH, DB_BUSY_TIMEOUT
+from database.connection import ReaderPool, WriteQueue, connect
+from database.compression import compress_text, decompress_text
+from database.migrations import migrate
+from api.schemas import Priority, TaskStatus, TranscriptionResponse, TranscriptSegment
+from services.events import get_event_bus
+from utils.metrics import DB_SECONDS
+
+# Columns kept compressed in task_bodies instead of the transcriptions row
+BODY_FIELDS = ("content", "summary")
+# Columns covered by the task_search full-text index
+SEARCH_FIELDS = ("title", *BODY_FIELDS)
+# Tasks in these states may still read their video's cached audio, whichever process runs them
+AUDIO_READING_STATUSES = (TaskStatus.PENDING, TaskStatus.DOWNLOADING, TaskStatus.TRANSCRIBING)
+_AUDIO_IN_USE = f"""EXISTS (
+    SELECT 1 FROM transcriptions t WHERE t.video_key = audio_cache.video_key
+    AND t.status IN ({", ".join(f"'{status.value}'" for status in AUDIO_READING_STATUSES)})
+)"""
+
+
+def match_expression(query: str) -> str:
+    """Turn a search box query into an FTS5 expression.
+
+    Every word must match; "double quotes" keep a phrase together and a
+    trailing * matches a prefix. Everything else is taken literally, so user
+    input can never be an FTS5 syntax error.
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]+)"|(\S+)', query):
+        text = phrase or word
+        prefix = not phrase and text.endswith("*") and len(text) > 1
+        text = text.rstrip("*") if prefix else text
+        terms.append('"' + text.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
 
 
 class DBManager:
+    """Task storage on SQLite.
+
+    The database runs in WAL mode. Reads are served from a small pool of
+    read-only connections, so they never wait behind a write; every write is
+    queued to a single writer connection that commits whatever has piled up
+    as one transaction. Transcripts and summaries live compressed in a
+    separate table and are only read when a caller asks for them.
+    """
     _instance = None
     _initialized = False
 
-    def __new__(cls):
+    def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, path=DATABASE_PATH):
         if not self._initialized:
-            self.conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
+            self.path = path
+            conn = connect(path, DB_BUSY_TIMEOUT)
+            try:
+                self.schema_version = migrate(conn)
+            finally:
+                conn.close()
+            self._readers = ReaderPool(path, DB_READERS, DB_BUSY_TIMEOUT)
+            self._writer = WriteQueue(path, DB_WRITE_BATCH, DB_BUSY_TIMEOUT)
             self._initialized = True
-            self._init_db()
-
-    def _init_db(self):
-        self.conn.execute("""
-            CREATE TABLE IF NOT EXISTS transcriptions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                youtube_url TEXT NOT NULL,
-                title TEXT,
-                content TEXT,
-                summary TEXT,
-                status TEXT NOT NULL,
-                error_message TEXT,
-                created_at TIMESTAMP NOT NULL,
-                completed_at TIMESTAMP,
-                summary_provider TEXT,
-                summary_model TEXT
-            )
-        """)
-        self.conn.commit()
-
-    async def create_task(self, url: str) -> int:
-        def _create():
-            cursor = self.conn.execute(
+
+    @staticmethod
+    def _operation(job) -> str:
+        # Jobs are defined inside the public method they serve: "DBManager.get_task.<locals>._get"
+        parts = job.__qualname__.split(".")
+        return parts[1] if len(parts) > 2 else job.__name__
+
+    async def _read(self, job):
+        started = time.perf_counter()
+        try:
+            return await asyncio.to_thread(self._readers.run, job)
+        finally:
+            DB_SECONDS.observe(
+                time.perf_counter() - started, kind="read", operation=self._operation(job))
+
+    async def _write(self, job):
+        started = time.perf_counter()
+        try:
+            return await asyncio.wrap_future(self._writer.submit(job))
+        finally:
+            DB_SECONDS.observe(
+                time.perf_counter() - started, kind="write", operation=self._operation(job))
+
+    async def create_task(self, url: str, priority: Priority = Priority.NORMAL) -> int:
+        def _create(conn):
+            cursor = conn.execute(
                 """
                 INSERT INTO transcriptions 
-                (youtube_url, status, created_at) 
-                VALUES (?, ?, ?)
+                (youtube_url, status, created_at, priority) 
+                VALUES (?, ?, ?, ?)
                 """,
-                (str(url), TaskStatus.PENDING, datetime.now())
+                (str(url), TaskStatus.PENDING, datetime.now(), priority.rank)
             )
-            self.conn.commit()
+            self._index(conn, cursor.lastrowid)
             return cursor.lastrowid
 
-        return await asyncio.to_thread(_create)
+        task_id = await self._write(_create)
+        get_event_bus().publish_change()
+        return task_id
+
+    async def create_batch(
+        self,
+        source: Optional[str],
+        videos: List[Tuple[str, str]],
+        priority: Priority = Priority.NORMAL
+    ) -> Tuple[int, List[Tuple[int, str, str]], List[Tuple[str, str, Optional[int]]]]:
+        """Create a batch and a task per (url, video_key), all in one transaction.
 
-    async def get_task(self, task_id: int) -> Optional[TranscriptionResponse]:
-        def _get():
-            cursor = self.conn.execute(
+        Videos that already have a task which has not failed, and repeats
+        within the list, are skipped. Returns the batch id, the created
+        (task_id, url, video_key) and the skipped (url, video_key, existing
+        task id or None).
+        """
+        def _create(conn):
+            known: Dict[str, int] = {}
+            keys = list(dict.fromkeys(key for _, key in videos))
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                for row in conn.execute(
+                    f"""
+                    SELECT video_key, MAX(id) AS id FROM transcriptions
+                    WHERE video_key IN ({', '.join('?' for _ in chunk)}) AND status != ?
+                    GROUP BY video_key
+                    """,
+                    [*chunk, TaskStatus.FAILED.value]
+                ):
+                    known[row["video_key"]] = row["id"]
+
+            now = datetime.now()
+            batch_id = conn.execute(
+                "INSERT INTO batches (source, created_at) VALUES (?, ?)", (source, now)
+            ).lastrowid
+            created, skipped, seen = [], [], set()
+            for url, key in videos:
+                if key in known or key in seen:
+                    skipped.append((url, key, known.get(key)))
+                    continue
+                seen.add(key)
+                task_id = conn.execute(
+                    """
+                    INSERT INTO transcriptions
+                    (youtube_url, status, created_at, priority, video_key, batch_id)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (url, TaskStatus.PENDING, now, priority.rank, key, batch_id)
+                ).lastrowid
+                self._index(conn, task_id)
+                created.append((task_id, url, key))
+            return batch_id, created, skipped
+
+        result = await self._write(_create)
+        get_event_bus().publish_change()
+        return result
+
+    async def get_batch(self, batch_id: int) -> Optional[Dict[str, Any]]:
+        """A batch with its task count per status"""
+        def _get(conn):
+            row = conn.execute(
+                "SELECT id, source, created_at FROM batches WHERE id = ?", (batch_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            counts = {
+                count["status"]: count["n"] for count in conn.execute(
+                    "SELECT status, COUNT(*) AS n FROM transcriptions WHERE batch_id = ? GROUP BY status",
+                    (batch_id,)
+                )
+            }
+            return {
+                "id": row["id"],
+                "source": row["source"],
+                "created_at": datetime.fromisoformat(row["created_at"]),
+                "counts": counts,
+            }
+
+        return await self._read(_get)
+
+    async def get_task(self, task_id: int, with_body: bool = False) -> Optional[TranscriptionResponse]:
+        """Task metadata; ``content`` and ``summary`` stay None unless ``with_body``"""
+        def _get(conn):
+            cursor = conn.execute(
                 "SELECT * FROM transcriptions WHERE id = ?",
                 (task_id,)
             )
             row = cursor.fetchone()
-            if row:
-                return self._row_to_response(row)
-            return None
+            if row is None:
+                return None
+            bodies = self._load_bodies(conn, [task_id]).get(task_id, {}) if with_body else {}
+            return self._row_to_response(row, bodies)
+
+        return await self._read(_get)
+
+    async def get_body(self, task_id: int, field: str) -> Optional[str]:
+        """The transcript (``content``) or ``summary`` of a task"""
+        def _get(conn):
+            return self._load_bodies(conn, [task_id], [field]).get(task_id, {}).get(field)
 
-        return await asyncio.to_thread(_get)
+        return await self._read(_get)
+
+    async def list_tasks(
+        self,
+        fields: List[str],
+        limit: int,
+        before_id: Optional[int] = None,
+        statuses: Optional[List[TaskStatus]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        batch_id: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """One page of tasks, newest first, with only the requested columns.
 
-    async def get_all_tasks(self) -> Optional[TranscriptionResponse]:
-        def _get():
-            cursor = self.conn.execute(
-                "SELECT * FROM transcriptions"
+        Returns the rows and the id to pass as ``before_id`` for the next
+        page, or None on the last page. ``fields`` must already be validated
+        against TranscriptionResponse.
+        """
+        def _list(conn):
+            conditions, params = [], []
+            if before_id is not None:
+                conditions.append("id < ?")
+                params.append(before_id)
+            if statuses:
+                conditions.append(f"status IN ({', '.join('?' for _ in statuses)})")
+                params.extend(status.value for status in statuses)
+            if created_after is not None:
+                conditions.append("created_at >= ?")
+                params.append(created_after)
+            if created_before is not None:
+                conditions.append("created_at < ?")
+                params.append(created_before)
+            if batch_id is not None:
+                conditions.append("batch_id = ?")
+                params.append(batch_id)
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            columns = ", ".join(dict.fromkeys(
+                ["id", *(field for field in fields if field not in BODY_FIELDS)]))
+            rows = conn.execute(
+                f"SELECT {columns} FROM transcriptions {where} ORDER BY id DESC LIMIT ?",
+                [*params, limit + 1]
+            ).fetchall()
+            next_id = rows[limit - 1]["id"] if len(rows) > limit else None
+            rows = rows[:limit]
+            wanted = [field for field in BODY_FIELDS if field in fields]
+            bodies = self._load_bodies(conn, [row["id"] for row in rows], wanted) if wanted else {}
+            return [self._project(row, fields, bodies.get(row["id"], {})) for row in rows], next_id
+
+        return await self._read(_list)
+
+    async def get_changes(
+        self,
+        since: int,
+        fields: List[str],
+        limit: int
+    ) -> Tuple[List[Dict[str, Any]], List[int], int, bool]:
+        """Tasks changed and deleted after change number ``since``, oldest change first.
+
+        Returns the changed tasks (only the requested columns), the deleted
+        task ids, the change number to resume from, and whether more changes
+        follow. With nothing more to read, the resume point is the latest
+        change number, so an idle client does not rescan.
+        """
+        def _changes(conn):
+            columns = ", ".join(dict.fromkeys(
+                ["id", "change_seq", *(field for field in fields if field not in BODY_FIELDS)]))
+            # One snapshot for the three reads, so the resume point matches the rows
+            conn.execute("BEGIN")
+            try:
+                rows = conn.execute(
+                    f"""
+                    SELECT {columns} FROM transcriptions
+                    WHERE change_seq > ? ORDER BY change_seq LIMIT ?
+                    """,
+                    (since, limit + 1)
+                ).fetchall()
+                tombstones = conn.execute(
+                    """
+                    SELECT task_id, change_seq FROM deleted_tasks
+                    WHERE change_seq > ? ORDER BY change_seq LIMIT ?
+                    """,
+                    (since, limit + 1)
+                ).fetchall()
+                latest = conn.execute("SELECT seq FROM change_counter WHERE id = 1").fetchone()[0]
+                changes = sorted(
+                    [(row["change_seq"], row, None) for row in rows]
+                    + [(row["change_seq"], None, row["task_id"]) for row in tombstones],
+                    key=lambda change: change[0]
+                )
+                has_more = len(changes) > limit
+                changes = changes[:limit]
+                changed = [row for _, row, _ in changes if row is not None]
+                wanted = [field for field in BODY_FIELDS if field in fields]
+                bodies = self._load_bodies(conn, [row["id"] for row in changed], wanted) if wanted else {}
+            finally:
+                conn.execute("COMMIT")
+            return (
+                [self._project(row, fields, bodies.get(row["id"], {})) for row in changed],
+                [task_id for _, _, task_id in changes if task_id is not None],
+                changes[-1][0] if has_more else max(latest, since),
+                has_more,
+            )
+
+        return await self._read(_changes)
+
+    async def latest_change(self) -> int:
+        """The newest change number, from which ``get_changes`` reads only what changes next"""
+        def _latest(conn):
+            return conn.execute("SELECT seq FROM change_counter WHERE id = 1").fetchone()[0]
+
+        return await self._read(_latest)
+
+    async def get_tasks_by_status(self, statuses: List[TaskStatus]) -> List[TranscriptionResponse]:
+        """Tasks in any of the given states, oldest first, without their bodies"""
+        def _get(conn):
+            placeholders = ", ".join("?" for _ in statuses)
+            cursor = conn.execute(
+                f"SELECT * FROM transcriptions WHERE status IN ({placeholders}) ORDER BY id",
+                [status.value for status in statuses]
             )
-            rows = cursor.fetchall()
-            return [self._row_to_response(row) for row in rows]
+            return [self._row_to_response(row, {}) for row in cursor.fetchall()]
 
-        return await asyncio.to_thread(_get)
+        return await self._read(_get)
 
     async def update_task_status(
         self,
@@ -84,15 +335,29 @@ class DBManager:
         status: TaskStatus,
         **kwargs: Dict[str, Any]
     ) -> bool:
-        def _update():
+        """Set a task's status and columns; False if the task is gone or was cancelled.
+
+        CANCELLED is final: a job that has not noticed its cancellation yet
+        (a worker process between lease heartbeats) cannot write over it.
+        """
+        columns, bodies = self._split_bodies(kwargs)
+
+        def _update(conn):
+            current = conn.execute(
+                "SELECT status FROM transcriptions WHERE id = ?", (task_id,)).fetchone()
+            if current is None:
+                return False
+            if current["status"] == TaskStatus.CANCELLED and status != TaskStatus.CANCELLED:
+                return False
+
             set_values = ["status = ?"]
             params = [status]
 
-            for key, value in kwargs.items():
+            for key, value in columns.items():
                 set_values.append(f"{key} = ?")
                 params.append(value)
 
-            if status in [TaskStatus.COMPLETED, TaskStatus.FAILED]:
+            if status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
                 set_values.append("completed_at = ?")
                 params.append(datetime.now())
 
@@ -104,36 +369,654 @@ class DBManager:
                 WHERE id = ?
             """
 
-            self.conn.execute(query, params)
-            self.conn.commit()
+            reindex = self._needs_reindex(kwargs)
+            if reindex:
+                self._unindex(conn, task_id)
+            conn.execute(query, params)
+            self._store_bodies(conn, task_id, bodies)
+            if reindex:
+                self._index(conn, task_id)
+            return True
+
+        updated = await self._write(_update)
+        if updated:
+            get_event_bus().publish(task_id, {"type": "status", "status": TaskStatus(status).value})
+            get_event_bus().publish_change()
+        return updated
+
+    async def update_task_fields(self, task_id: int, **kwargs: Dict[str, Any]) -> bool:
+        """Set columns without touching the task status"""
+        columns, bodies = self._split_bodies(kwargs)
+
+        def _update(conn):
+            reindex = self._needs_reindex(kwargs)
+            if reindex:
+                self._unindex(conn, task_id)
+            if columns:
+                assignments = ", ".join(f"{key} = ?" for key in columns)
+                conn.execute(
+                    f"UPDATE transcriptions SET {assignments} WHERE id = ?",
+                    [*columns.values(), task_id]
+                )
+            self._store_bodies(conn, task_id, bodies)
+            if reindex:
+                self._index(conn, task_id)
+            return True
+
+        updated = await self._write(_update)
+        get_event_bus().publish_change()
+        return updated
+
+    async def claim_task(
+        self,
+        owner: str,
+        statuses: List[TaskStatus],
+        lease_seconds: float,
+        max_attempts: int = 0
+    ) -> Optional[TranscriptionResponse]:
+        """Lease the most urgent task in one of ``statuses`` that no live lease covers.
+
+        Runs on the writer, inside ``BEGIN IMMEDIATE``, so two processes can
+        never claim the same task. A task of a video that another leased task
+        is already working on waits for that lease, and then usually completes
+        from the caches. A task whose earlier claims all ended without a
+        clean release ``max_attempts`` times is failed instead.
+        """
+        def _claim(conn):
+            now = time.time()
+            placeholders = ", ".join("?" for _ in statuses)
+            abandoned = False
+            while True:
+                row = conn.execute(
+                    f"""
+                    SELECT t.*, l.attempts AS lease_attempts FROM transcriptions t
+                    LEFT JOIN task_leases l ON l.task_id = t.id
+                    WHERE t.status IN ({placeholders}) AND (l.task_id IS NULL OR l.expires_at < ?)
+                    AND (t.video_key IS NULL OR NOT EXISTS (
+                        SELECT 1 FROM transcriptions same
+                        JOIN task_leases held ON held.task_id = same.id
+                        WHERE same.video_key = t.video_key AND same.id != t.id AND held.expires_at >= ?
+                    ))
+                    ORDER BY t.priority, t.id LIMIT 1
+                    """,
+                    [*(status.value for status in statuses), now, now]
+                ).fetchone()
+                if row is None:
+                    return None, abandoned
+                attempts = row["lease_attempts"] or 0
+                if max_attempts and attempts >= max_attempts:
+                    conn.execute(
+                        "UPDATE transcriptions SET status = ?, error_message = ?, completed_at = ? WHERE id = ?",
+                        (TaskStatus.FAILED, f"Abandoned after {attempts} interrupted attempts",
+                         datetime.now(), row["id"])
+                    )
+                    conn.execute("DELETE FROM task_leases WHERE task_id = ?", (row["id"],))
+                    abandoned = True
+                    continue
+                conn.execute(
+                    """
+                    INSERT INTO task_leases (task_id, owner, expires_at, attempts) VALUES (?, ?, ?, 1)
+                    ON CONFLICT (task_id) DO UPDATE SET
+                        owner = excluded.owner,
+                        expires_at = excluded.expires_at,
+                        attempts = attempts + 1
+                    """,
+                    (row["id"], owner, now + lease_seconds)
+                )
+                return self._row_to_response(row, {}), abandoned
+
+        task, abandoned = await self._write(_claim)
+        if abandoned:
+            get_event_bus().publish_change()
+        return task
+
+    async def renew_leases(self, owner: str, task_ids: List[int], lease_seconds: float) -> List[int]:
+        """Extend the owner's leases; returns the tasks it still holds"""
+        def _renew(conn):
+            placeholders = ", ".join("?" for _ in task_ids)
+            conn.execute(
+                f"UPDATE task_leases SET expires_at = ? WHERE owner = ? AND task_id IN ({placeholders})",
+                [time.time() + lease_seconds, owner, *task_ids]
+            )
+            cursor = conn.execute(
+                f"SELECT task_id FROM task_leases WHERE owner = ? AND task_id IN ({placeholders})",
+                [owner, *task_ids]
+            )
+            return [row["task_id"] for row in cursor.fetchall()]
+
+        if not task_ids:
+            return []
+        return await self._write(_renew)
+
+    async def release_lease(self, task_id: int, owner: Optional[str] = None) -> bool:
+        """Give a task's lease up; without ``owner`` the lease is revoked from whoever holds it"""
+        def _release(conn):
+            if owner is None:
+                conn.execute("DELETE FROM task_leases WHERE task_id = ?", (task_id,))
+            else:
+                conn.execute(
+                    "DELETE FROM task_leases WHERE task_id = ? AND owner = ?", (task_id, owner))
+            return True
+
+        return await self._write(_release)
+
+    async def release_leases(self, owner: str) -> bool:
+        def _release(conn):
+            conn.execute("DELETE FROM task_leases WHERE owner = ?", (owner,))
+            return True
+
+        return await self._write(_release)
+
+    async def find_audio_hash(self, video_key: str) -> Optional[str]:
+        """Audio hash recorded by an earlier task for the same video"""
+        def _find(conn):
+            row = conn.execute(
+                """
+                SELECT audio_hash FROM transcriptions
+                WHERE video_key = ? AND audio_hash IS NOT NULL
+                ORDER BY id DESC LIMIT 1
+                """,
+                (video_key,)
+            ).fetchone()
+            return row["audio_hash"] if row else None
+
+        return await self._read(_find)
+
+    async def get_cached_transcription(
+        self,
+        audio_hash: str,
+        model: str,
+        options: str
+    ) -> Optional[Dict[str, Any]]:
+        def _get(conn):
+            row = conn.execute(
+                """
+                SELECT title, codec, content, segments FROM transcription_cache
+                WHERE audio_hash = ? AND model = ? AND options = ?
+                """,
+                (audio_hash, model, options)
+            ).fetchone()
+            if row is None:
+                return None
+            return {
+                "title": row["title"],
+                "content": decompress_text(row["codec"], row["content"]),
+                "segments": json.loads(decompress_text(row["codec"], row["segments"])),
+            }
+
+        return await self._read(_get)
+
+    async def cache_transcription(
+        self,
+        audio_hash: str,
+        model: str,
+        options: str,
+        title: Optional[str],
+        content: str,
+        segments: List[TranscriptSegment]
+    ) -> bool:
+        # Compressed here, on the caller's side, to keep the writer thread free
+        codec, compressed_content = compress_text(content)
+        _, compressed_segments = compress_text(
+            json.dumps([s.model_dump(exclude={"offset"}) for s in segments]))
+
+        def _cache(conn):
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO transcription_cache
+                (audio_hash, model, options, title, codec, content, segments, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    audio_hash, model, options, title, codec,
+                    compressed_content, compressed_segments, datetime.now()
+                )
+            )
+            return True
+
+        return await self._write(_cache)
+
+    async def get_cached_summary(self, cache_key: str, max_age: float) -> Optional[str]:
+        def _get(conn):
+            return conn.execute(
+                "SELECT codec, summary, created_at FROM summary_cache WHERE cache_key = ?",
+                (cache_key,)
+            ).fetchone()
+
+        row = await self._read(_get)
+        if row is None:
+            return None
+        now = datetime.now()
+        expired = max_age > 0 and (now - datetime.fromisoformat(row["created_at"])).total_seconds() > max_age
+
+        def _touch(conn):
+            if expired:
+                conn.execute("DELETE FROM summary_cache WHERE cache_key = ?", (cache_key,))
+            else:
+                conn.execute(
+                    "UPDATE summary_cache SET last_used_at = ?, hits = hits + 1 WHERE cache_key = ?",
+                    (now, cache_key)
+                )
+
+        await self._write(_touch)
+        return None if expired else decompress_text(row["codec"], row["summary"])
+
+    async def cache_summary(
+        self,
+        cache_key: str,
+        summary: str,
+        max_entries: int,
+        max_age: float,
+        namespace: str = ""
+    ) -> bool:
+        """Store a summary, then evict expired and least recently used entries of its namespace"""
+        codec, data = compress_text(summary)
+
+        def _cache(conn):
+            now = datetime.now()
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO summary_cache
+                (cache_key, namespace, codec, summary, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (cache_key, namespace, codec, data, now, now)
+            )
+            if max_age > 0:
+                conn.execute(
+                    "DELETE FROM summary_cache WHERE namespace = ? AND created_at < ?",
+                    (namespace, now - timedelta(seconds=max_age))
+                )
+            if max_entries > 0:
+                conn.execute(
+                    """
+                    DELETE FROM summary_cache WHERE cache_key IN (
+                        SELECT cache_key FROM summary_cache WHERE namespace = ?
+                        ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (namespace, max_entries)
+                )
+            return True
+
+        return await self._write(_cache)
+
+    async def get_cached_audio(self, video_key: str, pcm_format: str) -> Optional[Dict[str, Any]]:
+        """Cached audio file of a video, marked as just used"""
+        def _get(conn):
+            row = conn.execute(
+                "SELECT * FROM audio_cache WHERE video_key = ? AND pcm_format = ?",
+                (video_key, pcm_format)
+            ).fetchone()
+            return dict(row) if row else None
+
+        row = await self._read(_get)
+        if row is not None:
+            def _touch(conn):
+                conn.execute(
+                    "UPDATE audio_cache SET last_used_at = ? WHERE video_key = ? AND pcm_format = ?",
+                    (datetime.now(), video_key, pcm_format)
+                )
+
+            await self._write(_touch)
+        return row
+
+    async def cache_audio(
+        self,
+        video_key: str,
+        pcm_format: str,
+        file_name: str,
+        title: Optional[str],
+        audio_hash: str,
+        size_bytes: int
+    ) -> bool:
+        def _cache(conn):
+            now = datetime.now()
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO audio_cache
+                (video_key, pcm_format, file_name, title, audio_hash, size_bytes, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (video_key, pcm_format, file_name, title, audio_hash, size_bytes, now, now)
+            )
             return True
 
-        return await asyncio.to_thread(_update)
+        return await self._write(_cache)
+
+    async def list_cached_audio(self) -> List[Dict[str, Any]]:
+        """Every cached audio file, least recently used first, with whether a task may be reading it"""
+        def _list(conn):
+            cursor = conn.execute(
+                f"SELECT *, {_AUDIO_IN_USE} AS in_use FROM audio_cache ORDER BY last_used_at")
+            return [dict(row) for row in cursor.fetchall()]
+
+        return await self._read(_list)
+
+    async def evict_cached_audio(self, video_key: str, pcm_format: str) -> bool:
+        """Drop a cached audio entry unless an unfinished task of the video may still read it.
+
+        The check and the delete are one write. Tasks record their video key
+        before they look the audio up, so once this returns True no task,
+        in any process, can still be handed the file.
+        """
+        def _evict(conn):
+            cursor = conn.execute(
+                f"DELETE FROM audio_cache WHERE video_key = ? AND pcm_format = ? AND NOT {_AUDIO_IN_USE}",
+                (video_key, pcm_format)
+            )
+            return cursor.rowcount > 0
+
+        return await self._write(_evict)
+
+    async def uncache_audio(self, video_key: str, pcm_format: str) -> bool:
+        def _delete(conn):
+            conn.execute(
+                "DELETE FROM audio_cache WHERE video_key = ? AND pcm_format = ?",
+                (video_key, pcm_format)
+            )
+            return True
+
+        return await self._write(_delete)
+
+    async def append_segments(
+        self,
+        task_id: int,
+        first_seq: int,
+        segments: List[Dict[str, Any]],
+        checkpoint: Optional[float] = None
+    ) -> List[TranscriptSegment]:
+        """Persist newly decoded segments, numbered from ``first_seq``.
+
+        ``checkpoint`` is the audio offset the segments reach; it is saved in
+        the same transaction so a resumed run never repeats or skips a
+        segment. Segments of a task deleted meanwhile are dropped.
+        """
+        stored = [
+            TranscriptSegment(
+                offset=first_seq + index,
+                start=segment["start"],
+                end=segment["end"],
+                text=segment["text"]
+            )
+            for index, segment in enumerate(segments)
+        ]
+
+        def _append(conn):
+            if checkpoint is not None:
+                updated = conn.execute(
+                    "UPDATE transcriptions SET checkpoint_offset = ? WHERE id = ?",
+                    (checkpoint, task_id)
+                ).rowcount
+            else:
+                updated = conn.execute(
+                    "SELECT 1 FROM transcriptions WHERE id = ?", (task_id,)).fetchone() is not None
+            if not updated:
+                return
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO transcript_segments (task_id, seq, start, end, text)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [(task_id, s.offset, s.start, s.end, s.text) for s in stored]
+            )
+
+        await self._write(_append)
+        return stored
+
+    async def get_checkpoint(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Progress of an interrupted transcription: the audio_hash it ran on and the offset reached"""
+        def _get(conn):
+            row = conn.execute(
+                """
+                SELECT audio_hash, checkpoint_offset FROM transcriptions
+                WHERE id = ? AND checkpoint_offset IS NOT NULL
+                """,
+                (task_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            return {"audio_hash": row["audio_hash"], "offset": row["checkpoint_offset"]}
+
+        return await self._read(_get)
+
+    async def get_segments(
+        self,
+        task_id: int,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[TranscriptSegment]:
+        def _get(conn):
+            cursor = conn.execute(
+                """
+                SELECT seq, start, end, text FROM transcript_segments
+                WHERE task_id = ? AND seq >= ? ORDER BY seq LIMIT ?
+                """,
+                (task_id, offset, -1 if limit is None else limit)
+            )
+            return [self._row_to_segment(row) for row in cursor.fetchall()]
+
+        return await self._read(_get)
+
+    async def get_segments_between(
+        self,
+        task_id: int,
+        start: float,
+        end: Optional[float] = None
+    ) -> List[TranscriptSegment]:
+        """Segments overlapping the [start, end) window, in order"""
+        def _get(conn):
+            conditions, params = ["task_id = ?", "end > ?"], [task_id, start]
+            if end is not None:
+                conditions.append("start < ?")
+                params.append(end)
+            cursor = conn.execute(
+                f"""
+                SELECT seq, start, end, text FROM transcript_segments
+                WHERE {' AND '.join(conditions)} ORDER BY seq
+                """,
+                params
+            )
+            return [self._row_to_segment(row) for row in cursor.fetchall()]
+
+        return await self._read(_get)
+
+    async def clear_segments(self, task_id: int) -> bool:
+        def _clear(conn):
+            conn.execute(
+                "DELETE FROM transcript_segments WHERE task_id = ?", (task_id,))
+            return True
+
+        return await self._write(_clear)
 
     async def delete_task(self, task_id: int) -> bool:
-        def _delete():
-            self.conn.execute(
+        def _delete(conn):
+            self._unindex(conn, task_id)
+            conn.execute(
                 "DELETE FROM transcriptions WHERE id = ?",
                 (task_id,)
             )
-            self.conn.commit()
+            conn.execute(
+                "DELETE FROM transcript_segments WHERE task_id = ?",
+                (task_id,)
+            )
+            conn.execute(
+                "DELETE FROM task_bodies WHERE task_id = ?",
+                (task_id,)
+            )
+            conn.execute(
+                "DELETE FROM task_leases WHERE task_id = ?",
+                (task_id,)
+            )
             return True
 
-        return await asyncio.to_thread(_delete)
+        deleted = await self._write(_delete)
+        get_event_bus().publish_change()
+        return deleted
+
+    async def search_tasks(
+        self,
+        query: str,
+        limit: int,
+        offset: int = 0,
+        marks: Tuple[str, str] = ("<mark>", "</mark>")
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Tasks matching ``query``, best first, with a highlighted snippet.
+
+        Returns the page and whether more results follow. Ranking only
+        touches the index; snippets are built for the rows on this page alone,
+        since each one has to decompress its transcript.
+        """
+        expression = match_expression(query)
+
+        def _search(conn):
+            if not expression:
+                return [], False
+            ranked = conn.execute(
+                "SELECT rowid, rank FROM task_search WHERE task_search MATCH ? ORDER BY rank LIMIT ? OFFSET ?",
+                (expression, limit + 1, offset)
+            ).fetchall()
+            has_more = len(ranked) > limit
+            ranked = ranked[:limit]
+            if not ranked:
+                return [], has_more
+            ids = [row["rowid"] for row in ranked]
+            rows = {
+                row["id"]: row for row in conn.execute(
+                    f"""
+                    SELECT id, youtube_url, title, status, created_at, completed_at, updated_at
+                    FROM transcriptions WHERE id IN ({', '.join('?' for _ in ids)})
+                    """,
+                    ids
+                )
+            }
+            fields = ["id", "youtube_url", "title", "status", "created_at", "completed_at", "updated_at"]
+            items = []
+            for hit in ranked:
+                snippet = conn.execute(
+                    """
+                    SELECT snippet(task_search, -1, ?, ?, '…', 24) AS snippet
+                    FROM task_search WHERE task_search MATCH ? AND rowid = ?
+                    """,
+                    (*marks, expression, hit["rowid"])
+                ).fetchone()
+                item = self._project(rows[hit["rowid"]], fields, {})
+                item["score"] = round(-hit["rank"], 4)
+                item["snippet"] = snippet["snippet"] if snippet else None
+                items.append(item)
+            return items, has_more
+
+        return await self._read(_search)
+
+    @staticmethod
+    def _needs_reindex(values: Dict[str, Any]) -> bool:
+        return any(key in SEARCH_FIELDS for key in values)
+
+    @staticmethod
+    def _index(conn, task_id: int):
+        conn.execute(
+            """
+            INSERT INTO task_search (rowid, title, content, summary)
+            SELECT id, title, content, summary FROM task_search_source WHERE id = ?
+            """,
+            (task_id,)
+        )
+
+    @staticmethod
+    def _unindex(conn, task_id: int):
+        # External-content FTS5 removes a row by being shown exactly what it indexed
+        conn.execute(
+            """
+            INSERT INTO task_search (task_search, rowid, title, content, summary)
+            SELECT 'delete', id, title, content, summary FROM task_search_source WHERE id = ?
+            """,
+            (task_id,)
+        )
+
+    @staticmethod
+    def _split_bodies(values: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        columns = {key: value for key, value in values.items() if key not in BODY_FIELDS}
+        bodies = {key: value for key, value in values.items() if key in BODY_FIELDS}
+        return columns, bodies
+
+    @staticmethod
+    def _store_bodies(conn, task_id: int, bodies: Dict[str, Optional[str]]):
+        for field, text in bodies.items():
+            if text is None:
+                conn.execute(
+                    "DELETE FROM task_bodies WHERE task_id = ? AND field = ?", (task_id, field))
+                continue
+            codec, data = compress_text(text)
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO task_bodies (task_id, field, codec, size, data)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (task_id, field, codec, len(text.encode("utf-8")), data)
+            )
+
+    @staticmethod
+    def _load_bodies(
+        conn,
+        task_ids: List[int],
+        fields: Tuple[str, ...] = BODY_FIELDS
+    ) -> Dict[int, Dict[str, str]]:
+        if not task_ids or not fields:
+            return {}
+        rows = conn.execute(
+            f"""
+            SELECT task_id, field, codec, data FROM task_bodies
+            WHERE task_id IN ({', '.join('?' for _ in task_ids)})
+            AND field IN ({', '.join('?' for _ in fields)})
+            """,
+            [*task_ids, *fields]
+        ).fetchall()
+        bodies: Dict[int, Dict[str, str]] = {}
+        for row in rows:
+            bodies.setdefault(row["task_id"], {})[row["field"]] = decompress_text(row["codec"], row["data"])
+        return bodies
+
+    def _project(self, row, fields: List[str], bodies: Dict[str, str]) -> Dict[str, Any]:
+        item = {field: bodies.get(field) if field in BODY_FIELDS else row[field] for field in fields}
+        for field in ("created_at", "completed_at", "updated_at"):
+            if item.get(field):
+                item[field] = datetime.fromisoformat(item[field])
+        if "priority" in item:
+            item["priority"] = Priority.from_rank(item["priority"])
+        return item
 
-    def _row_to_response(self, row) -> TranscriptionResponse:
+    @staticmethod
+    def _row_to_segment(row) -> TranscriptSegment:
+        return TranscriptSegment(offset=row["seq"], start=row["start"], end=row["end"], text=row["text"])
+
+    def _row_to_response(self, row, bodies: Dict[str, str]) -> TranscriptionResponse:
         return TranscriptionResponse(
-            id=row[0],
-            youtube_url=row[1],
-            title=row[2],
-            content=row[3],
-            summary=row[4],
-            status=TaskStatus(row[5]),
-            error_message=row[6],
-            created_at=row[7],
-            completed_at=row[8]
+            id=row["id"],
+            youtube_url=row["youtube_url"],
+            title=row["title"],
+            content=bodies.get("content"),
+            summary=bodies.get("summary"),
+            status=TaskStatus(row["status"]),
+            priority=Priority.from_rank(row["priority"]),
+            error_message=row["error_message"],
+            created_at=row["created_at"],
+            completed_at=row["completed_at"],
+            summary_provider=row["summary_provider"],
+            summary_model=row["summary_model"],
+            summary_max_length=row["summary_max_length"],
+            batch_id=row["batch_id"],
+            updated_at=row["updated_at"]
         )
 
-    def __del__(self):
-        if hasattr(self, 'conn'):
-            self.conn.close()
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "schema_version": self.schema_version,
+            "write_jobs": self._writer.jobs,
+            "write_commits": self._writer.commits,
+        }
+
+    def close(self):
+        """Flush queued writes and close every connection"""
+        if self._initialized:
+            self._writer.close()
+            self._readers.close()
@@ -0,0 +1,381 @@
+# database/migrations.py
+"""Versioned schema changes.
+
+The schema version lives in ``PRAGMA user_version``. On startup every
+migration newer than the stored version runs, in order, each in its own
+transaction. Append new migrations to the end of MIGRATIONS; never edit one
+that has shipped. Databases created before versioning report version 0, so
+the early steps are written to be safe on tables that already exist.
+"""
+import sqlite3
+from typing import Callable, List, Optional, Tuple
+
+from config import SEARCH_TOKENIZER
+from database.compression import compress_text
+from utils.logger import logger
+
+
+def _add_column(conn: sqlite3.Connection, table: str, name: str, definition: str):
+    columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if name not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+
+def _create_transcriptions(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS transcriptions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            youtube_url TEXT NOT NULL,
+            title TEXT,
+            content TEXT,
+            summary TEXT,
+            status TEXT NOT NULL,
+            error_message TEXT,
+            created_at TIMESTAMP NOT NULL,
+            completed_at TIMESTAMP,
+            summary_provider TEXT,
+            summary_model TEXT
+        )
+    """)
+
+
+def _add_task_columns(conn: sqlite3.Connection):
+    _add_column(conn, "transcriptions", "priority", "INTEGER NOT NULL DEFAULT 1")
+    _add_column(conn, "transcriptions", "summary_max_length", "INTEGER")
+    _add_column(conn, "transcriptions", "video_key", "TEXT")
+    _add_column(conn, "transcriptions", "audio_hash", "TEXT")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transcriptions_video_key ON transcriptions (video_key)")
+
+
+def _create_segments_and_caches(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS transcript_segments (
+            task_id INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            start REAL NOT NULL,
+            end REAL NOT NULL,
+            text TEXT NOT NULL,
+            PRIMARY KEY (task_id, seq)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS transcription_cache (
+            audio_hash TEXT NOT NULL,
+            model TEXT NOT NULL,
+            options TEXT NOT NULL,
+            title TEXT,
+            content TEXT NOT NULL,
+            segments TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            PRIMARY KEY (audio_hash, model, options)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS summary_cache (
+            cache_key TEXT PRIMARY KEY,
+            summary TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            last_used_at TIMESTAMP NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_summary_cache_last_used ON summary_cache (last_used_at)")
+
+
+def _index_status_and_created_at(conn: sqlite3.Connection):
+    # (status, id) serves both the status filter and the id ordering used by listings
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transcriptions_status ON transcriptions (status, id)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transcriptions_created_at ON transcriptions (created_at)")
+
+
+def _compress_cache_table(conn: sqlite3.Connection, table: str, create: str, fields: Tuple[str, ...]):
+    """Rebuild a cache table with ``create``, which stores ``fields`` compressed under one ``codec``"""
+    columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if "codec" in columns:
+        return
+    conn.execute(f"ALTER TABLE {table} RENAME TO {table}_inline")
+    conn.execute(create)
+    for row in conn.execute(f"SELECT * FROM {table}_inline").fetchall():
+        values = dict(row)
+        for field in fields:
+            values["codec"], values[field] = compress_text(row[field])
+        conn.execute(
+            f"INSERT INTO {table} ({', '.join(values)}) VALUES ({', '.join('?' for _ in values)})",
+            list(values.values())
+        )
+    conn.execute(f"DROP TABLE {table}_inline")
+
+
+def _move_bodies_out_of_row(conn: sqlite3.Connection):
+    # A rowid table rather than WITHOUT ROWID: the rows are large blobs
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS task_bodies (
+            task_id INTEGER NOT NULL,
+            field TEXT NOT NULL,
+            codec TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            PRIMARY KEY (task_id, field)
+        )
+    """)
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(transcriptions)")}
+    for field in ("content", "summary"):
+        if field not in columns:
+            continue
+        rows = conn.execute(
+            f"SELECT id, {field} FROM transcriptions WHERE {field} IS NOT NULL").fetchall()
+        for row in rows:
+            codec, data = compress_text(row[field])
+            conn.execute(
+                "INSERT OR REPLACE INTO task_bodies (task_id, field, codec, size, data) VALUES (?, ?, ?, ?, ?)",
+                (row["id"], field, codec, len(row[field].encode("utf-8")), data)
+            )
+        # The freed pages are reused by later writes; VACUUM to shrink the file itself
+        conn.execute(f"ALTER TABLE transcriptions DROP COLUMN {field}")
+    # Cached transcripts would otherwise keep an uncompressed copy of every body
+    _compress_cache_table(conn, "transcription_cache", """
+        CREATE TABLE transcription_cache (
+            audio_hash TEXT NOT NULL,
+            model TEXT NOT NULL,
+            options TEXT NOT NULL,
+            title TEXT,
+            codec TEXT NOT NULL,
+            content BLOB NOT NULL,
+            segments BLOB NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            PRIMARY KEY (audio_hash, model, options)
+        )
+    """, ("content", "segments"))
+    _compress_cache_table(conn, "summary_cache", """
+        CREATE TABLE summary_cache (
+            cache_key TEXT PRIMARY KEY,
+            codec TEXT NOT NULL,
+            summary BLOB NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            last_used_at TIMESTAMP NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0
+        )
+    """, ("summary",))
+    # The old index went with the old table
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_summary_cache_last_used ON summary_cache (last_used_at)")
+
+
+def _create_search_index(conn: sqlite3.Connection):
+    # The index stores no text of its own: it reads titles and decompressed
+    # bodies through this view when building snippets or rebuilding
+    conn.execute("""
+        CREATE VIEW IF NOT EXISTS task_search_source AS
+        SELECT t.id, t.title,
+               decompress_body(c.codec, c.data) AS content,
+               decompress_body(s.codec, s.data) AS summary
+        FROM transcriptions t
+        LEFT JOIN task_bodies c ON c.task_id = t.id AND c.field = 'content'
+        LEFT JOIN task_bodies s ON s.task_id = t.id AND s.field = 'summary'
+    """)
+    tokenizer = SEARCH_TOKENIZER.replace("'", "''")
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS task_search USING fts5(
+            title, content, summary,
+            content='task_search_source', content_rowid='id',
+            tokenize='{tokenizer}'
+        )
+    """)
+    # Title matches count most, then summaries, then the transcript itself
+    conn.execute("INSERT INTO task_search (task_search, rank) VALUES ('rank', 'bm25(10.0, 1.0, 4.0)')")
+    conn.execute("INSERT INTO task_search (task_search) VALUES ('rebuild')")
+
+
+def _index_segment_times(conn: sqlite3.Connection):
+    # Covers time-range lookups without touching the segment text
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transcript_segments_end ON transcript_segments (task_id, end, start)")
+
+
+def _create_batches(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS batches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT,
+            created_at TIMESTAMP NOT NULL
+        )
+    """)
+    _add_column(conn, "transcriptions", "batch_id", "INTEGER")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transcriptions_batch ON transcriptions (batch_id, status)")
+
+
+# Local time, in the format Python's datetime stores and fromisoformat reads
+_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+_NEXT_CHANGE = "(SELECT seq FROM change_counter WHERE id = 1)"
+
+
+def _create_change_feed(conn: sqlite3.Connection):
+    """Number every task insert, update and delete from one counter.
+
+    Triggers keep the numbering complete whichever code path writes a task.
+    Deleted tasks leave a tombstone so clients following the feed drop them
+    too, and the counter is its own table so it never goes back when the most
+    recently changed task is deleted.
+    """
+    _add_column(conn, "transcriptions", "change_seq", "INTEGER")
+    _add_column(conn, "transcriptions", "updated_at", "TIMESTAMP")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_counter (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            seq INTEGER NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS deleted_tasks (
+            task_id INTEGER PRIMARY KEY,
+            change_seq INTEGER NOT NULL,
+            deleted_at TIMESTAMP NOT NULL
+        )
+    """)
+    conn.execute(
+        "UPDATE transcriptions SET change_seq = id, updated_at = COALESCE(completed_at, created_at)")
+    conn.execute(
+        "INSERT OR REPLACE INTO change_counter (id, seq) "
+        "SELECT 1, COALESCE(MAX(id), 0) FROM transcriptions")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transcriptions_change_seq ON transcriptions (change_seq)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_deleted_tasks_change_seq ON deleted_tasks (change_seq)")
+
+    stamp = f"""
+        UPDATE change_counter SET seq = seq + 1 WHERE id = 1;
+        UPDATE transcriptions SET change_seq = {_NEXT_CHANGE}, updated_at = {_NOW} WHERE id = NEW.id;
+    """
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS task_inserted AFTER INSERT ON transcriptions
+        BEGIN {stamp} END
+    """)
+    # The trigger's own UPDATE changes change_seq, so it does not count itself
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS task_updated AFTER UPDATE ON transcriptions
+        WHEN NEW.change_seq IS OLD.change_seq
+        BEGIN {stamp} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS task_deleted AFTER DELETE ON transcriptions
+        BEGIN
+            UPDATE change_counter SET seq = seq + 1 WHERE id = 1;
+            INSERT OR REPLACE INTO deleted_tasks (task_id, change_seq, deleted_at)
+            VALUES (OLD.id, {_NEXT_CHANGE}, {_NOW});
+        END
+    """)
+    # A new transcript or summary is a change to its task; this UPDATE fires task_updated
+    for event in ("INSERT", "DELETE"):
+        row = "NEW" if event == "INSERT" else "OLD"
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS task_body_{event.lower()}ed AFTER {event} ON task_bodies
+            BEGIN
+                UPDATE transcriptions SET updated_at = {_NOW} WHERE id = {row}.task_id;
+            END
+        """)
+
+
+def _add_transcription_checkpoints(conn: sqlite3.Connection):
+    """How far an interrupted transcription got; its audio is found in the audio cache by video key"""
+    _add_column(conn, "transcriptions", "checkpoint_offset", "REAL")
+
+
+def _create_audio_cache(conn: sqlite3.Connection):
+    """Index of the decoded audio kept in the download directory, one file per video and format"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS audio_cache (
+            video_key TEXT NOT NULL,
+            pcm_format TEXT NOT NULL,
+            file_name TEXT NOT NULL,
+            title TEXT,
+            audio_hash TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            last_used_at TIMESTAMP NOT NULL,
+            PRIMARY KEY (video_key, pcm_format)
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_audio_cache_last_used ON audio_cache (last_used_at)")
+
+
+def _create_task_leases(conn: sqlite3.Connection):
+    """Which worker process holds a task, until when, and how often it has been claimed.
+
+    Leases live in their own table so heartbeats do not touch the task row
+    and show up in the change feed.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS task_leases (
+            task_id INTEGER PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 1
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_task_leases_owner ON task_leases (owner)")
+
+
+def _add_summary_cache_namespaces(conn: sqlite3.Connection):
+    """Keep map-reduce partial summaries apart from final ones, each with its own size limit"""
+    _add_column(conn, "summary_cache", "namespace", "TEXT NOT NULL DEFAULT ''")
+    conn.execute("DROP INDEX IF EXISTS idx_summary_cache_last_used")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_summary_cache_namespace "
+        "ON summary_cache (namespace, last_used_at)")
+
+
+MIGRATIONS: List[Tuple[str, Callable[[sqlite3.Connection], None]]] = [
+    ("create transcriptions", _create_transcriptions),
+    ("task priority, summary length and dedup keys", _add_task_columns),
+    ("transcript segments, transcription and summary caches", _create_segments_and_caches),
+    ("index status and created_at", _index_status_and_created_at),
+    ("compressed transcript and summary bodies", _move_bodies_out_of_row),
+    ("full-text search index", _create_search_index),
+    ("index segment times", _index_segment_times),
+    ("batches", _create_batches),
+    ("change feed", _create_change_feed),
+    ("transcription checkpoints", _add_transcription_checkpoints),
+    ("audio cache", _create_audio_cache),
+    ("task leases", _create_task_leases),
+    ("summary cache namespaces", _add_summary_cache_namespaces),
+]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, target: Optional[int] = None) -> int:
+    """Bring the schema up to ``target`` (default: latest); returns the resulting version.
+
+    ``conn`` must be in autocommit mode (``isolation_level=None``). Several
+    processes may start against the same file at once, so the version is
+    read again under the write lock before each step.
+    """
+    current = schema_version(conn)
+    for version, (description, step) in enumerate(MIGRATIONS, start=1):
+        if version <= current:
+            continue
+        if target is not None and version > target:
+            break
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(conn) >= version:
+                conn.execute("COMMIT")
+                current = version
+                continue
+            logger.info(f"Applying database migration {version}: {description}")
+            step(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        current = version
+    return current
@@ -0,0 +1,105 @@
+import asyncio
+import multiprocessing
+import time
+import pytest
+from api.schemas import Priority, TaskStatus
+from database.manager import DBManager
+
+PENDING = [TaskStatus.PENDING]
+
+
+def _claim_until_empty(path, owner, results):
+    """One worker process: claim every task it can get from the shared database"""
+    async def claim():
+        db = DBManager(path)
+        claimed = []
+        while True:
+            task = await db.claim_task(owner, PENDING, lease_seconds=60)
+            if task is None:
+                break
+            claimed.append(task.id)
+        db.close()
+        return claimed
+
+    results.put((owner, asyncio.run(claim())))
+
+
+class TestLeases:
+    @pytest.mark.asyncio
+    async def test_claimers_never_share_a_task(self, db):
+        ids = [await db.create_task(f"https://example.com/{i}") for i in range(30)]
+        claims = await asyncio.gather(
+            *(db.claim_task(f"w{i}", PENDING, lease_seconds=60) for i in range(40)))
+        claimed = [task.id for task in claims if task is not None]
+        assert sorted(claimed) == ids
+        assert claims.count(None) == 10
+
+    def test_worker_processes_never_share_a_task(self, db):
+        ids = [asyncio.run(db.create_task(f"https://example.com/{i}")) for i in range(60)]
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        workers = [
+            context.Process(target=_claim_until_empty, args=(db.path, f"w{i}", results))
+            for i in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        claims = dict(results.get(timeout=60) for _ in workers)
+        for worker in workers:
+            worker.join(timeout=10)
+        claimed = [task_id for owner_claims in claims.values() for task_id in owner_claims]
+        assert sorted(claimed) == ids
+
+    @pytest.mark.asyncio
+    async def test_most_urgent_task_first(self, db):
+        low = await db.create_task("https://example.com/low", Priority.LOW)
+        high = await db.create_task("https://example.com/high", Priority.HIGH)
+        assert (await db.claim_task("w1", PENDING, 60)).id == high
+        assert (await db.claim_task("w1", PENDING, 60)).id == low
+
+    @pytest.mark.asyncio
+    async def test_task_of_a_video_being_worked_on_waits(self, db):
+        first = await db.create_task("https://example.com/a")
+        second = await db.create_task("https://example.com/a?t=1")
+        other = await db.create_task("https://example.com/b")
+        for task_id in (first, second):
+            await db.update_task_fields(task_id, video_key="example:a")
+
+        assert (await db.claim_task("w1", PENDING, 60)).id == first
+        assert (await db.claim_task("w2", PENDING, 60)).id == other
+        assert await db.claim_task("w2", PENDING, 60) is None
+
+        await db.update_task_status(first, TaskStatus.COMPLETED)
+        await db.release_lease(first, "w1")
+        assert (await db.claim_task("w2", PENDING, 60)).id == second
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed(self, db):
+        task_id = await db.create_task("https://example.com/a")
+        assert (await db.claim_task("w1", PENDING, lease_seconds=0.05)).id == task_id
+        assert await db.claim_task("w2", PENDING, 60) is None
+
+        time.sleep(0.1)
+        assert (await db.claim_task("w2", PENDING, 60)).id == task_id
+        # The first owner finds out at its next heartbeat
+        assert await db.renew_leases("w1", [task_id], 60) == []
+        assert await db.renew_leases("w2", [task_id], 60) == [task_id]
+
+    @pytest.mark.asyncio
+    async def test_released_lease_is_reclaimed_at_once(self, db):
+        task_id = await db.create_task("https://example.com/a")
+        await db.claim_task("w1", PENDING, 60)
+        await db.release_leases("w1")
+        assert (await db.claim_task("w2", PENDING, 60)).id == task_id
+
+    @pytest.mark.asyncio
+    async def test_task_fails_after_max_attempts(self, db):
+        task_id = await db.create_task("https://example.com/a")
+        for _ in range(2):
+            assert (await db.claim_task("w1", PENDING, 0.01, max_attempts=2)).id == task_id
+            time.sleep(0.05)
+
+        assert await db.claim_task("w1", PENDING, 60, max_attempts=2) is None
+        task = await db.get_task(task_id)
+        assert task.status == TaskStatus.FAILED
+        assert task.error_message == "Abandoned after 2 interrupted attempts"
@@ -0,0 +1,136 @@
+from datetime import datetime
+import pytest
+from api.schemas import TaskStatus
+from database.connection import connect
+from database.manager import DBManager
+from database.migrations import MIGRATIONS, migrate, schema_version
+
+LATEST = len(MIGRATIONS)
+CONTENT = "we talked about the model and then about the data " * 200
+SUMMARY = "A talk about models and data."
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def open_db(monkeypatch):
+    managers = []
+
+    def open_manager(path):
+        monkeypatch.setattr(DBManager, "_instance", None)
+        managers.append(DBManager(path))
+        return managers[-1]
+
+    yield open_manager
+    for manager in managers:
+        manager.close()
+
+
+def create_baseline(path):
+    """The unversioned schema the application shipped with, holding a finished and a new task"""
+    conn = connect(path, busy_timeout=5)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS transcriptions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            youtube_url TEXT NOT NULL,
+            title TEXT,
+            content TEXT,
+            summary TEXT,
+            status TEXT NOT NULL,
+            error_message TEXT,
+            created_at TIMESTAMP NOT NULL,
+            completed_at TIMESTAMP,
+            summary_provider TEXT,
+            summary_model TEXT
+        )
+    """)
+    conn.execute(
+        """
+        INSERT INTO transcriptions
+        (youtube_url, title, content, summary, status, created_at, completed_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        ("https://example.com/done", "Done", CONTENT, SUMMARY,
+         TaskStatus.COMPLETED, datetime.now(), datetime.now())
+    )
+    conn.execute(
+        "INSERT INTO transcriptions (youtube_url, status, created_at) VALUES (?, ?, ?)",
+        ("https://example.com/new", TaskStatus.PENDING, datetime.now())
+    )
+    return conn
+
+
+class TestMigrations:
+    @pytest.mark.asyncio
+    async def test_baseline_database_reaches_latest_version(self, path, open_db):
+        conn = create_baseline(path)
+        assert schema_version(conn) == 0
+        conn.close()
+
+        db = open_db(path)
+        conn = connect(path, busy_timeout=5)
+        assert schema_version(conn) == LATEST
+        # Migration 5 moved the bodies into task_bodies and dropped the columns
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(transcriptions)")}
+        assert not {"content", "summary"} & columns
+        bodies = conn.execute("SELECT task_id, field, size FROM task_bodies ORDER BY field").fetchall()
+        assert [tuple(row) for row in bodies] == [
+            (1, "content", len(CONTENT)), (1, "summary", len(SUMMARY))]
+        conn.close()
+
+        done = await db.get_task(1, with_body=True)
+        assert (done.title, done.status) == ("Done", TaskStatus.COMPLETED)
+        assert (done.content, done.summary) == (CONTENT, SUMMARY)
+        pending = await db.get_task(2, with_body=True)
+        assert (pending.status, pending.content) == (TaskStatus.PENDING, None)
+        # Columns added on the way get their defaults, and the search index covers old rows
+        assert done.priority is not None
+        results, _ = await db.search_tasks("model", limit=10)
+        assert [row["id"] for row in results] == [1]
+
+    @pytest.mark.asyncio
+    async def test_cached_bodies_are_compressed(self, path, open_db):
+        conn = connect(path, busy_timeout=5)
+        migrate(conn, target=4)
+        conn.execute(
+            """
+            INSERT INTO transcription_cache
+            (audio_hash, model, options, title, content, segments, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            ("hash", "base", "{}", "Done", CONTENT, '[{"start": 0, "end": 1, "text": "we"}]',
+             datetime.now())
+        )
+        conn.execute(
+            "INSERT INTO summary_cache (cache_key, summary, created_at, last_used_at) VALUES (?, ?, ?, ?)",
+            ("key", SUMMARY, datetime.now(), datetime.now())
+        )
+        conn.close()
+
+        db = open_db(path)
+        cached = await db.get_cached_transcription("hash", "base", "{}")
+        assert cached == {
+            "title": "Done",
+            "content": CONTENT,
+            "segments": [{"start": 0, "end": 1, "text": "we"}],
+        }
+        assert await db.get_cached_summary("key", max_age=0) == SUMMARY
+
+    def test_migrating_again_changes_nothing(self, path):
+        conn = create_baseline(path)
+        assert migrate(conn) == LATEST
+        schema = conn.execute("SELECT sql FROM sqlite_master ORDER BY name").fetchall()
+        assert migrate(conn) == LATEST
+        assert conn.execute("SELECT sql FROM sqlite_master ORDER BY name").fetchall() == schema
+        conn.close()
+
+    def test_stops_at_target_version(self, path):
+        conn = create_baseline(path)
+        assert migrate(conn, target=4) == 4
+        assert schema_version(conn) == 4
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(transcriptions)")}
+        assert "content" in columns
+        conn.close()
@@ -0,0 +1,82 @@
+import pytest
+from api.schemas import TaskStatus
+from database.manager import match_expression
+
+
+async def search(db, query, limit=10):
+    results, _ = await db.search_tasks(query, limit=limit)
+    return [row["id"] for row in results]
+
+
+async def check_index(db):
+    # Fails if the index holds anything other than exactly what task_search_source shows
+    await db._write(lambda conn: conn.execute(
+        "INSERT INTO task_search (task_search, rank) VALUES ('integrity-check', 1)"))
+
+
+async def completed_task(db, url, title, content, summary=None):
+    task_id = await db.create_task(url)
+    await db.update_task_status(
+        task_id, TaskStatus.COMPLETED, title=title, content=content, summary=summary)
+    return task_id
+
+
+class TestSearch:
+    @pytest.mark.asyncio
+    async def test_finds_title_transcript_and_summary(self, db):
+        task_id = await completed_task(
+            db, "https://example.com/a", "Gardening basics", "we planted tomatoes", "About soil")
+        await completed_task(db, "https://example.com/b", "Cooking", "we boiled pasta")
+        assert await search(db, "gardening") == [task_id]
+        assert await search(db, "tomatoes") == [task_id]
+        assert await search(db, "soil") == [task_id]
+        assert await search(db, "we") and len(await search(db, "we")) == 2
+        await check_index(db)
+
+    @pytest.mark.asyncio
+    async def test_update_replaces_the_indexed_text(self, db):
+        task_id = await completed_task(db, "https://example.com/a", "Draft", "first version")
+        await db.update_task_fields(task_id, title="Final", content="second version")
+        assert await search(db, "draft") == []
+        assert await search(db, "first") == []
+        assert await search(db, "final second") == [task_id]
+        await db.update_task_status(task_id, TaskStatus.COMPLETED, summary="a short recap")
+        assert await search(db, "recap second") == [task_id]
+        await check_index(db)
+
+    @pytest.mark.asyncio
+    async def test_deleted_task_is_not_found(self, db):
+        task_id = await completed_task(db, "https://example.com/a", "Gone", "soon deleted")
+        kept = await completed_task(db, "https://example.com/b", "Kept", "never deleted")
+        await db.delete_task(task_id)
+        assert await search(db, "deleted") == [kept]
+        assert await search(db, "gone") == []
+        await check_index(db)
+
+    @pytest.mark.asyncio
+    async def test_phrases_prefixes_and_snippets(self, db):
+        task_id = await completed_task(
+            db, "https://example.com/a", "Talk", "the quick brown fox jumps over the lazy dog")
+        assert await search(db, '"brown fox"') == [task_id]
+        assert await search(db, '"fox brown"') == []
+        assert await search(db, "jum*") == [task_id]
+        results, _ = await db.search_tasks("lazy", limit=10, marks=("[", "]"))
+        assert "[lazy]" in results[0]["snippet"]
+
+    @pytest.mark.asyncio
+    async def test_pages_report_whether_more_follow(self, db):
+        ids = [
+            await completed_task(db, f"https://example.com/{i}", f"Episode {i}", "weekly show")
+            for i in range(3)
+        ]
+        first, more = await db.search_tasks("weekly", limit=2)
+        second, last = await db.search_tasks("weekly", limit=2, offset=2)
+        assert more and not last
+        assert sorted(row["id"] for row in first + second) == ids
+
+    @pytest.mark.asyncio
+    async def test_syntax_in_the_query_is_taken_literally(self, db):
+        await completed_task(db, "https://example.com/a", "Talk", "cats AND dogs")
+        for query in ['AND', 'cats OR', '"unclosed', 'NEAR(', '*', '-dogs']:
+            await db.search_tasks(query, limit=10)
+        assert match_expression('say "hi there" pre* "a""b"') == '"say" "hi there" "pre"* "a" "b"'
@@ -1,11 +1,51 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from api.routes import models,summary,transcription
+from api.routes import batches,metrics,models,probes,summary,transcription
+from config import WARMUP_MODEL
+from ai_providers.client_pool import get_client_pool
+from ai_providers.health import get_health_registry
+from database.dependencies import get_db
+from services.audio_cache import get_audio_cache
+from services.model_pool import get_model_pool
+from services.scheduler import get_scheduler
+from services.transcription import recover_tasks, runs_jobs_inline
+from services.warmup import get_warmup
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Open and migrate the database before serving
+    get_db()
+    # With separate workers, they sweep the caches and claim the unfinished tasks
+    sweeper = None
+    if runs_jobs_inline():
+        await get_audio_cache().sweep()
+        await recover_tasks()
+        # Otherwise idle models are only evicted when the next job checks one out
+        sweeper = asyncio.create_task(get_model_pool().sweep_periodically())
+    # Provider probes build SDK clients, so they start once the warm-up has imported the SDKs
+    get_warmup().start(
+        load_model=WARMUP_MODEL and runs_jobs_inline(),
+        on_sdks_loaded=get_health_registry().start
+    )
+    yield
+    if sweeper is not None:
+        sweeper.cancel()
+        await asyncio.gather(sweeper, return_exceptions=True)
+    await get_warmup().stop()
+    await get_health_registry().stop()
+    await get_scheduler().shutdown()
+    await get_client_pool().aclose()
+
+
+app = FastAPI(lifespan=lifespan)
+app.include_router(probes.router)
 app.include_router(models.router)
 app.include_router(summary.router)
 app.include_router(transcription.router)
+app.include_router(batches.router)
+app.include_router(metrics.router)
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=7000)
@@ -1,4 +1,7 @@
-# ai_providers/factory.py
+# prompt.py
+# Bump whenever the prompts change so cached summaries are not reused
+PROMPT_VERSION = "1"
+
 DEFAULT_PROMPT = """ 
 Please summarize and restructure the following video transcription. This is a speech-to-text content that may contain verbal fillers, repetitions, and colloquial expressions.
 
@@ -69,3 +72,20 @@ MAIN TAKEAWAYS:
 Transcription:
 [Paste content here]
 """
+
+MAP_PROMPT = """
+The following is one part of a longer video transcription (speech-to-text, may contain fillers and errors).
+Summarize this part on its own: keep key points, data, names and conclusions, drop fillers and repetitions.
+Do not add an introduction or refer to "this part".
+
+Transcription part:
+{text}
+"""
+
+REDUCE_PROMPT = """
+The following are summaries of consecutive parts of one video transcription, in order.
+Merge them into a single coherent summary of the whole video, removing repetition between parts and keeping the original order of topics.
+
+Part summaries:
+{text}
+"""
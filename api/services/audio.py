@@ -0,0 +1,179 @@
+# services/audio.py
+"""Audio ingestion: source stream -> one ffmpeg decode -> raw 16 kHz mono PCM on disk.
+
+yt-dlp resolves the video once in-process, then a ``yt-dlp -o -`` child
+writes the best audio stream to a pipe that ffmpeg decodes straight to PCM.
+There is no intermediate compressed file and no second decode: the
+transcriber memory-maps the PCM file.
+"""
+import os
+import sys
+import json
+import uuid
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+from config import AUDIO_PCM_FORMAT, DOWNLOAD_DIR, FFMPEG_BINARY, YTDL_OPTIONS
+from services.cancellation import CancelToken
+from utils.metrics import STAGE_SECONDS
+
+SAMPLE_RATE = 16000  # what Whisper expects
+PCM_DTYPES = {"f32le": np.float32, "s16le": np.int16}
+# How often a running download looks at its cancel token
+CANCEL_POLL_SECONDS = 0.5
+
+
+def is_pcm(path: str) -> bool:
+    return Path(path).suffix.lstrip(".") in PCM_DTYPES
+
+
+def _ffmpeg_decode_args(source: str, output, pcm_format: str) -> List[str]:
+    return [
+        FFMPEG_BINARY, "-nostdin", "-loglevel", "error", "-y",
+        "-i", source,
+        "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "-f", pcm_format, str(output),
+    ]
+
+
+def _output_path(name: str, pcm_format: str) -> Path:
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)[:80]
+    return DOWNLOAD_DIR / f"{safe}-{uuid.uuid4().hex[:8]}.{pcm_format}"
+
+
+def _partial_path(output: Path) -> Path:
+    # Unique per writer: another process may be fetching the same video into the same output
+    return output.with_name(f"{output.name}.{os.getpid()}-{uuid.uuid4().hex[:8]}.part")
+
+
+def _finish(partial: Path, output: Path):
+    # Only complete files ever carry the final name
+    os.replace(partial, output)
+
+
+def decode_file(source: str, pcm_format: str = AUDIO_PCM_FORMAT, output: Optional[Path] = None) -> str:
+    """Decode a local media file to PCM; returns the PCM path"""
+    output = output or _output_path(Path(source).stem, pcm_format)
+    partial = _partial_path(output)
+    result = subprocess.run(
+        _ffmpeg_decode_args(source, partial, pcm_format), capture_output=True, check=False)
+    if result.returncode != 0:
+        partial.unlink(missing_ok=True)
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.decode(errors='replace').strip()}")
+    _finish(partial, output)
+    return str(output)
+
+
+def read_audio(source: str) -> np.ndarray:
+    """Decode a media file into memory as float32 samples, without a file in between"""
+    result = subprocess.run(
+        _ffmpeg_decode_args(source, "pipe:1", "f32le"), capture_output=True, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.decode(errors='replace').strip()}")
+    return np.frombuffer(result.stdout, dtype="<f4")
+
+
+def _wait(processes: List[subprocess.Popen], cancel: Optional[CancelToken]):
+    """Wait for the pipeline to exit, killing every process once ``cancel`` is set"""
+    for process in processes:
+        while True:
+            try:
+                process.wait(timeout=CANCEL_POLL_SECONDS)
+                break
+            except subprocess.TimeoutExpired:
+                if cancel is not None and cancel.cancelled:
+                    for running in processes:
+                        running.kill()
+                        running.wait()
+                    cancel.raise_if_cancelled()
+
+
+def fetch_audio(
+    url: str,
+    pcm_format: str = AUDIO_PCM_FORMAT,
+    cancel: Optional[CancelToken] = None,
+    output: Optional[Path] = None
+) -> Tuple[str, str]:
+    """Resolve ``url`` and decode its best audio stream to PCM; returns (title, path).
+
+    The file is written to ``output`` when given, else to a new name in
+    ``DOWNLOAD_DIR``; either way it only appears once complete.
+
+    Setting ``cancel`` kills the yt-dlp and ffmpeg children and raises
+    ``TaskCancelled``; metadata extraction runs in-process and is only
+    checked once it returns.
+    """
+    import yt_dlp  # imported on first use to keep API start-up fast
+    with STAGE_SECONDS.time(stage="resolve"), yt_dlp.YoutubeDL(YTDL_OPTIONS) as ydl:
+        info = ydl.extract_info(url, download=False)
+        if info is None:
+            raise Exception("Failed to download video")
+        info = ydl.sanitize_info(info)
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+
+    output = output or _output_path(str(info.get("id") or "audio"), pcm_format)
+    partial = _partial_path(output)
+    # Hand the resolved info to the downloader so the page is not fetched twice
+    with tempfile.NamedTemporaryFile("w", suffix=".info.json", dir=DOWNLOAD_DIR, delete=False) as f:
+        json.dump(info, f)
+        info_path = f.name
+    try:
+        with STAGE_SECONDS.time(stage="download"), \
+                tempfile.TemporaryFile() as download_errors, tempfile.TemporaryFile() as decode_errors:
+            downloader = subprocess.Popen(
+                [
+                    sys.executable, "-m", "yt_dlp", "--quiet", "--no-warnings", "--no-part",
+                    "--load-info-json", info_path, "-f", YTDL_OPTIONS["format"], "-o", "-",
+                ],
+                stdout=subprocess.PIPE,
+                stderr=download_errors,
+            )
+            try:
+                decoder = subprocess.Popen(
+                    _ffmpeg_decode_args("pipe:0", partial, pcm_format),
+                    stdin=downloader.stdout,
+                    stderr=decode_errors,
+                )
+            except OSError:
+                downloader.kill()
+                downloader.wait()
+                raise
+            downloader.stdout.close()  # ffmpeg owns the read end now
+            _wait([decoder, downloader], cancel)
+            download_errors.seek(0)
+            decode_errors.seek(0)
+            # When one side fails the other usually does too; report both
+            failures = []
+            if downloader.returncode != 0:
+                failures.append(f"yt-dlp: {download_errors.read().decode(errors='replace').strip()}")
+            if decoder.returncode != 0:
+                failures.append(f"ffmpeg: {decode_errors.read().decode(errors='replace').strip()}")
+            if failures:
+                raise RuntimeError(f"Audio ingestion failed: {'; '.join(failures)}")
+        _finish(partial, output)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    finally:
+        os.remove(info_path)
+    return info["title"], str(output)
+
+
+def load_pcm(path: str) -> np.ndarray:
+    """Memory-map a PCM file as float32 samples.
+
+    float32 files are mapped copy-on-write, so pages are read from disk only
+    when a window is decoded. int16 files have to be converted, which
+    materializes the whole signal.
+    """
+    dtype = PCM_DTYPES[Path(path).suffix.lstrip(".")]
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.float32)
+    samples = np.memmap(path, dtype=np.dtype(dtype).newbyteorder("<"), mode="c")
+    if dtype == np.int16:
+        return samples.astype(np.float32) / 32768.0
+    return samples
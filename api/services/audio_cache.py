@@ -0,0 +1,226 @@
+# services/audio_cache.py
+import asyncio
+import fcntl
+import hashlib
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from config import AUDIO_CACHE_MAX_BYTES, AUDIO_PCM_FORMAT, DOWNLOAD_DIR
+from database.dependencies import get_db
+from services.cancellation import CancelToken
+from services.dedup import hash_file
+from services.video import VideoProcessor
+from utils.logger import logger
+from utils.metrics import AUDIO_CACHE_BYTES, AUDIO_CACHE_EVICTIONS, AUDIO_CACHE_LOOKUPS
+
+CacheKey = Tuple[str, str]
+# Unindexed files younger than this may still be written by a running download
+ORPHAN_GRACE_SECONDS = 600
+# Downloads lock one of this many files, picked by video, so the lock files never pile up
+DOWNLOAD_LOCK_STRIPES = 256
+DOWNLOAD_LOCK_POLL_SECONDS = 0.2
+
+
+@dataclass
+class CachedAudio:
+    video_key: str
+    title: Optional[str]
+    path: str
+    audio_hash: str
+
+
+def cache_file_name(video_key: str, pcm_format: str) -> str:
+    """Stable file name for a video's audio: readable prefix plus a hash of the full key"""
+    readable = re.sub(r"[^A-Za-z0-9_-]+", "_", video_key)[:60]
+    digest = hashlib.sha256(video_key.encode("utf-8")).hexdigest()[:12]
+    return f"{readable}-{digest}.{pcm_format}"
+
+
+class AudioCache:
+    """Decoded audio kept in the download directory, one file per video.
+
+    The ``audio_cache`` table is the index: file name, title, content hash,
+    size and last use. Files are written under a temporary name and renamed
+    when complete, so a file listed in the index is always whole. Processes
+    sharing the directory download a video one at a time, under a file
+    lock, and the ones that waited use the finished file. Files are evicted
+    least recently used first once the total passes ``max_bytes``, except
+    while an unfinished task of their video, run by any process, may read
+    them, or this process holds a reference from ``checkout``/``download``.
+    Anything else in the directory (partial downloads, files a crashed
+    process never indexed) is removed by ``sweep`` at startup once it is
+    older than ``ORPHAN_GRACE_SECONDS``.
+    """
+
+    def __init__(
+        self,
+        directory: Path = DOWNLOAD_DIR,
+        max_bytes: int = AUDIO_CACHE_MAX_BYTES,
+        pcm_format: str = AUDIO_PCM_FORMAT,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.pcm_format = pcm_format
+        self._refs: Dict[CacheKey, int] = {}
+        self._lock = asyncio.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "downloads": 0,
+            "evictions": 0,
+            "evicted_bytes": 0,
+            "orphans_removed": 0,
+        }
+
+    def _key(self, video_key: str) -> CacheKey:
+        return video_key, self.pcm_format
+
+    def _retain(self, key: CacheKey):
+        self._refs[key] = self._refs.get(key, 0) + 1
+
+    async def _lookup(self, key: CacheKey) -> Optional[CachedAudio]:
+        db = get_db()
+        row = await db.get_cached_audio(*key)
+        if row is None:
+            return None
+        path = self.directory / row["file_name"]
+        if not path.exists():
+            await db.uncache_audio(*key)
+            return None
+        self._retain(key)
+        return CachedAudio(key[0], row["title"], str(path), row["audio_hash"])
+
+    async def checkout(self, video_key: str) -> Optional[CachedAudio]:
+        """Reference the cached audio of a video; None on a miss. Pair with ``release``"""
+        audio = await self._lookup(self._key(video_key))
+        if audio is not None:
+            self._stats["hits"] += 1
+            AUDIO_CACHE_LOOKUPS.inc(result="hit")
+        else:
+            self._stats["misses"] += 1
+            AUDIO_CACHE_LOOKUPS.inc(result="miss")
+        return audio
+
+    @asynccontextmanager
+    async def _download_lock(self, file_name: str, cancel: Optional[CancelToken] = None):
+        """Exclusive, across processes, to downloads of this file (and the few sharing its stripe)"""
+        locks = self.directory / ".locks"
+        locks.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256(file_name.encode("utf-8")).digest()
+        stripe = int.from_bytes(digest[:4], "big") % DOWNLOAD_LOCK_STRIPES
+        # Append mode creates the file without truncating it under another holder
+        with open(locks / f"{stripe:02x}.lock", "ab") as handle:
+            while True:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if cancel is not None:
+                        cancel.raise_if_cancelled()
+                    await asyncio.sleep(DOWNLOAD_LOCK_POLL_SECONDS)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    async def download(
+        self,
+        video_key: str,
+        url: str,
+        cancel: Optional[CancelToken] = None
+    ) -> CachedAudio:
+        """Fetch a video's audio into the cache and reference it. Pair with ``release``"""
+        key = self._key(video_key)
+        file_name = cache_file_name(*key)
+        async with self._download_lock(file_name, cancel):
+            # Another process may have fetched it while this one waited for the lock
+            audio = await self._lookup(key)
+            if audio is not None:
+                logger.info("Audio of %s was downloaded by another process", video_key)
+                return audio
+            title, path = await VideoProcessor.download_video(url, cancel, self.directory / file_name)
+            audio_hash = await asyncio.to_thread(hash_file, path)
+            await get_db().cache_audio(*key, file_name, title, audio_hash, os.path.getsize(path))
+            self._retain(key)
+        self._stats["downloads"] += 1
+        await self.enforce_quota()
+        return CachedAudio(video_key, title, path, audio_hash)
+
+    async def release(self, video_key: str):
+        key = self._key(video_key)
+        refs = self._refs.get(key, 0) - 1
+        if refs > 0:
+            self._refs[key] = refs
+        else:
+            self._refs.pop(key, None)
+        await self.enforce_quota()
+
+    async def enforce_quota(self):
+        """Evict files no task is using, least recently used first, until within ``max_bytes``"""
+        db = get_db()
+        async with self._lock:
+            entries = await db.list_cached_audio()
+            total = sum(entry["size_bytes"] for entry in entries)
+            for entry in entries:
+                if total <= self.max_bytes:
+                    break
+                key = (entry["video_key"], entry["pcm_format"])
+                # The database check covers tasks of other processes, and closes the race with their lookups
+                if key in self._refs or not await db.evict_cached_audio(*key):
+                    continue
+                (self.directory / entry["file_name"]).unlink(missing_ok=True)
+                total -= entry["size_bytes"]
+                self._stats["evictions"] += 1
+                self._stats["evicted_bytes"] += entry["size_bytes"]
+                AUDIO_CACHE_EVICTIONS.inc()
+                logger.info("Evicted cached audio of %s (%d bytes)", entry["video_key"], entry["size_bytes"])
+            AUDIO_CACHE_BYTES.set(total)
+
+    async def sweep(self):
+        """Reconcile the directory with the index: drop entries whose file is gone, delete unindexed files"""
+        db = get_db()
+        async with self._lock:
+            indexed = set()
+            for entry in await db.list_cached_audio():
+                if (self.directory / entry["file_name"]).exists():
+                    indexed.add(entry["file_name"])
+                else:
+                    await db.uncache_audio(entry["video_key"], entry["pcm_format"])
+            cutoff = time.time() - ORPHAN_GRACE_SECONDS
+            for path in self.directory.iterdir():
+                if path.is_file() and path.name not in indexed and path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+                    self._stats["orphans_removed"] += 1
+        if self._stats["orphans_removed"]:
+            logger.info("Removed %d orphaned files from %s", self._stats["orphans_removed"], self.directory)
+        await self.enforce_quota()
+
+    async def stats(self) -> Dict[str, Any]:
+        entries = await get_db().list_cached_audio()
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+            "files": len(entries),
+            "bytes": sum(entry["size_bytes"] for entry in entries),
+            "max_bytes": self.max_bytes,
+            "in_use": sum(
+                1 for entry in entries
+                if entry["in_use"] or (entry["video_key"], entry["pcm_format"]) in self._refs
+            ),
+        }
+
+
+_cache: Optional[AudioCache] = None
+
+
+def get_audio_cache() -> AudioCache:
+    global _cache  # pylint: disable=global-statement
+    if _cache is None:
+        _cache = AudioCache()
+    return _cache
@@ -0,0 +1,127 @@
+# services/batch.py
+import asyncio
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import BATCH_MAX_ITEMS
+from api.schemas import (
+    BatchProgress, BatchRequest, BatchResponse, BatchSubmission, SkippedVideo, TaskStatus
+)
+from database.dependencies import get_db
+from services.dedup import resolve_video_key
+from services.transcription import enqueue_transcription
+from utils.logger import logger
+
+FINISHED_STATUSES = {
+    TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.SUMMARY_FAILED, TaskStatus.CANCELLED
+}
+# Channel pages list their tabs (videos, shorts, ...) as nested playlists
+_MAX_DEPTH = 3
+_RESOLVE_CONCURRENCY = 8
+
+
+def _is_playlist(entry: Dict[str, Any]) -> bool:
+    ie_key = entry.get("ie_key") or ""
+    return "entries" in entry or any(kind in ie_key for kind in ("Tab", "Playlist", "Channel"))
+
+
+def _flat_videos(ydl: Any, info: Dict[str, Any], depth: int = 0) -> Iterator[Tuple[str, str]]:
+    import yt_dlp
+    for entry in info.get("entries") or []:
+        if not entry:
+            continue
+        if _is_playlist(entry):
+            if depth >= _MAX_DEPTH:
+                continue
+            if "entries" not in entry:
+                try:
+                    entry = ydl.extract_info(entry["url"], download=False)
+                except yt_dlp.utils.DownloadError as e:
+                    logger.warning(f"Skipping unreadable playlist {entry.get('url')}: {e}")
+                    continue
+            yield from _flat_videos(ydl, entry or {}, depth + 1)
+            continue
+        url = entry.get("webpage_url") or entry.get("url")
+        if url and entry.get("id") and entry.get("ie_key"):
+            yield url, f"{entry['ie_key'].lower()}:{entry['id']}"
+
+
+def expand_playlist(url: str, limit: int) -> Tuple[Optional[str], List[Tuple[str, str]]]:
+    """List a playlist's or channel's videos as (url, video_key), without downloading"""
+    options = {
+        "quiet": True,
+        "no_warnings": True,
+        "skip_download": True,
+        "extract_flat": "in_playlist",
+        "playlistend": limit,
+    }
+    import yt_dlp
+    with yt_dlp.YoutubeDL(options) as ydl:
+        try:
+            info = ydl.extract_info(url, download=False)
+        except yt_dlp.utils.DownloadError as e:
+            raise ValueError(f"Could not read playlist {url}: {e}") from e
+        if info is None:
+            raise ValueError(f"Could not read playlist {url}")
+        videos = []
+        for video in _flat_videos(ydl, info):
+            videos.append(video)
+            if len(videos) >= limit:
+                break
+    return info.get("title"), videos
+
+
+async def _resolve_urls(urls: List[str]) -> List[Tuple[str, str]]:
+    semaphore = asyncio.Semaphore(_RESOLVE_CONCURRENCY)
+
+    async def _resolve(url: str) -> Tuple[str, str]:
+        async with semaphore:
+            return url, await resolve_video_key(url)
+
+    return list(await asyncio.gather(*(_resolve(url) for url in urls)))
+
+
+def batch_progress(counts: Dict[str, int]) -> BatchProgress:
+    total = sum(counts.values())
+    finished = sum(counts.get(status.value, 0) for status in FINISHED_STATUSES)
+    failed = counts.get(TaskStatus.FAILED.value, 0)
+    return BatchProgress(total=total, counts=counts, finished=finished, failed=failed, done=finished == total)
+
+
+async def get_batch(batch_id: int) -> Optional[BatchResponse]:
+    batch = await get_db().get_batch(batch_id)
+    if batch is None:
+        return None
+    return BatchResponse(
+        id=batch["id"],
+        source=batch["source"],
+        created_at=batch["created_at"],
+        progress=batch_progress(batch["counts"]),
+    )
+
+
+async def submit_batch(request: BatchRequest) -> BatchSubmission:
+    """Expand the request into videos, create their tasks in one transaction and queue them"""
+    limit = min(request.max_items or BATCH_MAX_ITEMS, BATCH_MAX_ITEMS)
+    videos = await _resolve_urls([str(url) for url in request.urls][:limit])
+    source = None
+    if request.playlist_url:
+        source = str(request.playlist_url)
+        _, expanded = await asyncio.to_thread(expand_playlist, source, limit)
+        videos.extend(expanded)
+    videos = videos[:limit]
+
+    db = get_db()
+    batch_id, created, skipped = await db.create_batch(source, videos, request.priority)
+    for task_id, url, video_key in created:
+        enqueue_transcription(task_id, url, request.priority, video_key=video_key)
+    logger.info(f"Batch {batch_id}: {len(created)} tasks queued, {len(skipped)} skipped")
+
+    batch = await get_batch(batch_id)
+    return BatchSubmission(
+        **batch.model_dump(),
+        task_ids=[task_id for task_id, _, _ in created],
+        skipped=[
+            SkippedVideo(url=url, video_key=video_key, task_id=task_id)
+            for url, video_key, task_id in skipped
+        ],
+    )
@@ -0,0 +1,29 @@
+# services/cancellation.py
+"""Cooperative cancellation for work running outside the event loop.
+
+Cancelling a job's asyncio task only stops its coroutine; a thread blocked in
+``asyncio.to_thread`` keeps going. Each job therefore gets a ``CancelToken``
+that its threads check between units of work (a Whisper window, a poll of the
+yt-dlp and ffmpeg children) so they stop soon after the job does.
+"""
+import threading
+
+
+class TaskCancelled(Exception):
+    """Raised in a worker thread once its task has been cancelled"""
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TaskCancelled()
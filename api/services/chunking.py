@@ -0,0 +1,262 @@
+# services/chunking.py
+import os
+import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from config import (
+    WHISPER_MODEL, TRANSCRIBE_CHUNK_SECONDS, TRANSCRIBE_CHUNK_OVERLAP, TRANSCRIBE_WORKERS,
+    TRANSCRIBE_STREAM_SECONDS
+)
+from services.audio import SAMPLE_RATE
+from services.cancellation import CancelToken
+from services.model_pool import get_model_pool, resolve_device
+from transcribers.factory import TranscriberFactory
+from utils.logger import logger
+
+FRAME_SECONDS = 0.03
+# How far around the nominal chunk end we look for a quiet cut point
+SEARCH_SECONDS = 15.0
+# Characters of preceding transcript fed to Whisper as context for the next window
+PROMPT_CHARS = 200
+
+Chunk = Tuple[float, float, float, float]  # (start, end, keep_from, keep_to) in seconds
+# Called with the segments a window added and the audio offset (seconds) transcribed so far
+SegmentCallback = Callable[[List[Dict[str, Any]], float], None]
+
+
+def find_quiet_point(audio: np.ndarray, lo: int, hi: int, sample_rate: int = SAMPLE_RATE) -> int:
+    """Sample index of the lowest-energy frame within audio[lo:hi]"""
+    frame = max(1, int(FRAME_SECONDS * sample_rate))
+    window = audio[lo:hi]
+    frames = len(window) // frame
+    if frames < 2:
+        return (lo + hi) // 2
+    energy = np.square(window[:frames * frame].reshape(frames, frame)).mean(axis=1)
+    return lo + int(np.argmin(energy)) * frame + frame // 2
+
+
+def plan_chunks(
+    audio: np.ndarray,
+    chunk_seconds: float = TRANSCRIBE_CHUNK_SECONDS,
+    overlap_seconds: float = TRANSCRIBE_CHUNK_OVERLAP,
+    sample_rate: int = SAMPLE_RATE,
+) -> List[Chunk]:
+    """Split audio at quiet points into overlapping chunks.
+
+    Each chunk owns the span between two cut points (``keep_from`` to
+    ``keep_to``) and is padded by ``overlap_seconds`` on both sides so words
+    near a cut are decoded with context by both neighbours.
+    """
+    total = len(audio)
+    target = int(chunk_seconds * sample_rate)
+    search = int(min(SEARCH_SECONDS, chunk_seconds / 4) * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+
+    cuts = [0]
+    while total - cuts[-1] > target + search:
+        nominal = cuts[-1] + target
+        cuts.append(find_quiet_point(audio, nominal - search, nominal + search, sample_rate))
+    cuts.append(total)
+
+    chunks = []
+    for keep_from, keep_to in zip(cuts, cuts[1:]):
+        start = max(0, keep_from - overlap)
+        end = min(total, keep_to + overlap)
+        chunks.append((
+            start / sample_rate, end / sample_rate,
+            keep_from / sample_rate, keep_to / sample_rate,
+        ))
+    return chunks
+
+
+def _words(text: str) -> List[str]:
+    return [re.sub(r"[^\w']", "", word).lower() for word in text.split()]
+
+
+def _trim_repeated_prefix(previous: str, text: str, max_words: int = 20) -> str:
+    """Drop the leading words of ``text`` that repeat the tail of ``previous``"""
+    prev_words = _words(previous)[-max_words:]
+    raw_words = text.split()
+    next_words = _words(text)[:max_words]
+    for size in range(min(len(prev_words), len(next_words)), 0, -1):
+        if prev_words[-size:] == next_words[:size]:
+            return " " + " ".join(raw_words[size:]) if raw_words[size:] else ""
+    return text
+
+
+class ChunkStitcher:
+    """Merge per-chunk Whisper results into one transcript, chunk by chunk.
+
+    Segment times are shifted to the full timeline and each segment is kept
+    only by the chunk that owns its midpoint. Words repeated across a cut are
+    removed from the later segment. ``segments`` seeds the stitcher with a
+    transcript decoded earlier, when resuming from a checkpoint.
+    """
+
+    def __init__(self, segments: Optional[List[Dict[str, Any]]] = None):
+        self.segments: List[Dict[str, Any]] = list(segments or [])
+        self.language: Optional[str] = None
+
+    def add(self, chunk: Chunk, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Fold in the next chunk's result and return the segments it added"""
+        start, _, keep_from, keep_to = chunk
+        self.language = self.language or result.get("language")
+        added = []
+        for segment in result.get("segments", []):
+            seg_start = segment["start"] + start
+            seg_end = segment["end"] + start
+            midpoint = (seg_start + seg_end) / 2
+            if not keep_from <= midpoint < keep_to:
+                continue
+            text = segment["text"]
+            if self.segments:
+                if seg_end <= self.segments[-1]["end"]:
+                    continue
+                text = _trim_repeated_prefix(self.segments[-1]["text"], text)
+                if not text.strip():
+                    continue
+                seg_start = max(seg_start, self.segments[-1]["end"])
+            merged = {
+                "id": len(self.segments),
+                "start": round(seg_start, 3),
+                "end": round(seg_end, 3),
+                "text": text,
+            }
+            self.segments.append(merged)
+            added.append(merged)
+        return added
+
+    @property
+    def text(self) -> str:
+        return "".join(segment["text"] for segment in self.segments)
+
+    def result(self) -> Dict[str, Any]:
+        return {"text": self.text, "segments": self.segments, "language": self.language}
+
+
+def stitch_chunks(chunks: List[Chunk], results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    stitcher = ChunkStitcher()
+    for chunk, result in zip(chunks, results):
+        stitcher.add(chunk, result)
+    return stitcher.result()
+
+
+def _init_worker(threads: int):
+    TranscriberFactory.get_engine().configure_threads(threads)
+
+
+def _transcribe_chunk(model_name: str, device: str, audio: np.ndarray) -> Dict[str, Any]:
+    # Runs in a pool process; the pool there keeps the model loaded between chunks
+    with get_model_pool().acquire(model_name, device) as model:
+        return model.transcribe(audio)
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor(workers: int = TRANSCRIBE_WORKERS) -> ProcessPoolExecutor:
+    global _executor  # pylint: disable=global-statement
+    if _executor is None:
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        _executor = ProcessPoolExecutor(
+            max_workers=workers,
+            # Forking a process that has touched torch/CUDA is unsafe
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(threads,),
+        )
+    return _executor
+
+
+def remaining_chunks(chunks: List[Chunk], resume_from: float) -> List[Chunk]:
+    """Chunks still to transcribe when everything before ``resume_from`` is done.
+
+    Cut points depend only on the audio, so re-planning the same file yields
+    the same chunks and a checkpoint at a chunk's ``keep_to`` lines up exactly.
+    """
+    return [chunk for chunk in chunks if chunk[3] > resume_from]
+
+
+def transcribe_sequential(
+    audio: np.ndarray,
+    model_name: str = WHISPER_MODEL,
+    device: Optional[str] = None,
+    window_seconds: float = TRANSCRIBE_STREAM_SECONDS,
+    overlap_seconds: float = TRANSCRIBE_CHUNK_OVERLAP,
+    on_segments: Optional[SegmentCallback] = None,
+    resume_from: float = 0.0,
+    previous: Optional[List[Dict[str, Any]]] = None,
+    cancel: Optional[CancelToken] = None,
+) -> Dict[str, Any]:
+    """Transcribe audio window by window in this thread, reporting segments as they land.
+
+    The tail of the transcript so far is passed as the next window's prompt so
+    decoding keeps its context across window boundaries. Windows that end at
+    or before ``resume_from`` were transcribed into ``previous`` by an earlier
+    run and are skipped. ``cancel`` is checked before every window.
+    """
+    if window_seconds <= 0:
+        raise ValueError("window_seconds must be positive")
+    stitcher = ChunkStitcher(previous)
+    chunks = remaining_chunks(plan_chunks(audio, window_seconds, overlap_seconds), resume_from)
+    if not chunks:
+        return stitcher.result()
+    with get_model_pool().acquire(model_name, device) as model:
+        for chunk in chunks:
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            start, end = chunk[0], chunk[1]
+            result = model.transcribe(
+                audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)],
+                initial_prompt=stitcher.text[-PROMPT_CHARS:] or None,
+            )
+            added = stitcher.add(chunk, result)
+            if on_segments:
+                on_segments(added, chunk[3])
+    return stitcher.result()
+
+
+def transcribe_chunked(
+    audio: np.ndarray,
+    model_name: str = WHISPER_MODEL,
+    device: Optional[str] = None,
+    chunk_seconds: float = TRANSCRIBE_CHUNK_SECONDS,
+    overlap_seconds: float = TRANSCRIBE_CHUNK_OVERLAP,
+    executor: Optional[ProcessPoolExecutor] = None,
+    on_segments: Optional[SegmentCallback] = None,
+    resume_from: float = 0.0,
+    previous: Optional[List[Dict[str, Any]]] = None,
+    cancel: Optional[CancelToken] = None,
+) -> Dict[str, Any]:
+    """Transcribe 16 kHz mono audio chunk by chunk across a process pool.
+
+    Resumption and cancellation work as in ``transcribe_sequential``; on
+    cancel, queued chunks are dropped and chunks already running in the pool
+    are left to finish.
+    """
+    chunks = remaining_chunks(plan_chunks(audio, chunk_seconds, overlap_seconds), resume_from)
+    device = resolve_device(device)
+    executor = executor or get_executor()
+    logger.info("Transcribing %d chunks of ~%ss in parallel", len(chunks), chunk_seconds)
+    futures = [
+        executor.submit(
+            _transcribe_chunk, model_name, device,
+            audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)]
+        )
+        for start, end, _, _ in chunks
+    ]
+    stitcher = ChunkStitcher(previous)
+    try:
+        for chunk, future in zip(chunks, futures):
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            added = stitcher.add(chunk, future.result())
+            if on_segments:
+                on_segments(added, chunk[3])
+    finally:
+        for future in futures:
+            future.cancel()
+    return stitcher.result()
@@ -0,0 +1,129 @@
+# services/dedup.py
+import re
+import json
+import asyncio
+import hashlib
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+
+from config import (
+    WHISPER_MODEL, TRANSCRIBE_COMPUTE_TYPE, TRANSCRIBE_MODE, TRANSCRIBE_CHUNK_SECONDS, TRANSCRIBE_CHUNK_OVERLAP,
+    TRANSCRIBE_STREAM_SECONDS
+)
+from transcribers.factory import TranscriberFactory
+from utils.logger import logger
+
+_YOUTUBE_ID = r"([A-Za-z0-9_-]{11})"
+_URL_PATTERNS = [
+    ("youtube", re.compile(r"(?:^|\.)youtu\.be$"), re.compile(rf"^/{_YOUTUBE_ID}")),
+    ("youtube", re.compile(r"(?:^|\.)youtube(?:-nocookie)?\.com$"),
+     re.compile(rf"^/(?:shorts|embed|live|v)/{_YOUTUBE_ID}")),
+    ("bilibili", re.compile(r"(?:^|\.)bilibili\.com$"), re.compile(r"^/video/(BV[0-9A-Za-z]{10})")),
+    ("vimeo", re.compile(r"(?:^|\.)vimeo\.com$"), re.compile(r"^/(\d+)")),
+]
+_TRACKING_PARAMS = re.compile(r"^(utm_.*|si|feature|fbclid|gclid|spm_id_from|vd_source|pp|t)$")
+
+
+def normalize_url(url: str) -> Optional[str]:
+    """Canonical ``extractor:video_id`` key for well-known URL forms, without network access"""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if re.search(r"(?:^|\.)youtube(?:-nocookie)?\.com$", host) and parts.path == "/watch":
+        video_id = parse_qs(parts.query).get("v", [""])[0]
+        if re.fullmatch(_YOUTUBE_ID, video_id):
+            return f"youtube:{video_id}"
+    for extractor, host_pattern, path_pattern in _URL_PATTERNS:
+        if host_pattern.search(host):
+            match = path_pattern.match(parts.path)
+            if match:
+                return f"{extractor}:{match.group(1)}"
+    return None
+
+
+def strip_tracking(url: str) -> str:
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value)
+        for key, values in sorted(parse_qs(parts.query).items())
+        if not _TRACKING_PARAMS.match(key)
+        for value in values
+    ]
+    return urlunsplit((
+        parts.scheme.lower(), (parts.hostname or "").lower(), parts.path.rstrip("/"),
+        urlencode(query), ""
+    ))
+
+
+def _probe_video_key(url: str) -> Optional[str]:
+    import yt_dlp
+    options = {"quiet": True, "no_warnings": True, "skip_download": True}
+    with yt_dlp.YoutubeDL(options) as ydl:
+        info = ydl.extract_info(url, download=False, process=False)
+    if info and info.get("id") and info.get("extractor_key"):
+        return f"{info['extractor_key'].lower()}:{info['id']}"
+    return None
+
+
+async def resolve_video_key(url: str) -> str:
+    """Identify the video behind a URL, asking yt-dlp only for unknown URL forms"""
+    key = normalize_url(url)
+    if key:
+        return key
+    try:
+        key = await asyncio.to_thread(_probe_video_key, url)
+    except Exception as e:
+        logger.warning(f"Could not resolve video id for {url}: {e}")
+    return key or f"url:{strip_tracking(url)}"
+
+
+def hash_file(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def transcription_options() -> str:
+    """The settings that change transcription output, as a stable cache key part"""
+    options = {
+        "engine": TranscriberFactory.get_engine().name,
+        "mode": TRANSCRIBE_MODE,
+        "chunk_seconds": TRANSCRIBE_CHUNK_SECONDS,
+        "overlap_seconds": TRANSCRIBE_CHUNK_OVERLAP,
+        "stream_seconds": TRANSCRIBE_STREAM_SECONDS,
+    }
+    if options["engine"] != "openai-whisper":
+        # Quantized weights give slightly different text
+        options["compute_type"] = TRANSCRIBE_COMPUTE_TYPE or "default"
+    return json.dumps(options, sort_keys=True)
+
+
+def transcription_model() -> str:
+    return WHISPER_MODEL
+
+
+class InflightJobs:
+    """Tracks which video each running job is producing so duplicates can wait for it"""
+
+    def __init__(self):
+        self._jobs: Dict[str, asyncio.Event] = {}
+
+    def join(self, key: str) -> Optional[asyncio.Event]:
+        """Return the running job's event, or register the caller as the job for ``key``"""
+        event = self._jobs.get(key)
+        if event is None:
+            self._jobs[key] = asyncio.Event()
+        return event
+
+    def finish(self, key: str):
+        event = self._jobs.pop(key, None)
+        if event is not None:
+            event.set()
+
+
+_inflight = InflightJobs()
+
+
+def get_inflight_jobs() -> InflightJobs:
+    return _inflight
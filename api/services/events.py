@@ -0,0 +1,53 @@
+# services/events.py
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, Set
+
+
+class TaskEventBus:
+    """In-process fan-out of task events (segments, status changes) to listeners"""
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._change_waiters: Set[asyncio.Future] = set()
+
+    def subscribe(self, task_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers[task_id].add(queue)
+        return queue
+
+    def unsubscribe(self, task_id: int, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(task_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[task_id]
+
+    def publish(self, task_id: int, event: Dict[str, Any]):
+        """Deliver an event; must be called from the event loop thread"""
+        for queue in self._subscribers.get(task_id, ()):
+            queue.put_nowait(event)
+
+    def watch_changes(self) -> asyncio.Future:
+        """A future resolved by the next task change; take it before reading, so none is missed"""
+        waiter = asyncio.get_running_loop().create_future()
+        self._change_waiters.add(waiter)
+        return waiter
+
+    def unwatch_changes(self, waiter: asyncio.Future):
+        self._change_waiters.discard(waiter)
+
+    def publish_change(self):
+        """Wake change-feed long polls; must be called from the event loop thread"""
+        waiters, self._change_waiters = self._change_waiters, set()
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+_bus = TaskEventBus()
+
+
+def get_event_bus() -> TaskEventBus:
+    return _bus
@@ -0,0 +1,74 @@
+# services/exports.py
+"""Subtitle and JSON exports, generated a batch of segments at a time"""
+import json
+from typing import AsyncIterator
+
+from api.schemas import ExportFormat, TranscriptionResponse, TranscriptSegment
+from config import EXPORT_BATCH_SEGMENTS
+
+MEDIA_TYPES = {
+    ExportFormat.SRT: "application/x-subrip",
+    ExportFormat.VTT: "text/vtt",
+    ExportFormat.JSON: "application/json",
+}
+
+
+def format_timestamp(seconds: float, decimal_marker: str) -> str:
+    """HH:MM:SS,mmm for SRT (``decimal_marker=","``), HH:MM:SS.mmm for VTT"""
+    milliseconds = max(0, round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{decimal_marker}{milliseconds:03d}"
+
+
+def _cue_text(segment: TranscriptSegment) -> str:
+    # A blank line would end the cue early in both formats
+    return "\n".join(line for line in segment.text.strip().splitlines() if line.strip())
+
+
+def srt_cue(number: int, segment: TranscriptSegment) -> str:
+    return (
+        f"{number}\n"
+        f"{format_timestamp(segment.start, ',')} --> {format_timestamp(segment.end, ',')}\n"
+        f"{_cue_text(segment)}\n\n"
+    )
+
+
+def vtt_cue(segment: TranscriptSegment) -> str:
+    return (
+        f"{format_timestamp(segment.start, '.')} --> {format_timestamp(segment.end, '.')}\n"
+        f"{_cue_text(segment)}\n\n"
+    )
+
+
+async def iter_segments(db, task_id: int, batch_size: int = EXPORT_BATCH_SEGMENTS) -> AsyncIterator[TranscriptSegment]:
+    offset = 0
+    while True:
+        batch = await db.get_segments(task_id, offset, limit=batch_size)
+        for segment in batch:
+            yield segment
+        if len(batch) < batch_size:
+            return
+        offset = batch[-1].offset + 1
+
+
+async def export_transcript(db, task: TranscriptionResponse, export_format: ExportFormat) -> AsyncIterator[str]:
+    """Yield the export piece by piece; only one batch of segments is held at a time"""
+    if export_format == ExportFormat.VTT:
+        yield "WEBVTT\n\n"
+    elif export_format == ExportFormat.JSON:
+        yield f'{{"id": {task.id}, "title": {json.dumps(task.title, ensure_ascii=False)}, "segments": ['
+
+    number = 0
+    async for segment in iter_segments(db, task.id):
+        number += 1
+        if export_format == ExportFormat.SRT:
+            yield srt_cue(number, segment)
+        elif export_format == ExportFormat.VTT:
+            yield vtt_cue(segment)
+        else:
+            yield ("" if number == 1 else ", ") + json.dumps(segment.model_dump(), ensure_ascii=False)
+
+    if export_format == ExportFormat.JSON:
+        yield "]}"
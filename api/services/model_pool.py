@@ -0,0 +1,235 @@
+# services/model_pool.py
+import asyncio
+import gc
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config import WHISPER_DEVICE, MODEL_POOL_MAX_BYTES, MODEL_POOL_IDLE_TIMEOUT, TRANSCRIBE_CONCURRENCY
+from transcribers.factory import TranscriberFactory
+from utils.logger import logger
+from utils.metrics import MODEL_LOAD_SECONDS
+
+PoolKey = Tuple[str, str]
+# How often a running server or worker drops models idle past the timeout
+SWEEP_SECONDS = 60
+
+
+def resolve_device(device: Optional[str] = None) -> str:
+    """Pick the device a model should live on"""
+    device = device or WHISPER_DEVICE
+    if device:
+        return device
+    return TranscriberFactory.get_engine().default_device()
+
+
+def load_transcriber(name: str, device: str) -> Any:
+    return TranscriberFactory.create_transcriber(name, device)
+
+
+def estimate_model_size(model: Any) -> int:
+    """Approximate resident size of a model in bytes"""
+    try:
+        return model.size_bytes()
+    except Exception:
+        return 0
+
+
+@dataclass
+class _PoolEntry:
+    """One loaded copy of a model; a job has it to itself while it runs"""
+    model: Any
+    size_bytes: int
+    in_use: bool = True
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ModelPool:
+    """Process-wide cache of loaded models keyed by (name, device).
+
+    A model is loaded once and reused by later jobs. A copy serves one job
+    at a time, so jobs running at once on the same model each get their own
+    copy, up to ``max_instances``, as long as the extra copy fits within
+    ``max_bytes``; beyond that they wait for a copy to be returned. Idle
+    copies are evicted in LRU order when the pool exceeds ``max_bytes`` or
+    after ``idle_timeout`` seconds.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str, str], Any] = load_transcriber,
+        max_bytes: int = MODEL_POOL_MAX_BYTES,
+        idle_timeout: float = MODEL_POOL_IDLE_TIMEOUT,
+        size_of: Callable[[Any], int] = estimate_model_size,
+        max_instances: int = TRANSCRIBE_CONCURRENCY,
+    ):
+        self._loader = loader
+        self._size_of = size_of
+        self.max_bytes = max_bytes
+        self.idle_timeout = idle_timeout
+        self.max_instances = max(1, max_instances)
+        self._entries: "OrderedDict[PoolKey, List[_PoolEntry]]" = OrderedDict()
+        self._loading: Dict[PoolKey, int] = {}
+        self._lock = threading.Lock()
+        self._returned = threading.Condition(self._lock)
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "loads": 0,
+            "load_failures": 0,
+            "evictions": 0,
+            "load_seconds": 0.0,
+        }
+
+    @contextmanager
+    def acquire(self, name: str, device: Optional[str] = None) -> Iterator[Any]:
+        """Borrow a loaded model for the caller's exclusive use, loading a copy if none is free"""
+        key = (name, resolve_device(device))
+        entry = self._checkout(key)
+        try:
+            yield entry.model
+        finally:
+            with self._returned:
+                entry.in_use = False
+                entry.last_used = time.monotonic()
+                self._returned.notify_all()
+
+    def _may_load(self, key: PoolKey) -> bool:
+        copies = self._entries.get(key, [])
+        if len(copies) + self._loading.get(key, 0) >= self.max_instances:
+            return False
+        if not copies or self.max_bytes <= 0:
+            # The first copy is always loaded, whatever the memory cap says
+            return not self._loading.get(key)
+        # Make room from idle copies of other models before giving up on another copy
+        self._evict_over_budget(extra=copies[0].size_bytes)
+        return self._total_bytes() + copies[0].size_bytes <= self.max_bytes
+
+    def _checkout(self, key: PoolKey) -> _PoolEntry:
+        with self._returned:
+            self._evict_idle()
+            while True:
+                entry = next((e for e in self._entries.get(key, []) if not e.in_use), None)
+                if entry is not None:
+                    self._stats["hits"] += 1
+                    entry.in_use = True
+                    self._entries.move_to_end(key)
+                    return entry
+                if self._may_load(key):
+                    break
+                # Every copy is busy: wait for one to come back or for a load to finish
+                self._returned.wait()
+            self._stats["misses"] += 1
+            self._loading[key] = self._loading.get(key, 0) + 1
+
+        started = time.perf_counter()
+        try:
+            model = self._loader(*key)
+        except Exception:
+            with self._returned:
+                self._stats["load_failures"] += 1
+                self._finish_loading(key)
+            raise
+        elapsed = time.perf_counter() - started
+        MODEL_LOAD_SECONDS.observe(elapsed, model=key[0], device=key[1])
+        entry = _PoolEntry(model=model, size_bytes=self._size_of(model))
+        logger.info("Loaded model %s on %s in %.2fs", key[0], key[1], elapsed)
+
+        with self._returned:
+            self._stats["loads"] += 1
+            self._stats["load_seconds"] += elapsed
+            self._entries.setdefault(key, []).append(entry)
+            self._entries.move_to_end(key)
+            self._finish_loading(key)
+            self._evict_over_budget()
+        return entry
+
+    def _finish_loading(self, key: PoolKey):
+        self._loading[key] -= 1
+        if not self._loading[key]:
+            del self._loading[key]
+        self._returned.notify_all()
+
+    def _evict(self, key: PoolKey, entry: _PoolEntry, reason: str):
+        copies = self._entries[key]
+        copies.remove(entry)
+        if not copies:
+            del self._entries[key]
+        self._stats["evictions"] += 1
+        logger.info("Evicted model %s on %s (%s)", key[0], key[1], reason)
+
+    def _idle_copies(self) -> List[Tuple[PoolKey, _PoolEntry]]:
+        """Copies nobody is using, least recently used first"""
+        idle = [(key, entry) for key, copies in self._entries.items() for entry in copies if not entry.in_use]
+        return sorted(idle, key=lambda item: item[1].last_used)
+
+    def _evict_idle(self):
+        if self.idle_timeout <= 0:
+            return
+        now = time.monotonic()
+        for key, entry in self._idle_copies():
+            if now - entry.last_used > self.idle_timeout:
+                self._evict(key, entry, "idle")
+
+    def _evict_over_budget(self, extra: int = 0):
+        if self.max_bytes <= 0:
+            return
+        for key, entry in self._idle_copies():
+            if self._total_bytes() + extra <= self.max_bytes:
+                break
+            self._evict(key, entry, "memory cap")
+
+    def _total_bytes(self) -> int:
+        return sum(entry.size_bytes for copies in self._entries.values() for entry in copies)
+
+    def sweep(self):
+        """Drop models that have been idle longer than the timeout"""
+        with self._lock:
+            evictions = self._stats["evictions"]
+            self._evict_idle()
+            evicted = self._stats["evictions"] > evictions
+        if evicted:
+            gc.collect()
+
+    async def sweep_periodically(self, interval: float = SWEEP_SECONDS):
+        """Sweep every ``interval`` seconds until cancelled, so an idle process frees its models"""
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(self.sweep)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "resident_bytes": self._total_bytes(),
+                "max_bytes": self.max_bytes,
+                "max_instances": self.max_instances,
+                "models": [
+                    {
+                        "name": name,
+                        "device": device,
+                        "size_bytes": entry.size_bytes,
+                        "in_use": entry.in_use,
+                        "idle_seconds": round(time.monotonic() - entry.last_used, 1),
+                    }
+                    for (name, device), copies in self._entries.items()
+                    for entry in copies
+                ],
+            }
+
+
+_pool: Optional[ModelPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_model_pool() -> ModelPool:
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        if _pool is None:
+            _pool = ModelPool()
+        return _pool
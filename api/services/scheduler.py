@@ -0,0 +1,158 @@
+# services/scheduler.py
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any, Coroutine, Dict, List, Optional, Tuple
+
+from config import DOWNLOAD_CONCURRENCY, TRANSCRIBE_CONCURRENCY, SUMMARIZE_CONCURRENCY
+from api.schemas import Priority
+from services.cancellation import CancelToken
+from utils.logger import logger
+
+
+class Stage(str, Enum):
+    DOWNLOAD = "download"
+    TRANSCRIBE = "transcribe"
+    SUMMARIZE = "summarize"
+
+
+class StageLimiter:
+    """Concurrency limit for one pipeline stage.
+
+    Waiters are served by priority lane first and in arrival order within a
+    lane, so a burst of submissions cannot overtake work queued earlier.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    async def acquire(self, priority: int):
+        if self.active < self.limit and not self.waiting:
+            self.active += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before cancellation
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                # Hand the slot straight to the next waiter
+                fut.set_result(None)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int):
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class JobScheduler:
+    """Runs pipeline jobs with a bounded worker pool per stage.
+
+    The ``transcriptions`` table is the durable queue: a job's row carries its
+    status and priority, so anything in flight when the process stops is
+    picked up again by ``services.transcription.recover_tasks`` on startup.
+    """
+
+    def __init__(self, limits: Optional[Dict[Stage, int]] = None):
+        limits = limits or {
+            Stage.DOWNLOAD: DOWNLOAD_CONCURRENCY,
+            Stage.TRANSCRIBE: TRANSCRIBE_CONCURRENCY,
+            Stage.SUMMARIZE: SUMMARIZE_CONCURRENCY,
+        }
+        self._limiters = {stage: StageLimiter(limit) for stage, limit in limits.items()}
+        self._jobs: Dict[int, asyncio.Task] = {}
+        self._tokens: Dict[int, CancelToken] = {}
+
+    def submit(self, task_id: int, job: Coroutine[Any, Any, Any]) -> bool:
+        """Start a job for a task unless one is already running"""
+        if task_id in self._jobs:
+            job.close()
+            return False
+        self._tokens[task_id] = CancelToken()
+        task = asyncio.create_task(job)
+        self._jobs[task_id] = task
+        task.add_done_callback(lambda _: self._forget(task_id))
+        return True
+
+    def _forget(self, task_id: int):
+        self._jobs.pop(task_id, None)
+        self._tokens.pop(task_id, None)
+
+    def cancel_token(self, task_id: int) -> CancelToken:
+        """Token the task's worker threads check; a fresh one when no job is running"""
+        return self._tokens.get(task_id) or CancelToken()
+
+    def cancel(self, task_id: int) -> bool:
+        """Stop a task's job and release its worker slot; False if none is running.
+
+        The coroutine is cancelled at once, which frees its stage slot. Worker
+        threads notice the token at their next check.
+        """
+        job = self._jobs.get(task_id)
+        if job is None:
+            return False
+        self._tokens[task_id].cancel()
+        job.cancel()
+        return True
+
+    def stage(self, stage: Stage, priority: Priority = Priority.NORMAL):
+        """Hold a worker slot of the given stage for the duration of the block"""
+        return self._limiters[stage].slot(priority.rank)
+
+    def is_running(self, task_id: int) -> bool:
+        return task_id in self._jobs
+
+    async def shutdown(self):
+        jobs = list(self._jobs.values())
+        for token in self._tokens.values():
+            token.cancel()
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
+        if jobs:
+            logger.info("Stopped %d in-flight jobs; they resume on next start", len(jobs))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "jobs": len(self._jobs),
+            "stages": {
+                stage.value: {
+                    "limit": limiter.limit,
+                    "active": limiter.active,
+                    "waiting": limiter.waiting,
+                }
+                for stage, limiter in self._limiters.items()
+            },
+        }
+
+
+_scheduler: Optional[JobScheduler] = None
+
+
+def get_scheduler() -> JobScheduler:
+    global _scheduler  # pylint: disable=global-statement
+    if _scheduler is None:
+        _scheduler = JobScheduler()
+    return _scheduler
@@ -0,0 +1,71 @@
+# services/summary_cache.py
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from config import SUMMARY_CACHE_TTL, SUMMARY_CACHE_MAX_ENTRIES
+from database.dependencies import get_db
+from prompt import PROMPT_VERSION
+
+
+def summary_cache_key(
+    content: str,
+    provider: str,
+    model: Optional[str],
+    max_length: Optional[int],
+    prompt_version: str = PROMPT_VERSION
+) -> str:
+    """Identify a summary by everything that influences the LLM output"""
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    parts = json.dumps([content_hash, provider, model, prompt_version, max_length])
+    return hashlib.sha256(parts.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """Database-backed summary cache with TTL and LRU size limits, per namespace"""
+
+    def __init__(
+        self,
+        namespace: str = "",
+        ttl: float = SUMMARY_CACHE_TTL,
+        max_entries: int = SUMMARY_CACHE_MAX_ENTRIES
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        summary = await get_db().get_cached_summary(key, self.ttl)
+        if summary is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return summary
+
+    async def put(self, key: str, summary: str):
+        await get_db().cache_summary(key, summary, self.max_entries, self.ttl, self.namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "ttl_seconds": self.ttl,
+            "max_entries": self.max_entries,
+        }
+
+
+_cache = SummaryCache()
+# Chunk and reduce-pass summaries of the map-reduce summarizer
+_partial_cache = SummaryCache("partial")
+
+
+def get_summary_cache() -> SummaryCache:
+    return _cache
+
+
+def get_partial_summary_cache() -> SummaryCache:
+    return _partial_cache
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from services.chunking import (
+    ChunkStitcher, plan_chunks, remaining_chunks, stitch_chunks, transcribe_sequential
+)
+
+RATE = 100  # samples per second keeps the synthetic audio small
+
+
+def segment(start, end, text):
+    return {"start": start, "end": end, "text": text}
+
+
+class TestPlanChunks:
+    def test_chunks_tile_the_audio_with_overlap(self):
+        audio = np.random.default_rng(0).standard_normal(RATE * 100).astype(np.float32)
+        chunks = plan_chunks(audio, chunk_seconds=20, overlap_seconds=2, sample_rate=RATE)
+        assert len(chunks) > 1
+        assert chunks[0][2] == 0 and chunks[-1][3] == 100
+        for (_, end, _, keep_to), (start, _, keep_from, _) in zip(chunks, chunks[1:]):
+            # Each cut is owned by exactly one side and decoded by both
+            assert keep_to == keep_from
+            assert start == pytest.approx(keep_from - 2)
+            assert end == pytest.approx(keep_to + 2)
+
+    def test_cuts_land_on_quiet_audio(self):
+        audio = np.ones(RATE * 60, dtype=np.float32)
+        audio[RATE * 22:RATE * 23] = 0
+        chunks = plan_chunks(audio, chunk_seconds=20, overlap_seconds=1, sample_rate=RATE)
+        assert 22 <= chunks[0][3] <= 23
+
+    def test_remaining_chunks_resume_at_a_cut(self):
+        chunks = [(0, 12, 0, 10), (8, 22, 10, 20), (18, 30, 20, 30)]
+        assert remaining_chunks(chunks, 10) == chunks[1:]
+        assert remaining_chunks(chunks, 30) == []
+
+
+class TestChunkStitcher:
+    def test_segment_times_move_to_the_full_timeline(self):
+        stitched = stitch_chunks(
+            [(0, 12, 0, 10), (8, 20, 10, 20)],
+            [
+                {"segments": [segment(0, 4, " one"), segment(4, 9, " two")], "language": "en"},
+                {"segments": [segment(3, 7, " three")]},
+            ],
+        )
+        assert [(s["start"], s["end"]) for s in stitched["segments"]] == [(0, 4), (4, 9), (11, 15)]
+        assert [s["id"] for s in stitched["segments"]] == [0, 1, 2]
+        assert stitched["text"] == " one two three"
+        assert stitched["language"] == "en"
+
+    def test_overlap_segment_is_kept_by_the_chunk_owning_its_midpoint(self):
+        # 8.5-10.5 (midpoint 9.5) belongs to the first chunk, whichever decoded it
+        stitched = stitch_chunks(
+            [(0, 12, 0, 10), (8, 20, 10, 20)],
+            [
+                {"segments": [segment(0, 8.5, " before"), segment(8.5, 10.5, " across")]},
+                {"segments": [segment(0.5, 2.5, " across"), segment(2.5, 6, " after")]},
+            ],
+        )
+        assert [s["text"] for s in stitched["segments"]] == [" before", " across", " after"]
+
+    def test_words_repeated_across_a_cut_are_dropped(self):
+        stitched = stitch_chunks(
+            [(0, 12, 0, 10), (8, 20, 10, 20)],
+            [
+                {"segments": [segment(0, 9.5, " we talked about the model")]},
+                {"segments": [segment(1.6, 5, " The model, then the data")]},
+            ],
+        )
+        assert stitched["text"] == " we talked about the model then the data"
+
+    def test_segment_wholly_repeated_is_dropped(self):
+        stitched = stitch_chunks(
+            [(0, 12, 0, 10), (8, 20, 10, 20)],
+            [
+                {"segments": [segment(0, 11.9, " hello there")]},
+                # Midpoint past the cut, but the text only repeats what was kept
+                {"segments": [segment(3, 4, " hello there."), segment(4, 6, " bye")]},
+            ],
+        )
+        assert [s["text"] for s in stitched["segments"]] == [" hello there", " bye"]
+
+    def test_segment_ending_inside_the_kept_transcript_is_dropped(self):
+        stitcher = ChunkStitcher()
+        stitcher.add((0, 12, 0, 10), {"segments": [segment(0, 11, " long sentence")]})
+        assert stitcher.add((8, 20, 10, 20), {"segments": [segment(2.2, 2.8, " short")]}) == []
+
+    def test_start_is_clamped_to_the_previous_end(self):
+        stitcher = ChunkStitcher()
+        stitcher.add((0, 12, 0, 10), {"segments": [segment(0, 9.8, " first")]})
+        added = stitcher.add((8, 20, 10, 20), {"segments": [segment(1.5, 4, " second")]})
+        assert added[0]["start"] == 9.8
+
+    def test_resumed_stitcher_continues_the_earlier_transcript(self):
+        previous = [{"id": 0, "start": 0, "end": 9, "text": " kept from before"}]
+        stitcher = ChunkStitcher(previous)
+        added = stitcher.add((8, 20, 10, 20), {"segments": [segment(2, 5, " before and after")]})
+        assert added == [{"id": 1, "start": 10, "end": 13, "text": " and after"}]
+        assert stitcher.text == " kept from before and after"
+
+
+class TestTranscribeSequential:
+    def test_rejects_an_empty_window(self):
+        with pytest.raises(ValueError):
+            transcribe_sequential(np.zeros(RATE, dtype=np.float32), window_seconds=0)
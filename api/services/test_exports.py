@@ -0,0 +1,96 @@
+import json
+import pytest
+from api.schemas import ExportFormat, TaskStatus, TranscriptSegment
+from services.exports import export_transcript, format_timestamp, iter_segments, srt_cue, vtt_cue
+
+SEGMENTS = [
+    {"start": 0.0, "end": 2.5, "text": " Hello there."},
+    {"start": 2.5, "end": 3661.0004, "text": " A long\n\nmonologue. "},
+    {"start": 3661.0004, "end": 3662.9996, "text": " Bye."},
+]
+
+
+async def task_with_segments(db, segments=SEGMENTS):
+    task_id = await db.create_task("https://example.com/a")
+    await db.append_segments(task_id, 0, segments)
+    await db.update_task_status(task_id, TaskStatus.COMPLETED, title='Say "hi"')
+    return await db.get_task(task_id)
+
+
+async def export(db, task, export_format):
+    return "".join([piece async for piece in export_transcript(db, task, export_format)])
+
+
+class TestTimestamps:
+    @pytest.mark.parametrize("seconds, srt, vtt", [
+        (0, "00:00:00,000", "00:00:00.000"),
+        (1.5, "00:00:01,500", "00:00:01.500"),
+        (3723.4567, "01:02:03,457", "01:02:03.457"),
+        (36000, "10:00:00,000", "10:00:00.000"),
+        (360000, "100:00:00,000", "100:00:00.000"),
+    ])
+    def test_formats(self, seconds, srt, vtt):
+        assert format_timestamp(seconds, ",") == srt
+        assert format_timestamp(seconds, ".") == vtt
+
+    def test_rounds_to_the_nearest_millisecond(self):
+        assert format_timestamp(1.0004, ",") == "00:00:01,000"
+        assert format_timestamp(1.0006, ",") == "00:00:01,001"
+        # Rounding carries into seconds, minutes and hours
+        assert format_timestamp(59.9996, ",") == "00:01:00,000"
+        assert format_timestamp(3599.9999, ",") == "01:00:00,000"
+
+    def test_negative_times_clamp_to_zero(self):
+        assert format_timestamp(-0.2, ",") == "00:00:00,000"
+
+
+class TestCues:
+    def test_srt_cue(self):
+        segment = TranscriptSegment(offset=0, start=1.5, end=3723.4567, text=" Hi.\n\n  \nBye. ")
+        assert srt_cue(7, segment) == "7\n00:00:01,500 --> 01:02:03,457\nHi.\nBye.\n\n"
+
+    def test_vtt_cue(self):
+        segment = TranscriptSegment(offset=0, start=1.5, end=2, text=" Hi.")
+        assert vtt_cue(segment) == "00:00:01.500 --> 00:00:02.000\nHi.\n\n"
+
+
+class TestExport:
+    @pytest.mark.asyncio
+    async def test_srt_cues_are_numbered_from_one(self, db):
+        task = await task_with_segments(db)
+        assert await export(db, task, ExportFormat.SRT) == (
+            "1\n00:00:00,000 --> 00:00:02,500\nHello there.\n\n"
+            "2\n00:00:02,500 --> 01:01:01,000\nA long\nmonologue.\n\n"
+            "3\n01:01:01,000 --> 01:01:03,000\nBye.\n\n"
+        )
+
+    @pytest.mark.asyncio
+    async def test_vtt_has_a_header_and_no_numbers(self, db):
+        task = await task_with_segments(db)
+        assert await export(db, task, ExportFormat.VTT) == (
+            "WEBVTT\n\n"
+            "00:00:00.000 --> 00:00:02.500\nHello there.\n\n"
+            "00:00:02.500 --> 01:01:01.000\nA long\nmonologue.\n\n"
+            "01:01:01.000 --> 01:01:03.000\nBye.\n\n"
+        )
+
+    @pytest.mark.asyncio
+    async def test_json_is_valid(self, db):
+        task = await task_with_segments(db)
+        exported = json.loads(await export(db, task, ExportFormat.JSON))
+        assert exported["id"] == task.id and exported["title"] == 'Say "hi"'
+        assert [s["offset"] for s in exported["segments"]] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_task_without_segments(self, db):
+        task = await task_with_segments(db, [])
+        assert await export(db, task, ExportFormat.SRT) == ""
+        assert await export(db, task, ExportFormat.VTT) == "WEBVTT\n\n"
+        assert json.loads(await export(db, task, ExportFormat.JSON))["segments"] == []
+
+    @pytest.mark.asyncio
+    async def test_segments_are_read_in_batches(self, db):
+        segments = [{"start": i, "end": i + 1, "text": f" {i}"} for i in range(5)]
+        task = await task_with_segments(db, segments)
+        offsets = [segment.offset async for segment in iter_segments(db, task.id, batch_size=2)]
+        assert offsets == [0, 1, 2, 3, 4]
@@ -1,44 +1,178 @@
 import os
+import time
+import asyncio
+from typing import Optional
+from config import TASK_EXECUTION
 from utils.logger import logger
+from utils.metrics import STAGE_SECONDS
 from database.dependencies import get_db
-from api.schemas import TaskStatus, SummaryRequest
+from api.schemas import Priority, TaskStatus, SummaryRequest, TranscriptionResponse
+from services.cancellation import CancelToken
 from services.video import VideoProcessor
+from services.audio_cache import get_audio_cache
+from services.scheduler import Stage, get_scheduler
+from services.events import get_event_bus
+from services.warmup import get_warmup
+from services.summary_cache import (
+    get_partial_summary_cache, get_summary_cache, summary_cache_key
+)
+from services.dedup import (
+    get_inflight_jobs, resolve_video_key, transcription_model, transcription_options
+)
 from ai_providers.factory import SummarizerFactory
+from ai_providers.health import get_health_registry
+from ai_providers.mapreduce import HierarchicalSummarizer
 
 
-def check_model_availability(provider: str, model: str):
-    api_key = os.getenv(f"{provider.upper()}_API_KEY")
-    if not api_key:
-        return False
-    summarizer=SummarizerFactory.create_summarizer(provider=provider, api_key=api_key, model=model)
-    return summarizer.is_available()
+# Tasks with pipeline work left to do, picked up again after a restart or by workers
+UNFINISHED_STATUSES = [
+    TaskStatus.PENDING,
+    TaskStatus.DOWNLOADING,
+    TaskStatus.TRANSCRIBING,
+    TaskStatus.SUMMARIZING,
+]
+
+
+def check_model_availability(provider: str, model: str) -> bool:
+    """Cached answer from the provider health registry; never calls the provider"""
+    return get_health_registry().is_available(provider, model)
+
+
+def runs_jobs_inline() -> bool:
+    """False when separate worker processes claim the tasks this process creates"""
+    return TASK_EXECUTION != "workers"
+
+
+def enqueue_transcription(
+    task_id: int,
+    url: str,
+    priority: Priority = Priority.NORMAL,
+    video_key: Optional[str] = None
+) -> bool:
+    # With workers, the pending task row is the queue entry
+    if not runs_jobs_inline():
+        return True
+    return get_scheduler().submit(task_id, process_video(task_id, url, priority, video_key))
 
 
-async def process_video(task_id: int, url: str):
-    """处理视频转写任务的主函数"""
+def enqueue_summary(task_id: int, content: str, summary_request: SummaryRequest) -> bool:
+    if not runs_jobs_inline():
+        return True
+    return get_scheduler().submit(task_id, generate_summary(task_id, content, summary_request))
+
+
+async def run_task(task: TranscriptionResponse):
+    """Run the job a stored task's status calls for: its summary, or its transcription"""
+    if task.status == TaskStatus.SUMMARIZING:
+        await generate_summary(task.id, await get_db().get_body(task.id, "content"), SummaryRequest(
+            provider=task.summary_provider,
+            model=task.summary_model,
+            max_length=task.summary_max_length,
+            priority=task.priority
+        ))
+    else:
+        await process_video(task.id, task.youtube_url, task.priority)
+
+
+async def cancel_task(task: TranscriptionResponse) -> TaskStatus:
+    """Stop the task's job and record the status it is left in.
+
+    A cancelled transcription ends CANCELLED; a cancelled summary leaves the
+    finished transcript COMPLETED.
+    """
     db = get_db()
-    try:
-        # 更新状态为下载中
-        await db.update_task_status(task_id, TaskStatus.DOWNLOADING)
+    get_scheduler().cancel(task.id)
+    status = TaskStatus.COMPLETED if task.status == TaskStatus.SUMMARIZING else TaskStatus.CANCELLED
+    await db.update_task_status(task.id, status)
+    # A worker process holding the task notices the revoked lease at its next heartbeat
+    await db.release_lease(task.id)
+    logger.info(f"Task {task.id} cancelled")
+    return status
 
-        # 下载视频
-        title, audio_path = await VideoProcessor.download_video(url)
 
-        # 更新状态为转写中
-        await db.update_task_status(task_id, TaskStatus.TRANSCRIBING, title=title)
+async def recover_tasks():
+    """Re-queue tasks that were pending or in flight when the process stopped"""
+    db = get_db()
+    tasks = await db.get_tasks_by_status(UNFINISHED_STATUSES)
+    for task in tasks:
+        if task.status not in (TaskStatus.PENDING, TaskStatus.SUMMARIZING):
+            await db.update_task_status(task.id, TaskStatus.PENDING)
+        get_scheduler().submit(task.id, run_task(task))
+    if tasks:
+        logger.info(f"Recovered {len(tasks)} unfinished tasks")
 
-        # 转写音频
-        content = await VideoProcessor.transcribe_audio(audio_path)
 
-        # 更新完成状态
-        await db.update_task_status(
-            task_id,
-            TaskStatus.COMPLETED,
-            content=content
-        )
+def _segment_sink(task_id: int, next_seq: int = 0, cancel: Optional[CancelToken] = None):
+    """Callback for the transcription thread that checkpoints and publishes segments"""
+    loop = asyncio.get_running_loop()
+    db = get_db()
+    bus = get_event_bus()
+
+    async def _store(first_seq, segments, offset):
+        stored = await db.append_segments(task_id, first_seq, segments, checkpoint=offset)
+        for segment in stored:
+            bus.publish(task_id, {"type": "segment", **segment.model_dump()})
+
+    def on_segments(segments, offset):
+        nonlocal next_seq
+        # The job is gone once cancelled; stop the thread instead of writing for it
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        # Block the worker thread until stored so segments stay in order
+        asyncio.run_coroutine_threadsafe(_store(next_seq, segments, offset), loop).result()
+        next_seq += len(segments)
+
+    return on_segments
+
+
+async def _complete_from_cache(task_id: int, audio_hash: str) -> bool:
+    """Finish a task from an earlier transcription of the same audio"""
+    db = get_db()
+    cached = await db.get_cached_transcription(
+        audio_hash, transcription_model(), transcription_options())
+    if cached is None:
+        return False
+    await db.clear_segments(task_id)
+    await db.append_segments(task_id, 0, cached["segments"])
+    await db.update_task_status(
+        task_id,
+        TaskStatus.COMPLETED,
+        title=cached["title"],
+        content=cached["content"],
+        audio_hash=audio_hash,
+        checkpoint_offset=None
+    )
+    logger.info(f"Task {task_id} served from transcription cache")
+    return True
 
-        # 清理文件
-        await VideoProcessor.cleanup_file(audio_path)
+
+async def process_video(
+    task_id: int,
+    url: str,
+    priority: Priority = Priority.NORMAL,
+    video_key: Optional[str] = None
+):
+    """处理视频转写任务的主函数；已知 video_key 时跳过解析"""
+    db = get_db()
+    inflight = get_inflight_jobs()
+    leading = False
+    try:
+        if video_key is None:
+            video_key = await resolve_video_key(url)
+            await db.update_task_fields(task_id, video_key=video_key)
+        while True:
+            # 同一视频已转写过则直接复用结果
+            audio_hash = await db.find_audio_hash(video_key)
+            if audio_hash and await _complete_from_cache(task_id, audio_hash):
+                return
+            running = inflight.join(video_key)
+            if running is None:
+                leading = True
+                break
+            # 同一视频正在处理中，等待其完成
+            await running.wait()
+
+        await _download_and_transcribe(task_id, url, priority, video_key)
 
     except Exception as e:
         logger.error(f"Task {task_id} failed: {e}")
@@ -47,33 +181,130 @@ async def process_video(task_id: int, url: str):
             TaskStatus.FAILED,
             error_message=str(e)
         )
+    finally:
+        if leading:
+            inflight.finish(video_key)
 
 
-async def generate_summary(task_id: int, content: str, summary_request: SummaryRequest):
+async def _download_and_transcribe(task_id: int, url: str, priority: Priority, video_key: str):
     db = get_db()
+    scheduler = get_scheduler()
+    cache = get_audio_cache()
+    cancel = scheduler.cancel_token(task_id)
+    # 音频按视频缓存，重新转写或断点续转时无需再次下载
+    audio = await cache.checkout(video_key)
+    if audio is None:
+        async with scheduler.stage(Stage.DOWNLOAD, priority):
+            # 更新状态为下载中
+            await db.update_task_status(task_id, TaskStatus.DOWNLOADING)
+
+            # 下载视频
+            audio = await cache.download(video_key, url, cancel)
+
     try:
-        # 更新状态为正在摘要
-        await db.update_task_status(task_id, TaskStatus.SUMMARIZING)
-
-        # 获取API密钥
-        api_key = os.getenv(f"{summary_request.provider.upper()}_API_KEY")
-        if not api_key:
-            raise ValueError(
-                f"API key not found for provider {summary_request.provider}")
-
-        # 创建摘要器实例
-        summarizer = SummarizerFactory.create_summarizer(
-            provider=summary_request.provider,
-            api_key=api_key,
-            model=summary_request.model
-        )
+        # 上次运行中断时留下的检查点；音频已变化时从头转写
+        checkpoint = await db.get_checkpoint(task_id)
+        if checkpoint and checkpoint["audio_hash"] != audio.audio_hash:
+            checkpoint = None
+        await db.update_task_fields(task_id, title=audio.title, audio_hash=audio.audio_hash)
+
+        # 不同链接指向同一音频时同样复用结果
+        if await _complete_from_cache(task_id, audio.audio_hash):
+            return
+
+        async with scheduler.stage(Stage.TRANSCRIBE, priority):
+            # 更新状态为转写中
+            await db.update_task_status(task_id, TaskStatus.TRANSCRIBING)
+
+            # 转写音频，分段结果边解码边写入，并记录检查点
+            previous = []
+            if checkpoint:
+                previous = [
+                    {"id": s.offset, "start": s.start, "end": s.end, "text": s.text}
+                    for s in await db.get_segments(task_id)
+                ]
+                logger.info(f"Task {task_id} resuming transcription at {checkpoint['offset']:.1f}s")
+            else:
+                await db.clear_segments(task_id)
+            content = await VideoProcessor.transcribe_audio(
+                audio.path,
+                on_segments=_segment_sink(task_id, len(previous), cancel),
+                resume_from=checkpoint["offset"] if checkpoint else 0.0,
+                previous=previous,
+                cancel=cancel
+            )
 
-        # 生成摘要
-        summary = await summarizer.summarize(
+        await db.cache_transcription(
+            audio.audio_hash,
+            transcription_model(),
+            transcription_options(),
+            audio.title,
             content,
-            max_length=summary_request.max_length
+            await db.get_segments(task_id)
         )
 
+        # 更新完成状态
+        await db.update_task_status(
+            task_id,
+            TaskStatus.COMPLETED,
+            content=content,
+            checkpoint_offset=None
+        )
+        get_warmup().mark("first_transcription")
+    finally:
+        # 音频留在缓存中，超出配额时按最近最少使用淘汰
+        await cache.release(video_key)
+
+
+async def generate_summary(task_id: int, content: str, summary_request: SummaryRequest):
+    db = get_db()
+    try:
+        async with get_scheduler().stage(Stage.SUMMARIZE, summary_request.priority):
+            # 更新状态为正在摘要
+            await db.update_task_status(task_id, TaskStatus.SUMMARIZING)
+
+            # 获取API密钥
+            api_key = os.getenv(f"{summary_request.provider.upper()}_API_KEY")
+            if not api_key:
+                raise ValueError(
+                    f"API key not found for provider {summary_request.provider}")
+
+            # 创建摘要器实例，超长文本分块摘要后再合并
+            summarizer = HierarchicalSummarizer(
+                SummarizerFactory.create_summarizer(
+                    provider=summary_request.provider,
+                    api_key=api_key,
+                    model=summary_request.model
+                ),
+                store=get_partial_summary_cache()
+            )
+
+            # 生成摘要，结果同时反馈给健康检查
+            health = get_health_registry()
+            started = time.perf_counter()
+            try:
+                summary = await summarizer.summarize(
+                    content,
+                    max_length=summary_request.max_length
+                )
+            except Exception as e:
+                health.record_failure(summary_request.provider, summary_request.model, str(e))
+                raise
+            finally:
+                STAGE_SECONDS.observe(time.perf_counter() - started, stage="summarize")
+            health.record_success(
+                summary_request.provider,
+                summary_request.model,
+                (time.perf_counter() - started) * 1000
+            )
+
+        await get_summary_cache().put(summary_cache_key(
+            content,
+            summary_request.provider,
+            summary_request.model,
+            summary_request.max_length
+        ), summary)
+
         # 更新任务状态和摘要内容
         await db.update_task_status(
             task_id,
@@ -1,42 +1,104 @@
-import os
+import math
+import time
 import asyncio
-import yt_dlp
-import whisper
-from config import YTDL_OPTIONS, WHISPER_MODEL, DOWNLOAD_DIR
-from utils.logger import logger
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from config import (
+    WHISPER_MODEL, TRANSCRIBE_MODE, TRANSCRIBE_CHUNK_SECONDS, TRANSCRIBE_STREAM_SECONDS
+)
+from services.audio import fetch_audio, is_pcm, load_pcm, read_audio
+from services.cancellation import CancelToken
+from services.chunking import (
+    SAMPLE_RATE, ChunkStitcher, SegmentCallback, transcribe_chunked, transcribe_sequential
+)
+from services.model_pool import get_model_pool
+from utils.metrics import AUDIO_SECONDS, STAGE_SECONDS, TRANSCRIBE_RTF
 
 
 class VideoProcessor:
     @staticmethod
-    async def download_video(url: str) -> tuple[str, str]:
-        """Download the video"""
-        def _download():
-            with yt_dlp.YoutubeDL(YTDL_OPTIONS) as ydl:
-                info = ydl.extract_info(url, download=True)
-                if info is None:
-                    raise Exception("Failed to download video")
-                title = info['title']
-                audio_path = str(DOWNLOAD_DIR / f"{title}.mp3")
-                return title, audio_path
+    async def download_video(
+        url: str,
+        cancel: Optional[CancelToken] = None,
+        output: Optional[Path] = None
+    ) -> tuple[str, str]:
+        """Fetch the video's audio as 16 kHz mono PCM; returns (title, pcm path)"""
+        return await asyncio.to_thread(fetch_audio, url, cancel=cancel, output=output)
 
-        return await asyncio.to_thread(_download)
+    @staticmethod
+    def load_audio(audio_path: str):
+        """Samples for the model: PCM files are memory-mapped, anything else goes through ffmpeg"""
+        if is_pcm(audio_path):
+            return load_pcm(audio_path)
+        return read_audio(audio_path)
 
     @staticmethod
-    async def transcribe_audio(audio_path: str) -> str:
+    async def transcribe_audio(
+        audio_path: str,
+        mode: str = TRANSCRIBE_MODE,
+        on_segments: Optional[SegmentCallback] = None,
+        resume_from: float = 0.0,
+        previous: Optional[List[Dict[str, Any]]] = None,
+        cancel: Optional[CancelToken] = None
+    ) -> str:
         """Transcribe the audio file"""
-        def _transcribe():
-            model = whisper.load_model(WHISPER_MODEL)
-            result = model.transcribe(audio_path)
-            return result["text"]
-
-        return await asyncio.to_thread(_transcribe)
+        result = await asyncio.to_thread(
+            VideoProcessor.transcribe_file, audio_path, mode, on_segments, resume_from, previous, cancel)
+        return result["text"]
 
     @staticmethod
-    async def cleanup_file(file_path: str):
-        """Clean up the downloaded file"""
-        try:
-            await asyncio.to_thread(os.remove, file_path)
-        except Exception as e:
-            logger.error("Failed to clean up file {file_path}: %s", e)
+    def transcribe_file(
+        audio_path: str,
+        mode: str = TRANSCRIBE_MODE,
+        on_segments: Optional[SegmentCallback] = None,
+        resume_from: float = 0.0,
+        previous: Optional[List[Dict[str, Any]]] = None,
+        cancel: Optional[CancelToken] = None
+    ) -> dict:
+        """Run the transcription engine on a file and return its text and segments.
 
+        ``on_segments`` is called from the worker thread with each batch of
+        newly decoded segments, in timeline order, and the offset they reach.
+        ``previous`` holds the segments of the first ``resume_from`` seconds
+        when resuming from a checkpoint.
+        """
+        with STAGE_SECONDS.time(stage="decode"):
+            audio = VideoProcessor.load_audio(audio_path)
+        started = time.perf_counter()
+        result = VideoProcessor._transcribe_samples(
+            audio, mode, on_segments, resume_from, previous or [], cancel)
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage="transcribe")
+        audio_seconds = len(audio) / SAMPLE_RATE - resume_from
+        if audio_seconds > 0:
+            AUDIO_SECONDS.inc(audio_seconds, model=WHISPER_MODEL)
+            TRANSCRIBE_RTF.observe(elapsed / audio_seconds, model=WHISPER_MODEL)
+        return result
 
+    @staticmethod
+    def _transcribe_samples(
+        audio,
+        mode: str,
+        on_segments: Optional[SegmentCallback],
+        resume_from: float,
+        previous: List[Dict[str, Any]],
+        cancel: Optional[CancelToken]
+    ) -> dict:
+        resume = {"resume_from": resume_from, "previous": previous, "cancel": cancel}
+        # Short audio gains nothing from being split
+        if mode == "chunked" and len(audio) > 2 * TRANSCRIBE_CHUNK_SECONDS * SAMPLE_RATE:
+            return transcribe_chunked(audio, on_segments=on_segments, **resume)
+        if TRANSCRIBE_STREAM_SECONDS > 0:
+            return transcribe_sequential(audio, on_segments=on_segments, **resume)
+        # One pass over the whole file, so the only checkpoint is the finished transcript
+        duration = len(audio) / SAMPLE_RATE
+        stitcher = ChunkStitcher(previous)
+        if not previous or resume_from < duration:
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            with get_model_pool().acquire(WHISPER_MODEL) as model:
+                result = model.transcribe(audio)
+            added = stitcher.add((0.0, duration, 0.0, math.inf), result)
+            if on_segments:
+                on_segments(added, duration)
+        return stitcher.result()
@@ -0,0 +1,180 @@
+# services/warmup.py
+"""Start-up timeline and the background warm-up behind ``/readyz``.
+
+Heavy dependencies (the provider SDKs, yt-dlp, Whisper and PyTorch) are
+imported on first use, so the API starts listening as soon as the database
+is migrated. The warm-up then loads them in worker threads: the SDKs of the
+configured providers, then the Whisper model with a one-second silent
+decode, which also initializes the inference backend. A failed step is
+retried with growing delays, so readiness recovers once, say, the model
+download goes through.
+
+Times are measured from when the process started, as the kernel recorded
+it, so interpreter start-up and every import are included whatever order
+the entry point imports its modules in.
+"""
+import asyncio
+import importlib
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from config import AVAILABLE_PROVIDERS, WHISPER_MODEL
+from utils.logger import logger
+from utils.metrics import STARTUP_SECONDS
+
+
+def _process_started() -> float:
+    """The process start on the ``perf_counter`` clock; this module's import time without ``/proc``"""
+    now = time.perf_counter()
+    try:
+        with open("/proc/self/stat", encoding="ascii") as f:
+            # Field 22, counted after the parenthesized command name, which may contain spaces
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", encoding="ascii") as f:
+            uptime = float(f.read().split()[0])
+        return now - max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return now
+
+
+STARTED = _process_started()
+
+
+def _listening() -> Optional[bool]:
+    """Whether this process holds a listening TCP socket; None without ``/proc``"""
+    try:
+        sockets = set()
+        for fd in os.listdir("/proc/self/fd"):
+            try:
+                target = os.readlink(f"/proc/self/fd/{fd}")
+            except OSError:
+                continue
+            if target.startswith("socket:["):
+                sockets.add(target[len("socket:["):-1])
+    except OSError:
+        return None
+    for table in ("/proc/self/net/tcp", "/proc/self/net/tcp6"):
+        try:
+            with open(table, encoding="ascii") as f:
+                rows = f.read().splitlines()[1:]
+        except OSError:
+            continue
+        # State 0A is LISTEN; the inode is the tenth column
+        if any(row.split()[3] == "0A" and row.split()[9] in sockets for row in rows):
+            return True
+    return False
+
+PENDING = "pending"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+# Provider names as configured, mapped to the SDK module their client is built with
+_PROVIDER_SDKS = {"openai": "openai", "anthropic": "anthropic", "claude": "anthropic"}
+WARMUP_SAMPLES = 16000
+WARMUP_RETRY_SECONDS = 5
+WARMUP_RETRY_MAX_SECONDS = 300
+LISTEN_POLL_SECONDS = 0.01
+LISTEN_TIMEOUT_SECONDS = 60
+
+
+def _import_sdks(providers: List[str]):
+    for module in sorted({_PROVIDER_SDKS[p] for p in providers if p in _PROVIDER_SDKS}):
+        importlib.import_module(module)
+
+
+def _load_model():
+    import numpy as np
+    from services.model_pool import get_model_pool
+
+    with get_model_pool().acquire(WHISPER_MODEL) as model:
+        model.transcribe(np.zeros(WARMUP_SAMPLES, dtype=np.float32))
+
+
+class Warmup:
+    """Milestones of this process's start-up and the state of its warm-up"""
+
+    def __init__(self):
+        self.state = PENDING
+        self.error: Optional[str] = None
+        self.milestones: Dict[str, float] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def mark(self, milestone: str):
+        """Record the first time ``milestone`` is reached"""
+        if milestone in self.milestones:
+            return
+        elapsed = time.perf_counter() - STARTED
+        self.milestones[milestone] = round(elapsed, 3)
+        STARTUP_SECONDS.set(elapsed, milestone=milestone)
+        logger.info("Start-up: %s after %.2fs", milestone, elapsed)
+
+    def start(self, load_model: bool, on_sdks_loaded=None):
+        """Warm up in the background; ``on_sdks_loaded`` runs once the provider SDKs are imported"""
+        if not self._tasks:
+            loop = asyncio.get_running_loop()
+            self._tasks = [
+                loop.create_task(self._mark_listen()),
+                loop.create_task(self._run(load_model, on_sdks_loaded)),
+            ]
+
+    async def _mark_listen(self):
+        # The server binds its socket only after the lifespan start-up has finished
+        deadline = time.perf_counter() + LISTEN_TIMEOUT_SECONDS
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(LISTEN_POLL_SECONDS)
+            listening = _listening()
+            if listening is None or listening:
+                self.mark("listen")
+                return
+
+    async def _run(self, load_model: bool, on_sdks_loaded):
+        self.state = WARMING
+        sdks_loaded = False
+        delay = WARMUP_RETRY_SECONDS
+        while True:
+            try:
+                if not sdks_loaded:
+                    # Importing an SDK takes seconds; done on the loop it would stall every request
+                    await asyncio.to_thread(_import_sdks, AVAILABLE_PROVIDERS)
+                    sdks_loaded = True
+                    if on_sdks_loaded is not None:
+                        on_sdks_loaded()
+                if load_model:
+                    await asyncio.to_thread(_load_model)
+                break
+            except Exception as e:
+                self.state = FAILED
+                self.error = str(e) or type(e).__name__
+                logger.error(f"Warm-up failed, retrying in {delay}s: {self.error}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, WARMUP_RETRY_MAX_SECONDS)
+        self.state = READY
+        self.error = None
+        self.mark("ready")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "error": self.error,
+            "uptime_seconds": round(time.perf_counter() - STARTED, 1),
+            "milestones": self.milestones,
+        }
+
+
+_warmup = Warmup()
+
+
+def get_warmup() -> Warmup:
+    return _warmup
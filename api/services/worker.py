@@ -0,0 +1,103 @@
+# services/worker.py
+import asyncio
+import os
+import socket
+from typing import Optional, Set
+
+from config import WORKER_LEASE_SECONDS, WORKER_MAX_ATTEMPTS, WORKER_MAX_JOBS, WORKER_POLL_SECONDS
+from api.schemas import TranscriptionResponse
+from database.dependencies import get_db
+from services.scheduler import get_scheduler
+from services.transcription import UNFINISHED_STATUSES, run_task
+from utils.logger import logger
+
+
+class Worker:
+    """Claims unfinished tasks from the shared database and runs them.
+
+    Each claim is a lease that the heartbeat renews every third of
+    ``lease_seconds``. If the process dies, its leases expire and other
+    workers claim the tasks, which resume from their transcription
+    checkpoints. A lease that disappears while a job runs means the task was
+    cancelled or deleted through the API (or the lease expired and the task
+    went to another worker); the local job is then stopped.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        max_jobs: int = WORKER_MAX_JOBS,
+        lease_seconds: float = WORKER_LEASE_SECONDS,
+        poll_seconds: float = WORKER_POLL_SECONDS,
+        max_attempts: int = WORKER_MAX_ATTEMPTS,
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.max_jobs = max(1, max_jobs)
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self._claimed: Set[int] = set()
+        # Created by ``run``: before Python 3.10 an Event binds to the loop current at construction
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    def stop(self):
+        """Stop claiming; ``run`` then stops its jobs and hands their leases back"""
+        self._stopping = True
+        if self._wake is not None:
+            self._wake.set()
+
+    async def run(self):
+        db = get_db()
+        self._wake = asyncio.Event()
+        logger.info("Worker %s started, up to %d jobs", self.worker_id, self.max_jobs)
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            while not self._stopping:
+                if len(self._claimed) < self.max_jobs:
+                    task = await db.claim_task(
+                        self.worker_id, UNFINISHED_STATUSES, self.lease_seconds, self.max_attempts)
+                    if task is not None:
+                        self._start(task)
+                        continue
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            heartbeat.cancel()
+            await get_scheduler().shutdown()
+            # Let another worker pick the interrupted tasks up without waiting for expiry
+            await db.release_leases(self.worker_id)
+            logger.info("Worker %s stopped", self.worker_id)
+
+    def _start(self, task: TranscriptionResponse):
+        logger.info("Worker %s claimed task %d (%s)", self.worker_id, task.id, task.status.value)
+        self._claimed.add(task.id)
+        if not get_scheduler().submit(task.id, self._run(task)):
+            self._claimed.discard(task.id)
+
+    async def _run(self, task: TranscriptionResponse):
+        try:
+            await run_task(task)
+        finally:
+            self._claimed.discard(task.id)
+            await get_db().release_lease(task.id, self.worker_id)
+            self._wake.set()
+
+    async def _heartbeat(self):
+        db = get_db()
+        scheduler = get_scheduler()
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            claimed = list(self._claimed)
+            try:
+                held = set(await db.renew_leases(self.worker_id, claimed, self.lease_seconds))
+            except Exception as e:
+                logger.error(f"Worker {self.worker_id} could not renew its leases: {e}")
+                continue
+            for task_id in claimed:
+                if task_id not in held and task_id in self._claimed:
+                    logger.warning(f"Worker {self.worker_id} lost the lease on task {task_id}; stopping it")
+                    scheduler.cancel(task_id)
@@ -0,0 +1,58 @@
+# transcribers/base.py
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class TranscriberCapabilities:
+    segments: bool = True
+    word_timestamps: bool = False
+    language_detection: bool = False
+    initial_prompt: bool = False
+    devices: Tuple[str, ...] = ("cpu",)
+    compute_types: Tuple[str, ...] = field(default_factory=tuple)
+
+
+class BaseTranscriber(ABC):
+    """A loaded speech-to-text model.
+
+    ``transcribe`` takes 16 kHz mono float32 samples and answers in the shape
+    openai-whisper uses: ``{"text", "segments": [{"start", "end", "text", ...}],
+    "language"}``, so the chunking and stitching code works with any engine.
+    """
+    name = ""
+    capabilities = TranscriberCapabilities()
+
+    def __init__(self, model_name: str, device: str, **kwargs):
+        self.model_name = model_name
+        self.device = device
+        self.config = kwargs
+
+    @classmethod
+    def default_device(cls) -> str:
+        return "cpu"
+
+    @classmethod
+    def configure_threads(cls, threads: int):
+        """Limit the CPU threads a process's models use; called before any model loads"""
+
+    @abstractmethod
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        initial_prompt: Optional[str] = None,
+        language: Optional[str] = None,
+        word_timestamps: bool = False
+    ) -> Dict[str, Any]:
+        """Transcribe the samples"""
+        pass
+
+    def size_bytes(self) -> int:
+        """Approximate resident size of the model"""
+        return 0
+
+    def describe(self) -> Dict[str, Any]:
+        return {"engine": self.name, "model": self.model_name, "device": self.device}
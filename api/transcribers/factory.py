@@ -0,0 +1,26 @@
+# transcribers/factory.py
+from typing import Type
+
+from config import TRANSCRIBE_ENGINE
+from transcribers.base import BaseTranscriber
+from transcribers.faster_whisper_transcriber import FasterWhisperTranscriber
+from transcribers.whisper_transcriber import WhisperTranscriber
+
+
+class TranscriberFactory:
+    engines = {
+        "whisper": WhisperTranscriber,
+        "openai-whisper": WhisperTranscriber,
+        "faster-whisper": FasterWhisperTranscriber,
+        # Add more engines here
+    }
+
+    @staticmethod
+    def get_engine(engine: str = TRANSCRIBE_ENGINE) -> Type[BaseTranscriber]:
+        if engine not in TranscriberFactory.engines:
+            raise ValueError(f"Unsupported transcription engine: {engine}")
+        return TranscriberFactory.engines[engine]
+
+    @staticmethod
+    def create_transcriber(model_name: str, device: str, engine: str = TRANSCRIBE_ENGINE, **kwargs) -> BaseTranscriber:
+        return TranscriberFactory.get_engine(engine)(model_name, device, **kwargs)
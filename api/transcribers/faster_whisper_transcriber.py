@@ -0,0 +1,100 @@
+# transcribers/faster_whisper_transcriber.py
+from typing import Any, Dict, Optional
+
+import numpy as np
+from config import TRANSCRIBE_COMPUTE_TYPE, TRANSCRIBE_BEAM_SIZE
+from transcribers.base import BaseTranscriber, TranscriberCapabilities
+
+# Parameter counts of the Whisper checkpoints, for sizing quantized models
+_PARAMETERS = {
+    "tiny": 39e6, "base": 74e6, "small": 244e6, "medium": 769e6,
+    "large": 1550e6, "turbo": 809e6, "distil-large": 756e6, "distil-medium": 394e6,
+    "distil-small": 166e6,
+}
+_BYTES_PER_PARAMETER = {"int8": 1, "int8_float16": 1, "int8_float32": 1, "int8_bfloat16": 1,
+                        "float16": 2, "bfloat16": 2, "float32": 4}
+
+
+class FasterWhisperTranscriber(BaseTranscriber):
+    """Whisper on CTranslate2 via faster-whisper; int8 weights by default.
+
+    Needs the optional ``faster-whisper`` package. On CPU the int8 model is
+    several times faster than the PyTorch FP32 path and uses about a quarter
+    of the memory.
+    """
+    name = "faster-whisper"
+    capabilities = TranscriberCapabilities(
+        word_timestamps=True,
+        language_detection=True,
+        initial_prompt=True,
+        devices=("cpu", "cuda"),
+        compute_types=tuple(_BYTES_PER_PARAMETER),
+    )
+    cpu_threads = 0  # 0 lets CTranslate2 decide
+
+    def __init__(self, model_name: str, device: str, **kwargs):
+        super().__init__(model_name, device, **kwargs)
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise RuntimeError(
+                "TRANSCRIBE_ENGINE=faster-whisper needs the faster-whisper package") from e
+        self.compute_type = TRANSCRIBE_COMPUTE_TYPE or ("int8_float16" if device == "cuda" else "int8")
+        self.model = WhisperModel(
+            model_name,
+            device=device,
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads,
+        )
+
+    @classmethod
+    def default_device(cls) -> str:
+        try:
+            import ctranslate2
+        except ImportError:
+            return "cpu"
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+    @classmethod
+    def configure_threads(cls, threads: int):
+        cls.cpu_threads = threads
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        initial_prompt: Optional[str] = None,
+        language: Optional[str] = None,
+        word_timestamps: bool = False
+    ) -> Dict[str, Any]:
+        segments, info = self.model.transcribe(
+            np.asarray(audio, dtype=np.float32),
+            beam_size=TRANSCRIBE_BEAM_SIZE,
+            initial_prompt=initial_prompt,
+            language=language,
+            word_timestamps=word_timestamps,
+        )
+        results = []
+        # The segments are decoded lazily, as this loop consumes them
+        for segment in segments:
+            result = {"id": segment.id, "start": segment.start, "end": segment.end, "text": segment.text}
+            if segment.words:
+                result["words"] = [
+                    {"start": w.start, "end": w.end, "word": w.word, "probability": w.probability}
+                    for w in segment.words
+                ]
+            results.append(result)
+        return {
+            "text": "".join(segment["text"] for segment in results),
+            "segments": results,
+            "language": info.language,
+        }
+
+    def size_bytes(self) -> int:
+        name = self.model_name.split("/")[-1].removeprefix("faster-whisper-")
+        for prefix in sorted(_PARAMETERS, key=len, reverse=True):
+            if name.startswith(prefix):
+                return int(_PARAMETERS[prefix] * _BYTES_PER_PARAMETER.get(self.compute_type, 4))
+        return 0
+
+    def describe(self) -> Dict[str, Any]:
+        return {**super().describe(), "compute_type": self.compute_type}
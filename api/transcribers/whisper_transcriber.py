@@ -0,0 +1,49 @@
+# transcribers/whisper_transcriber.py
+from typing import Any, Dict, Optional
+
+import numpy as np
+from transcribers.base import BaseTranscriber, TranscriberCapabilities
+
+
+class WhisperTranscriber(BaseTranscriber):
+    """openai-whisper on PyTorch, FP32 on CPU and FP16 on CUDA"""
+    name = "openai-whisper"
+    capabilities = TranscriberCapabilities(
+        word_timestamps=True,
+        language_detection=True,
+        initial_prompt=True,
+        devices=("cpu", "cuda"),
+        compute_types=("float32", "float16"),
+    )
+
+    def __init__(self, model_name: str, device: str, **kwargs):
+        super().__init__(model_name, device, **kwargs)
+        import whisper
+        self.model = whisper.load_model(model_name, device=device)
+
+    @classmethod
+    def default_device(cls) -> str:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+
+    @classmethod
+    def configure_threads(cls, threads: int):
+        import torch
+        torch.set_num_threads(threads)
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        initial_prompt: Optional[str] = None,
+        language: Optional[str] = None,
+        word_timestamps: bool = False
+    ) -> Dict[str, Any]:
+        return self.model.transcribe(
+            audio,
+            initial_prompt=initial_prompt,
+            language=language,
+            word_timestamps=word_timestamps,
+        )
+
+    def size_bytes(self) -> int:
+        return sum(p.numel() * p.element_size() for p in self.model.parameters())
@@ -0,0 +1,260 @@
+# utils/metrics.py
+"""Process-wide pipeline metrics, rendered in the Prometheus text format.
+
+Metrics are updated from the event loop and from worker threads alike, so
+every update takes the registry lock. Values that already live elsewhere
+(scheduler queues, for instance) are copied in by collectors at scrape time
+rather than tracked twice.
+"""
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+STAGE_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+RTF_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 4)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+MODEL_LOAD_BUCKETS = (0.5, 1, 2, 5, 10, 30, 60, 120)
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape(value: str) -> str:
+    return _escape_help(value).replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = registry.lock
+        registry.register(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        pass
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        if amount < 0:
+            raise ValueError("Counters only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = STAGE_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per label set: count per bucket (not cumulative), sum, count
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * len(self.buckets), [0.0]))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            total[0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall time of the block, also when it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def totals(self) -> Dict[LabelValues, Tuple[int, float]]:
+        """(count, sum) per label set"""
+        with self._lock:
+            return {key: (sum(counts), total[0]) for key, (counts, total) in self._values.items()}
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels((*self.labelnames, "le"), (*key, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Run ``collector`` before every scrape, to copy in state kept elsewhere"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        with self.lock:
+            lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = Histogram(
+    REGISTRY, "transcribeit_stage_seconds",
+    "Wall time of a pipeline stage: resolve (yt-dlp metadata), download (stream piped "
+    "through the ffmpeg decode), decode (loading samples for the model), transcribe, summarize",
+    ["stage"])
+AUDIO_SECONDS = Counter(
+    REGISTRY, "transcribeit_audio_seconds_total",
+    "Seconds of audio transcribed", ["model"])
+TRANSCRIBE_RTF = Histogram(
+    REGISTRY, "transcribeit_transcribe_rtf",
+    "Transcription real-time factor (processing seconds per audio second)",
+    ["model"], buckets=RTF_BUCKETS)
+STAGE_ACTIVE = Gauge(
+    REGISTRY, "transcribeit_stage_active",
+    "Jobs holding a worker slot of the stage", ["stage"])
+STAGE_WAITING = Gauge(
+    REGISTRY, "transcribeit_stage_waiting",
+    "Jobs queued for a worker slot of the stage", ["stage"])
+STAGE_LIMIT = Gauge(
+    REGISTRY, "transcribeit_stage_limit",
+    "Worker slots of the stage", ["stage"])
+JOBS = Gauge(
+    REGISTRY, "transcribeit_jobs",
+    "Pipeline jobs currently running or queued")
+MODEL_LOAD_SECONDS = Histogram(
+    REGISTRY, "transcribeit_model_load_seconds",
+    "Time to load a model into the pool", ["model", "device"], buckets=MODEL_LOAD_BUCKETS)
+STARTUP_SECONDS = Gauge(
+    REGISTRY, "transcribeit_startup_seconds",
+    "Seconds from process start to a start-up milestone: listen (serving requests), "
+    "ready (warm-up done) and first_transcription", ["milestone"])
+LLM_TOKENS = Counter(
+    REGISTRY, "transcribeit_llm_tokens_total",
+    "Tokens reported by LLM providers", ["provider", "model", "kind"])
+LLM_WAITING = Gauge(
+    REGISTRY, "transcribeit_llm_waiting",
+    "LLM calls queued by the governor for a concurrency slot or rate budget", ["provider", "model"])
+LLM_CONCURRENCY_LIMIT = Gauge(
+    REGISTRY, "transcribeit_llm_concurrency_limit",
+    "Adaptive limit on concurrent LLM calls", ["provider", "model"])
+LLM_THROTTLED = Counter(
+    REGISTRY, "transcribeit_llm_throttled_total",
+    "LLM calls the provider refused with 429 (or overloaded)", ["provider", "model"])
+LLM_RETRIES = Counter(
+    REGISTRY, "transcribeit_llm_retries_total",
+    "LLM calls retried after a throttled or transient error", ["provider", "model"])
+DB_SECONDS = Histogram(
+    REGISTRY, "transcribeit_db_seconds",
+    "Database call latency as seen by the caller, including the wait for a "
+    "reader connection or for the write batch to commit",
+    ["kind", "operation"], buckets=DB_BUCKETS)
+AUDIO_CACHE_LOOKUPS = Counter(
+    REGISTRY, "transcribeit_audio_cache_lookups_total",
+    "Audio cache lookups by result (hit or miss)", ["result"])
+AUDIO_CACHE_EVICTIONS = Counter(
+    REGISTRY, "transcribeit_audio_cache_evictions_total",
+    "Cached audio files evicted to stay within the quota")
+AUDIO_CACHE_BYTES = Gauge(
+    REGISTRY, "transcribeit_audio_cache_bytes",
+    "Bytes of decoded audio in the cache")
+
+
+def record_llm_usage(provider: str, model: str, prompt_tokens, completion_tokens):
+    """Count the tokens of one LLM call; providers that report no usage are skipped"""
+    if prompt_tokens:
+        LLM_TOKENS.inc(prompt_tokens, provider=provider, model=model, kind="prompt")
+    if completion_tokens:
+        LLM_TOKENS.inc(completion_tokens, provider=provider, model=model, kind="completion")
@@ -0,0 +1,76 @@
+"""Pipeline worker: claims tasks from the shared database and runs them.
+
+Start the API with ``TASK_EXECUTION=workers`` so it only records tasks, then
+run any number of workers against the same database file and download
+directory, on this machine or on others that share them:
+
+    python worker.py                  # one worker process
+    python worker.py --processes 4    # four, e.g. to try crash recovery locally
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+
+from ai_providers.client_pool import get_client_pool
+from services.audio_cache import get_audio_cache
+from services.model_pool import get_model_pool
+from services.worker import Worker
+
+
+async def _serve(worker: Worker):
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    await get_audio_cache().sweep()
+    sweeper = asyncio.create_task(get_model_pool().sweep_periodically())
+    try:
+        await worker.run()
+    finally:
+        sweeper.cancel()
+        await asyncio.gather(sweeper, return_exceptions=True)
+        await get_client_pool().aclose()
+
+
+def run_worker(worker_id=None, max_jobs=None):
+    options = {"max_jobs": max_jobs} if max_jobs else {}
+    asyncio.run(_serve(Worker(worker_id, **options)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--id", help="worker name recorded on its leases (default host:pid)")
+    parser.add_argument("--jobs", type=int, help="tasks one worker runs at once (default WORKER_MAX_JOBS)")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes to start")
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        run_worker(args.id, args.jobs)
+        return
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=run_worker,
+            args=(f"{args.id}-{i}" if args.id else None, args.jobs),
+            name=f"worker-{i}",
+        )
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, _frame):
+        # Each child stops gracefully and hands its leases back
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import json
 import random
 import string
 import requests
@@ -20,13 +21,115 @@ def create_transcription(url: str):
     return response.json()
 
 
-def get_all_transcriptions():
-    """Get all transcription tasks"""
-    response = requests.get(f"{API_URL}/transcriptions", timeout=10)
+PAGE_SIZE = 20
+
+
+def get_transcriptions_page(cursor=None):
+    """Get one page of tasks (without transcript bodies), newest first"""
+    params = {"limit": PAGE_SIZE}
+    if cursor:
+        params["cursor"] = cursor
+    response = requests.get(f"{API_URL}/transcriptions/", params=params, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def get_changes(since: str):
+    """Get one page of the change feed after the ``since`` cursor"""
+    response = requests.get(
+        f"{API_URL}/transcriptions/changes", params={"since": since}, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def load_more_transcriptions():
+    """Add the next page of older tasks to the session's task cache"""
+    page = get_transcriptions_page(st.session_state.history_cursor)
+    for task in page['items']:
+        st.session_state.tasks[task['id']] = task
+    st.session_state.history_cursor = page.get('next_cursor')
+
+
+def sync_transcriptions():
+    """Patch the session's task cache with what changed since the last sync.
+
+    The first call notes the change feed's current position and loads only
+    the newest page; older pages are loaded on demand. After that only tasks
+    created, modified or deleted in between are fetched, and changes to
+    tasks older than the loaded pages are left for when those pages load.
+    """
+    if 'changes_cursor' not in st.session_state:
+        # Position first, so nothing changed while the page loads is missed
+        st.session_state.changes_cursor = get_changes("latest")['cursor']
+        st.session_state.tasks = {}
+        st.session_state.history_cursor = None
+        load_more_transcriptions()
+        return st.session_state.tasks
+
+    tasks = st.session_state.tasks
+    fully_loaded = st.session_state.history_cursor is None
+    oldest = min(tasks, default=0)
+    cursor = st.session_state.changes_cursor
+    while True:
+        page = get_changes(cursor)
+        for task in page.get('items', []):
+            if fully_loaded or task['id'] >= oldest:
+                tasks[task['id']] = task
+        for task_id in page.get('deleted', []):
+            tasks.pop(task_id, None)
+        cursor = page.get('cursor')
+        if not page.get('has_more'):
+            break
+    st.session_state.changes_cursor = cursor
+    return tasks
+
+
+def search_transcriptions(query: str, cursor=None):
+    """Get one page of tasks matching the query, most relevant first"""
+    params = {"q": query, "limit": PAGE_SIZE}
+    if cursor:
+        params["cursor"] = cursor
+    response = requests.get(
+        f"{API_URL}/transcriptions/search", params=params, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_data(max_entries=50)
+def get_transcription(task_id: int, updated_at: str):  # pylint: disable=unused-argument
+    """Get a task with its transcript; updated_at keys the cache so edits refetch"""
+    response = requests.get(f"{API_URL}/transcriptions/{task_id}", timeout=10)
     response.raise_for_status()
     return response.json()
 
 
+@st.cache_data(max_entries=50)
+def get_export(task_id: int, export_format: str, updated_at: str):  # pylint: disable=unused-argument
+    """Get the timestamped transcript as srt, vtt or json; None for tasks without segments"""
+    response = requests.get(
+        f"{API_URL}/transcriptions/{task_id}/export",
+        params={"format": export_format},
+        timeout=60
+    )
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.text
+
+
+def stream_transcription(task_id: int):
+    """Yield (event, data) pairs from the task's live event stream"""
+    with requests.get(
+            f"{API_URL}/transcriptions/{task_id}/stream", stream=True, timeout=(10, 60)) as response:
+        response.raise_for_status()
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                yield event, json.loads(line[len("data:"):])
+
+
 def delete_transcription(task_id: int):
     """Delete a transcription task"""
     response = requests.delete(
@@ -35,6 +138,14 @@ def delete_transcription(task_id: int):
     return response.json()
 
 
+def cancel_transcription(task_id: int):
+    """Stop a running transcription task"""
+    response = requests.post(
+        f"{API_URL}/transcriptions/{task_id}/cancel", timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
 def summary_transcription(task_id: int, model: dict, provider: str, max_tokens: int = 300):
     """Get a transcription task"""
     model = {
@@ -89,7 +200,7 @@ def transcript_tab():
             st.warning("Please input a valid Video URL")
 
 
-def item_unit(task):
+def item_unit(task, details=None):
     col1, col2, col3, col4 = st.columns([1, 1, 2, 1])
     with col1:
         if st.button("Delete", key=f"delete_{task.get('id')}"):
@@ -112,14 +223,24 @@ def item_unit(task):
             except Exception as e:
                 st.error(f"Falied to retry task: {str(e)}")
     with col3:
-        if task.get('content'):
+        if details and details.get('content'):
             st.download_button(
                 label="Download Transcript",
-                data=task.get('content'),
+                data=details.get('content'),
                 file_name=f"{task.get('title', 'transcript')}.txt",
                 mime="text/plain",
                 key=f"download_{task.get('id')}"
             )
+            for export_format, mime in (("srt", "application/x-subrip"), ("vtt", "text/vtt")):
+                subtitles = get_export(task.get('id'), export_format, task.get('updated_at'))
+                if subtitles:
+                    st.download_button(
+                        label=f"Download {export_format.upper()}",
+                        data=subtitles,
+                        file_name=f"{task.get('title', 'transcript')}.{export_format}",
+                        mime=mime,
+                        key=f"download_{export_format}_{task.get('id')}"
+                    )
         else:
             st.write("")
 
@@ -141,26 +262,90 @@ def item_unit(task):
                         f"Falied to summary task: {str(e)}")
 
 
+def follow_live(task_id: int):
+    status_box = st.empty()
+    transcript_box = st.empty()
+    text = ""
+    try:
+        for event, data in stream_transcription(task_id):
+            if event == "status":
+                status_box.markdown(f"**Status:** {data.get('status')}")
+            elif event == "segment":
+                text += data.get('text', '')
+                transcript_box.text(text)
+    except Exception as e:
+        st.error(f"Lost live stream: {str(e)}")
+
+
+def search_results(query: str):
+    try:
+        hits = []
+        cursor = None
+        for _ in range(st.session_state.get('search_pages', 1)):
+            page = search_transcriptions(query, cursor)
+            hits.extend(page.get('items', []))
+            cursor = page.get('next_cursor')
+            if not cursor:
+                break
+
+        if not hits:
+            st.info("No matching transcriptions")
+            return
+        for task in hits:
+            with st.expander(f"{task.get('title') or task.get('youtube_url')} - {task.get('created_at')}"):
+                if task.get('snippet'):
+                    snippet = task.get('snippet').replace('<mark>', '**').replace('</mark>', '**')
+                    st.markdown(f"> {snippet}")
+                st.markdown(f"**URL:** {task.get('youtube_url')}")
+                details = None
+                if task.get('completed_at') and st.toggle(
+                        "Show transcript", key=f"search_show_{task.get('id')}"):
+                    details = get_transcription(task.get('id'), task.get('updated_at'))
+                if details and details.get('content'):
+                    st.text_area(
+                        "Transcript",
+                        value=details.get('content'),
+                        height=200,
+                        key=f"search_content_{task.get('id')}"
+                    )
+
+        if cursor and st.button("More results"):
+            st.session_state.search_pages = st.session_state.get('search_pages', 1) + 1
+            st.rerun()
+    except Exception as e:
+        st.error(f"Falied to search transcriptions: {str(e)}")
+
+
 def history_tab():
 
     if st.button("Refresh"):
         st.rerun()
 
+    query = st.text_input("Search transcripts", placeholder='words, "a phrase" or prefix*')
+    if query != st.session_state.get('search_query'):
+        st.session_state.search_query = query
+        st.session_state.search_pages = 1
+    if query:
+        search_results(query)
+        return
+
     # Show transcriptions
     try:
-        transcriptions = get_all_transcriptions()
+        tasks = sync_transcriptions()
+        transcriptions = sorted(tasks.values(), key=lambda task: task['id'], reverse=True)
 
         if transcriptions:
             for task in transcriptions:
                 # Build the display title
-                display_title = f"{task.get('title', 'In Progress...')}"
+                display_title = f"{task.get('title') or 'In Progress...'}"
                 status = task.get('status', '')
                 status_emoji = {
                     "pending": "⏳",
                     "downloading": "📥",
                     "transcribing": "🔄",
                     "completed": "✅",
-                    "failed": "❌"
+                    "failed": "❌",
+                    "cancelled": "🚫"
                 }.get(status, "")
 
                 with st.expander(
@@ -172,26 +357,44 @@ def history_tab():
                     if task.get('error_message'):
                         st.error(f"Error: {task.get('error_message')}")
 
-                    if task.get('content'):
+                    # Transcripts are only fetched once the user asks for them
+                    details = None
+                    if task.get('completed_at') and st.toggle(
+                            "Show transcript", key=f"show_{task.get('id')}"):
+                        details = get_transcription(task.get('id'), task.get('updated_at'))
+
+                    if details and details.get('content'):
                         st.text_area(
                             "Transcript",
-                            value=task.get('content'),
+                            value=details.get('content'),
                             height=200,
                             key=f"content_{task.get('id')}"
                         )
-                    if task.get('summary'):
+                    if details and details.get('summary'):
                         st.text_area(
                             "Summary",
-                            value=task.get('summary'),
+                            value=details.get('summary'),
                             height=200,
                             key=f"summary_{task.get('id')}+{random_key_prefix()}"
                         )
 
                     # Add buttons
-                    item_unit(task)
+                    item_unit(task, details)
                     # Show processing message
-                    if not task.get('content') and status not in ["failed", "completed"]:
+                    if status not in ["failed", "completed", "cancelled"]:
                         st.info("In progress...")
+                        if st.button("Follow live", key=f"follow_{task.get('id')}"):
+                            follow_live(task.get('id'))
+                        if st.button("Cancel", key=f"cancel_{task.get('id')}"):
+                            try:
+                                cancel_transcription(task.get('id'))
+                                st.rerun()
+                            except Exception as e:
+                                st.error(f"Falied to cancel task: {str(e)}")
+
+            if st.session_state.history_cursor and st.button("Load more"):
+                load_more_transcriptions()
+                st.rerun()
         else:
             st.info("No transcriptions found")
     except Exception as e: